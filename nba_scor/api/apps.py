@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        # Every nba_api request goes through the shared pooled session with retries and a circuit breaker
+        from . import profiling, upstream_http
+        upstream_http.install()
+
+        # Phase timing hooks for ?profile=1; they do nothing outside a profiled request
+        profiling.install()
@@ -0,0 +1,114 @@
+"""
+Write-once archive of finished games' boxscores.
+
+A boxscore can't change once its game is final, so the first upstream
+response with gameStatus 3 is stored zlib-compressed in the BoxScoreArchive
+table, keyed by game id. get_game_boxscore serves archived games from there
+with no upstream call and an immutable Cache-Control; the backfill_boxscores
+command archives past games in bulk.
+
+Archived rows never change, so the most recently served ones are also kept
+decompressed in process memory.
+"""
+import json
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import date
+
+from .models import BoxScoreArchive
+from .sync import GAME_STATUS_FINAL
+
+COMPRESSION_LEVEL = 9
+
+# Archived responses never change, so clients and proxies may keep them for good
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Upstream cache tags are hex digests, so archived games' tags can't collide with them
+TAG_PREFIX = 'archive-'
+
+# Archived boxscores kept in memory per process
+MEMORY_ENTRIES = 256
+
+# game_id -> (etag, boxscore data), least recently used first
+_memory = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def is_final(boxscore_data):
+    return boxscore_data.get('game', {}).get('gameStatus') == GAME_STATUS_FINAL
+
+
+def game_date(boxscore_data):
+    # gameEt is the tip-off in Eastern time, e.g. "2025-10-21T19:30:00Z"
+    value = boxscore_data.get('game', {}).get('gameEt') or ''
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def tag(game_id, archived_at):
+    # The stored bytes never change, so the row's identity is a stable tag
+    return f'{TAG_PREFIX}{game_id}-{archived_at.timestamp():.0f}'
+
+
+def is_tag(etag):
+    return etag.startswith(TAG_PREFIX)
+
+
+def get(game_id):
+    # (etag, boxscore data) of an archived game, or None
+    with _memory_lock:
+        entry = _memory.get(game_id)
+        if entry is not None:
+            _memory.move_to_end(game_id)
+            return entry
+
+    row = BoxScoreArchive.objects.filter(game_id=game_id).values_list('archived_at', 'data').first()
+    if row is None:
+        return None
+    archived_at, data = row
+    entry = (tag(game_id, archived_at), json.loads(zlib.decompress(data)))
+
+    with _memory_lock:
+        _memory[game_id] = entry
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+    return entry
+
+
+def load(game_id):
+    entry = get(game_id)
+    return entry[1] if entry is not None else None
+
+
+def store(game_id, boxscore_data):
+    # Only final games are archived; returns whether boxscore_data qualified
+    if not is_final(boxscore_data):
+        return False
+    data = zlib.compress(json.dumps(boxscore_data, separators=(',', ':')).encode('utf-8'), COMPRESSION_LEVEL)
+    BoxScoreArchive.objects.bulk_create(
+        [BoxScoreArchive(game_id=game_id, game_date=game_date(boxscore_data), data=data)],
+        ignore_conflicts=True,
+    )
+    return True
+
+
+def archived_ids(game_ids):
+    return set(BoxScoreArchive.objects.filter(game_id__in=game_ids).values_list('game_id', flat=True))
+
+
+async def ais_archived(game_id):
+    if game_id in _memory:
+        return True
+    return await BoxScoreArchive.objects.filter(game_id=game_id).aexists()
+
+
+def etag(game_id):
+    with _memory_lock:
+        entry = _memory.get(game_id)
+    if entry is not None:
+        return entry[0]
+    archived_at = BoxScoreArchive.objects.filter(game_id=game_id).values_list('archived_at', flat=True).first()
+    return tag(game_id, archived_at) if archived_at is not None else None
@@ -0,0 +1,132 @@
+"""
+Async upstream requests for nba_api endpoints.
+
+``load(endpoint)`` fills in an endpoint built with ``get_request=False``. The
+request is the same one nba_api would send (URL, sorted parameters, default
+headers), but it goes through a pooled httpx.AsyncClient, so waiting on
+stats.nba.com doesn't hold a thread. Parsing the response runs in a worker
+thread.
+
+Requests use the timeouts, retries and circuit breakers of upstream_http.
+
+httpx is optional. Without it, or when a custom session is installed on the
+nba_api HTTP classes (the bench replay session, a proxy), the endpoint's own
+blocking ``get_request`` runs in a worker thread instead.
+"""
+import asyncio
+import weakref
+
+import requests
+from asgiref.sync import sync_to_async
+from nba_api.live.nba.endpoints._base import Endpoint as LiveEndpoint
+from nba_api.live.nba.library.http import NBALiveHTTP
+from nba_api.stats.library.http import NBAStatsHTTP
+
+from . import upstream_http
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Upstream connections one process keeps open at most
+MAX_CONNECTIONS = 200
+MAX_KEEPALIVE_CONNECTIONS = 50
+
+# One client per event loop. Under ASGI that's one long-lived client; async
+# views run under WSGI get a loop per request and close its client (close_client)
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_client():
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS)
+        client = _clients[loop] = httpx.AsyncClient(limits=limits, follow_redirects=True)
+    return client
+
+
+async def close_client():
+    # For event loops that end with the request: close their connections with them
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def http_class(endpoint):
+    return NBALiveHTTP if isinstance(endpoint, LiveEndpoint) else NBAStatsHTTP
+
+
+def build_request(endpoint):
+    # Mirrors the endpoint's get_request -> NBAHTTP.send_api_request
+    http_cls = http_class(endpoint)
+    if http_cls is NBALiveHTTP:
+        path = endpoint.endpoint_url.format(**vars(endpoint))
+        parameters = {}
+    else:
+        path = endpoint.endpoint
+        parameters = endpoint.parameters
+    url = http_cls.base_url.format(endpoint=path)
+    headers = endpoint.headers if endpoint.headers is not None else http_cls.headers
+    return http_cls, url, sorted(parameters.items()), headers
+
+
+def uses_async_client(endpoint):
+    if httpx is None or getattr(endpoint, 'proxy', None):
+        return False
+    session = http_class(endpoint)._session
+    return session is None or type(session) in (requests.Session, upstream_http.ResilientSession)
+
+
+async def load(endpoint):
+    if not uses_async_client(endpoint):
+        await sync_to_async(endpoint.get_request, thread_sensitive=False)()
+        return endpoint
+
+    http_cls, url, parameters, headers = build_request(endpoint)
+    # requests leaves out parameters that are None, so does this
+    params = [(name, value) for name, value in parameters if value is not None]
+    response = await get(url, params, headers, getattr(endpoint, 'timeout', None))
+
+    http = http_cls()
+    endpoint.nba_response = http.nba_response(
+        response=http.clean_contents(response.text),
+        status_code=response.status_code,
+        url=str(response.url),
+    )
+    await sync_to_async(endpoint.load_response, thread_sensitive=False)()
+    return endpoint
+
+
+async def get(url, params, headers, timeout=None):
+    # Same policy as upstream_http.ResilientSession.request, for a GET
+    config = upstream_http.get_config()
+    connect_timeout, read_timeout = upstream_http.effective_timeout(timeout, config)
+    timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+    breaker = upstream_http.get_breaker(url)
+    attempts = 1 + config['retries']
+
+    for attempt in range(attempts):
+        trial = breaker.check()
+        try:
+            response = await get_client().get(url, params=params, headers=headers, timeout=timeout)
+        except httpx.TransportError:
+            breaker.record_failure()
+            if attempt + 1 == attempts:
+                raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # Includes CancelledError: the task went away, the host didn't fail
+            breaker.release(trial)
+            raise
+        else:
+            if response.status_code not in upstream_http.RETRY_STATUSES:
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+            if attempt + 1 == attempts:
+                return response
+        await asyncio.sleep(upstream_http.backoff_delay(attempt, config))
@@ -0,0 +1,129 @@
+"""
+Async variants of the API views, for serving through app/asgi.py.
+
+Each variant loads the upstream requests its sync view needs concurrently on
+the event loop (``upstream.afetch_many``), then runs the sync view, pandas
+work included, in a worker thread with those endpoints prefetched. A slow
+stats.nba.com response only holds a coroutine, not a thread, so one process
+can have hundreds of upstream requests in flight.
+
+Sync views run in the default executor, not on asgiref's single shared
+thread, so they don't queue behind each other. Views that read the database
+(``db=True``) close the worker thread's connection when they're done, as
+Django does at the end of a sync request. When a prefetch fails, the sync
+view gets that error instead of fetching again. The list of requests
+is built from the request and the URL arguments (season-scoped views read
+``?season=``), and may come from a coroutine when it depends on the
+database, e.g. archived boxscores need none.
+"""
+import inspect
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+
+from . import archive, async_client, profiling, rankings, seasons, standings, upstream, views
+
+
+def async_variant(view, requests=None, db=False):
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        try:
+            return await run_async_view(view, requests, db, request, *args, **kwargs)
+        finally:
+            # Under WSGI the event loop only lives for this request, so its upstream connections don't either
+            if not isinstance(request, ASGIRequest):
+                await async_client.close_client()
+
+    return async_view
+
+
+async def run_async_view(view, requests, db, request, *args, **kwargs):
+    # Conditional views answer 304 before anything is loaded
+    etag_func = getattr(view, 'etag_func', None)
+    if etag_func is not None and request.META.get('HTTP_IF_NONE_MATCH'):
+        tag = await sync_to_async(call_in_worker, thread_sensitive=False)(db, views.request_etag, etag_func, request, *args, **kwargs)
+        response = views.not_modified(request, tag) if tag is not None else None
+        if response is not None:
+            return response
+
+    entries = {}
+    if requests is not None:
+        try:
+            needed = requests(request, *args, **kwargs)
+            if inspect.isawaitable(needed):
+                needed = await needed
+            # Failed fetches are passed on too, the sync view raises them and
+            # returns its usual error response
+            entries = await upstream.afetch_many(*needed, return_exceptions=True)
+        except Exception:
+            # The request list couldn't be built (e.g. a bad ?season=); the view rejects it
+            entries = {}
+
+    with upstream.prefetched(entries):
+        return await sync_to_async(call_in_worker, thread_sensitive=False)(db, view, request, *args, **kwargs)
+
+
+def call_in_worker(db, func, *args, **kwargs):
+    try:
+        return profiling.call(func, *args, **kwargs)
+    finally:
+        if db:
+            close_old_connections()
+
+
+async def boxscore_requests(request, game_id):
+    # Archived games don't touch the upstream API at all
+    if await archive.ais_archived(game_id):
+        return []
+    return [views.boxscore_request(game_id)]
+
+
+def team_requests(request, team_id):
+    season, season_type = seasons.season_params(request)
+    return [
+        standings.standings_request(season, season_type),
+        rankings.dashboard_request(season, season_type=season_type),
+        views.team_dashboard_request(team_id, season, season_type),
+        views.team_roster_request(team_id, season),
+        views.team_game_log_request(team_id, season, season_type),
+    ]
+
+
+def team_averages_requests(request, team_id):
+    season, season_type = seasons.season_params(request)
+    return [rankings.dashboard_request(season, season_type=season_type), views.team_dashboard_request(team_id, season, season_type)]
+
+
+def leaders_requests(request):
+    return [views.leaders_request(*seasons.season_params(request))]
+
+
+get_player_game_log = async_variant(views.get_player_game_log, lambda request, player_id: [views.player_game_log_request(player_id, *seasons.season_params(request))])
+live_game = async_variant(views.live_game, db=True)
+live_stream = views.live_stream
+get_all_teams = async_variant(views.get_all_teams, db=True)
+get_all_players = async_variant(views.get_all_players, db=True)
+search_players = async_variant(views.search_players, db=True)
+get_player_stats = async_variant(views.get_player_stats, lambda request, player_id: [views.player_career_request(player_id)])
+get_player_current_stats = async_variant(views.get_player_current_stats, lambda request, player_id: [views.player_dashboard_request(player_id, *seasons.season_params(request))])
+
+get_leaders = async_variant(views.get_leaders, leaders_requests)
+get_points_leaders = async_variant(views.get_points_leaders, leaders_requests)
+get_rebound_leaders = async_variant(views.get_rebound_leaders, leaders_requests)
+get_assist_leaders = async_variant(views.get_assist_leaders, leaders_requests)
+get_blocks_leaders = async_variant(views.get_blocks_leaders, leaders_requests)
+get_steals_leaders = async_variant(views.get_steals_leaders, leaders_requests)
+get_fgm_leaders = async_variant(views.get_fgm_leaders, leaders_requests)
+get_league_standings = async_variant(views.get_league_standings, lambda request: [standings.standings_request(*seasons.season_params(request))])
+
+get_game_boxscore = async_variant(views.get_game_boxscore, boxscore_requests, db=True)
+# Past dates are usually served from the database, so the scoreboard isn't loaded up front
+get_games_by_date = async_variant(views.get_games_by_date, db=True)
+
+get_team_stats = async_variant(views.get_team_stats, lambda request, team_id: [standings.standings_request(*seasons.season_params(request))])
+get_team_averages = async_variant(views.get_team_averages, team_averages_requests)
+get_team_roster = async_variant(views.get_team_roster, lambda request, team_id: [views.team_roster_request(team_id, seasons.season_params(request)[0])])
+get_team_game_log = async_variant(views.get_team_game_log, lambda request, team_id: [views.team_game_log_request(team_id, *seasons.season_params(request))])
+get_team_overview = async_variant(views.get_team_overview, team_requests)
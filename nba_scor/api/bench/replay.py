@@ -0,0 +1,89 @@
+"""
+Local stand-ins for the HTTP session nba_api uses.
+
+nba_api sends every request through ``NBAHTTP.get_session()``, so installing
+one of these with ``install_session`` swaps the network for fixture files
+without touching the endpoint classes or their parsing:
+
+- ReplaySession answers from fixtures/<name>.json, or from a synthetic
+  fixture (see synth.py) when nothing has been recorded for that endpoint.
+- RecordingSession makes the real request and saves the body as a fixture.
+"""
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from nba_api.library.http import NBAHTTP
+from nba_api.live.nba.library.http import NBALiveHTTP
+from nba_api.stats.library.http import NBAStatsHTTP
+
+from .synth import synthesize
+
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+
+HTTP_CLASSES = (NBAHTTP, NBAStatsHTTP, NBALiveHTTP)
+
+
+def fixture_name(url):
+    # stats.nba.com/stats/<endpoint> or cdn.nba.com/static/json/liveData/<endpoint>/<file>.json
+    parts = urlparse(url).path.strip('/').split('/')
+    if 'liveData' in parts:
+        return f"live_{parts[parts.index('liveData') + 1]}"
+    return parts[-1].lower()
+
+
+class FixtureResponse:
+    def __init__(self, url, text, status_code=200):
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+
+
+class ReplaySession:
+    def __init__(self, fixtures_dir=FIXTURES_DIR):
+        self.fixtures_dir = Path(fixtures_dir)
+        self.bodies = {}
+        self.sources = {}
+
+    def load(self, name):
+        if name not in self.bodies:
+            path = self.fixtures_dir / f'{name}.json'
+            if path.exists():
+                self.bodies[name] = path.read_text(encoding='utf-8')
+                self.sources[name] = 'recorded'
+            else:
+                self.bodies[name] = synthesize(name)
+                self.sources[name] = 'synthetic'
+        return self.bodies[name]
+
+    def get(self, url, params=None, **kwargs):
+        return FixtureResponse(url, self.load(fixture_name(url)))
+
+
+class RecordingSession:
+    def __init__(self, fixtures_dir=FIXTURES_DIR):
+        self.fixtures_dir = Path(fixtures_dir)
+        self.session = requests.Session()
+        self.recorded = []
+
+    def get(self, url, params=None, **kwargs):
+        response = self.session.get(url, params=params, **kwargs)
+        if response.ok:
+            name = fixture_name(url)
+            self.fixtures_dir.mkdir(parents=True, exist_ok=True)
+            (self.fixtures_dir / f'{name}.json').write_text(response.text, encoding='utf-8')
+            self.recorded.append(name)
+        return response
+
+
+def install_session(session):
+    # get_session() caches per class, so every HTTP class has to be pointed at the stand-in
+    previous = [http_cls._session for http_cls in HTTP_CLASSES]
+    for http_cls in HTTP_CLASSES:
+        http_cls.set_session(session)
+    return previous
+
+
+def restore_sessions(previous):
+    for http_cls, session in zip(HTTP_CLASSES, previous):
+        http_cls.set_session(session)
@@ -0,0 +1,169 @@
+"""
+Benchmark runner for the API views.
+
+Each case is requested through the Django test client, so URL routing and
+middleware are included. The upstream cache is disabled and in-process
+state is reset before every request, so each run pays the full cold cost
+against the replayed fixtures. Main-thread time is split into:
+
+- upstream: fetching and parsing nba_api responses, including building
+  DataFrames and dicts from them
+- encode: response serialization (JsonResponse and api.responses)
+- transform: everything else (pandas work, formatting, view logic)
+
+Work done on other threads (e.g. the live boxscore fan-out) shows up as
+transform time, because that is where the main thread waits for it.
+"""
+from collections import defaultdict
+import functools
+import statistics
+import threading
+import time
+import tracemalloc
+from unittest import mock
+
+from django.db import transaction
+from django.http import JsonResponse
+from django.test import Client, override_settings
+from nba_api.live.nba.endpoints._base import Endpoint as LiveEndpoint
+from nba_api.stats.endpoints._base import Endpoint as StatsEndpoint
+
+from api import archive, directory, upstream
+from api.responses import DataFrameResponse, FastJsonResponse
+
+from .synth import SEASON
+
+TEAM_ID = '1610612738'
+PLAYER_ID = '1628369'
+GAME_ID = '0022500001'
+GAME_DATE = '2025-11-15'
+
+# (name, path)
+CASES = [
+    ('live', '/api/live/'),
+    ('games_by_date', f'/api/games/date/{GAME_DATE}/'),
+    ('game_boxscore', f'/api/games/{GAME_ID}/'),
+    ('game_boxscore_columnar', f'/api/games/{GAME_ID}/?format=columnar'),
+    ('teams', '/api/teams/'),
+    ('team_stats', f'/api/teams/{TEAM_ID}/stats/'),
+    ('team_averages', f'/api/teams/{TEAM_ID}/averages/'),
+    ('team_roster', f'/api/teams/{TEAM_ID}/roster/'),
+    ('team_gamelog', f'/api/teams/{TEAM_ID}/gamelog/'),
+    ('team_gamelog_columnar', f'/api/teams/{TEAM_ID}/gamelog/?format=columnar'),
+    ('team_overview', f'/api/teams/{TEAM_ID}/overview/'),
+    ('players', '/api/players/'),
+    ('player_search', '/api/players/search/?q=player1'),
+    ('player_stats', f'/api/players/{PLAYER_ID}/'),
+    # The synthetic dashboard only has a row for its own season
+    ('player_current', f'/api/players/{PLAYER_ID}/current/?season={SEASON}'),
+    ('player_gamelog', f'/api/players/{PLAYER_ID}/gamelog/'),
+    ('player_gamelog_columnar', f'/api/players/{PLAYER_ID}/gamelog/?format=columnar'),
+    ('leaders', '/api/leaders/'),
+    ('leaders_points', '/api/leaders/points/'),
+    ('standings', '/api/standings/'),
+]
+
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+def reset_process_state():
+    # In-process snapshots built by the views; cleared so every run starts cold
+    directory._directory = None
+    directory._stored_index = None
+    upstream._derived.clear()
+    archive._memory.clear()
+
+
+class PhaseRecorder:
+    def __init__(self):
+        self.phases = defaultdict(float)
+        self.depth = 0
+
+    def wrap(self, phase, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # Only the outermost call on the request thread is counted
+            if threading.current_thread() is not threading.main_thread() or self.depth:
+                return func(*args, **kwargs)
+            self.depth += 1
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.depth -= 1
+                self.phases[phase] += time.perf_counter() - start
+        return wrapper
+
+    def patches(self):
+        return [
+            mock.patch.object(upstream, '_refresh', self.wrap('upstream', upstream._refresh)),
+            mock.patch.object(StatsEndpoint, 'get_data_frames', self.wrap('upstream', StatsEndpoint.get_data_frames)),
+            mock.patch.object(StatsEndpoint.DataSet, 'get_data_frame', self.wrap('upstream', StatsEndpoint.DataSet.get_data_frame)),
+            mock.patch.object(StatsEndpoint, 'get_dict', self.wrap('upstream', StatsEndpoint.get_dict)),
+            mock.patch.object(LiveEndpoint, 'get_dict', self.wrap('upstream', LiveEndpoint.get_dict)),
+            mock.patch.object(JsonResponse, '__init__', self.wrap('encode', JsonResponse.__init__)),
+            mock.patch.object(FastJsonResponse, '__init__', self.wrap('encode', FastJsonResponse.__init__)),
+            mock.patch.object(DataFrameResponse, '__init__', self.wrap('encode', DataFrameResponse.__init__)),
+        ]
+
+
+def request_once(client, path):
+    reset_process_state()
+    # Roll back anything a view persists so every iteration does the same work
+    with transaction.atomic():
+        response = client.get(path)
+        transaction.set_rollback(True)
+    return response
+
+
+def run_case(client, path, iterations):
+    totals = []
+    phases = defaultdict(list)
+    response = None
+    for _ in range(iterations):
+        recorder = PhaseRecorder()
+        patches = recorder.patches()
+        for patch in patches:
+            patch.start()
+        try:
+            start = time.perf_counter()
+            response = request_once(client, path)
+            total = time.perf_counter() - start
+        finally:
+            for patch in reversed(patches):
+                patch.stop()
+
+        totals.append(total)
+        phases['upstream'].append(recorder.phases['upstream'])
+        phases['encode'].append(recorder.phases['encode'])
+        phases['transform'].append(total - recorder.phases['upstream'] - recorder.phases['encode'])
+
+    # Peak memory is measured on a separate run, tracing slows everything down
+    tracemalloc.start()
+    request_once(client, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    to_ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        'path': path,
+        'status': response.status_code,
+        'bytes': len(response.content),
+        'iterations': iterations,
+        'mean_ms': to_ms(statistics.mean(totals)),
+        'median_ms': to_ms(statistics.median(totals)),
+        'min_ms': to_ms(min(totals)),
+        'upstream_ms': to_ms(statistics.median(phases['upstream'])),
+        'transform_ms': to_ms(statistics.median(phases['transform'])),
+        'encode_ms': to_ms(statistics.median(phases['encode'])),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def run(cases, iterations):
+    results = {}
+    with override_settings(CACHES=NO_CACHE, UPSTREAM_COMPLETED_SEASON_CACHE_ALIAS='default', ROOT_URLCONF='api.bench.urls'):
+        client = Client()
+        for name, path in cases:
+            results[name] = run_case(client, path, iterations)
+    return results
@@ -0,0 +1,138 @@
+"""
+Synthetic upstream fixtures.
+
+Used for any endpoint that has no recorded fixture yet. Stats responses are
+generated from the headers in nba_api's ``expected_data`` and live responses
+from its example documents, with row counts close to real responses. A fixed
+seed makes the output identical from run to run, so results stay comparable
+across commits.
+"""
+import copy
+import json
+import random
+
+from nba_api.live.nba.endpoints import boxscore, scoreboard
+from nba_api.stats.endpoints import (
+    commonallplayers, commonteamroster, leaguedashteamstats, leagueleaders, leaguestandingsv3,
+    playercareerstats, playerdashboardbyyearoveryear, playergamelog, scoreboardv2,
+    teamdashboardbygeneralsplits, teamgamelogs,
+)
+from nba_api.stats.static import teams
+
+SEASON = '2025-26'
+
+TEAM_IDS = [team['id'] for team in teams.get_teams()]
+
+# Fixture name -> (endpoint class, rows per result set)
+STATS_FIXTURES = {
+    'commonallplayers': (commonallplayers.CommonAllPlayers, 550),
+    'commonteamroster': (commonteamroster.CommonTeamRoster, 17),
+    'leaguedashteamstats': (leaguedashteamstats.LeagueDashTeamStats, 30),
+    'leagueleaders': (leagueleaders.LeagueLeaders, 500),
+    'leaguestandingsv3': (leaguestandingsv3.LeagueStandingsV3, 30),
+    'playercareerstats': (playercareerstats.PlayerCareerStats, 12),
+    'playerdashboardbyyearoveryear': (playerdashboardbyyearoveryear.PlayerDashboardByYearOverYear, 8),
+    'playergamelog': (playergamelog.PlayerGameLog, 82),
+    'scoreboardv2': (scoreboardv2.ScoreboardV2, 10),
+    'teamdashboardbygeneralsplits': (teamdashboardbygeneralsplits.TeamDashboardByGeneralSplits, 6),
+    'teamgamelogs': (teamgamelogs.TeamGameLogs, 82),
+}
+
+LIVE_GAMES = 10
+LIVE_PLAYERS_PER_TEAM = 15
+
+STRING_MARKERS = (
+    'NAME', 'CITY', 'ABBREVIATION', 'SLUG', 'TEXT', 'RECORD', 'STREAK', 'MATCHUP', 'PLAYER',
+    'DISPLAY', 'POSITION', 'HEIGHT', 'SCHOOL', 'COUNTRY', 'CODE', 'NICKNAME', 'HOME', 'ROAD',
+    'L10', 'LAST10', 'WL', 'DIVISION', 'TEAM', 'EXP', 'HOW_ACQUIRED',
+)
+
+
+def stats_value(header, row, rng):
+    name = header.upper()
+    if name in ('TEAM_ID', 'TEAMID', 'HOME_TEAM_ID'):
+        return TEAM_IDS[row % len(TEAM_IDS)]
+    if name == 'VISITOR_TEAM_ID':
+        return TEAM_IDS[(row + len(TEAM_IDS) // 2) % len(TEAM_IDS)]
+    if name in ('PLAYER_ID', 'PERSON_ID'):
+        return 1630000 + row
+    if name == 'GAME_ID':
+        return f'00225{row:05d}'
+    if name == 'CONFERENCE':
+        return 'East' if row % 2 else 'West'
+    if name == 'GROUP_VALUE':
+        return SEASON
+    if name in ('GAME_STATUS_ID', 'RANK', 'GP', 'W', 'L', 'WINS', 'LOSSES'):
+        return {'GAME_STATUS_ID': 3, 'RANK': row + 1}.get(name, rng.randint(1, 82))
+    if 'DATE' in name:
+        return '2025-11-15T00:00:00'
+    if name.endswith('PCT') or name.endswith('_RANK'):
+        return round(rng.random(), 3)
+    if name == 'DISPLAY_LAST_COMMA_FIRST':
+        return f'Player{row}, Synthetic'
+    if name == 'DISPLAY_FIRST_LAST':
+        return f'Synthetic Player{row}'
+    if any(marker in name for marker in STRING_MARKERS):
+        return f'{header.lower()}-{row % 30}'
+    return round(rng.uniform(0, 40), 1)
+
+
+def synth_stats(fixture):
+    endpoint_cls, rows = STATS_FIXTURES[fixture]
+    rng = random.Random(fixture)
+    result_sets = [
+        {
+            'name': name,
+            'headers': headers,
+            'rowSet': [[stats_value(header, row, rng) for header in headers] for row in range(rows)],
+        }
+        for name, headers in endpoint_cls.expected_data.items()
+    ]
+    if fixture == 'scoreboardv2':
+        # LineScore has one row per team: two per game
+        for result_set in result_sets:
+            if result_set['name'] == 'LineScore':
+                headers = result_set['headers']
+                result_set['rowSet'] = [[stats_value(header, row // 2, rng) for header in headers] for row in range(rows * 2)]
+                team_column = headers.index('TEAM_ID')
+                for row, values in enumerate(result_set['rowSet']):
+                    values[team_column] = TEAM_IDS[(row // 2 + (row % 2) * (len(TEAM_IDS) // 2)) % len(TEAM_IDS)]
+
+    if fixture == 'leagueleaders':
+        return {'resultSet': result_sets[0]}
+    return {'resultSets': result_sets}
+
+
+def synth_live_boxscore():
+    rng = random.Random('boxscore')
+    document = copy.deepcopy(boxscore.BoxScore.expected_data)
+    for side in ('homeTeam', 'awayTeam'):
+        team = document['game'][side]
+        template = team['players'][0]
+        team['players'] = []
+        for number in range(LIVE_PLAYERS_PER_TEAM):
+            player = copy.deepcopy(template)
+            player['personId'] = 1630000 + number
+            player['statistics'] = {stat: rng.randint(0, 30) for stat in player['statistics']}
+            team['players'].append(player)
+    return document
+
+
+def synth_live_scoreboard():
+    document = copy.deepcopy(scoreboard.ScoreBoard.expected_data)
+    template = document['scoreboard']['games'][0]
+    document['scoreboard']['games'] = []
+    for number in range(LIVE_GAMES):
+        game = copy.deepcopy(template)
+        game['gameId'] = f'00225{number:05d}'
+        game['gameStatus'] = 2 if number < LIVE_GAMES // 2 else 3
+        document['scoreboard']['games'].append(game)
+    return document
+
+
+def synthesize(fixture):
+    if fixture == 'live_boxscore':
+        return json.dumps(synth_live_boxscore())
+    if fixture == 'live_scoreboard':
+        return json.dumps(synth_live_scoreboard())
+    return json.dumps(synth_stats(fixture))
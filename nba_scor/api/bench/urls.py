@@ -0,0 +1,10 @@
+from django.urls import include, path
+
+from api import views
+from api.urls import api_patterns
+
+# The benchmark times the sync views directly: the async variants run the same
+# code in worker threads, where the phase recorder can't attribute it
+urlpatterns = [
+    path('api/', include(api_patterns(views))),
+]
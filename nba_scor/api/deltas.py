@@ -0,0 +1,127 @@
+"""
+Versioned boxscores and the deltas between them.
+
+Every boxscore response carries a ``version``: a digest of its content, so
+processes agree on it without sharing state and an unchanged boxscore keeps
+its version. The response for each version is kept in the cache for
+SNAPSHOT_TIMEOUT seconds.
+
+``?since=<version>`` then returns only what changed since that snapshot, as
+a merge patch of the full response:
+
+- changed top-level fields (``game_clock``, ``period``, ...)
+- per team, its changed fields, only the changed ``statistics`` and only the
+  changed ``players``, matched by ``player_id`` and holding just the changed
+  stats, and the ids of players no longer listed in ``removed_players``
+
+Unchanged teams are left out. When the ``since`` snapshot has expired (or
+never existed) the full response is returned instead, with ``delta: false``.
+"""
+import hashlib
+import re
+
+from . import upstream
+from .responses import dumps
+
+SNAPSHOT_TIMEOUT = 15 * 60
+
+# Response keys that aren't part of the boxscore content
+META_FIELDS = ('game_id', 'version', 'since', 'delta')
+TEAM_KEYS = ('home_team', 'away_team')
+
+VERSION_PATTERN = re.compile(r'[0-9a-f]{16}')
+
+
+def snapshot_key(game_id, version):
+    return f'boxscore-snapshot:{game_id}:{version}'
+
+
+def content_version(payload):
+    return hashlib.md5(dumps(payload)).hexdigest()[:16]
+
+
+def remember(game_id, payload):
+    """
+    Set ``payload['version']`` and keep the payload as that version's snapshot.
+    """
+    version = content_version(payload)
+    upstream.get_cache().add(snapshot_key(game_id, version), payload, timeout=SNAPSHOT_TIMEOUT)
+    payload['version'] = version
+    return version
+
+
+def diff_dict(old, new):
+    return {key: value for key, value in new.items() if old.get(key) != value}
+
+
+def diff_players(old_players, new_players):
+    old_by_id = {player['player_id']: player for player in old_players}
+    changed = []
+    for player in new_players:
+        old = old_by_id.get(player['player_id'])
+        if old is None:
+            changed.append(player)
+            continue
+        fields = diff_dict(old, player)
+        if fields:
+            changed.append({'player_id': player['player_id'], **fields})
+    return changed
+
+
+def removed_players(old_players, new_players):
+    new_ids = {player['player_id'] for player in new_players}
+    return [player['player_id'] for player in old_players if player['player_id'] not in new_ids]
+
+
+def diff_team(old, new):
+    delta = {}
+    for key, value in new.items():
+        if key == 'statistics':
+            statistics = diff_dict(old.get(key, {}), value)
+            if statistics:
+                delta[key] = statistics
+        elif key == 'players':
+            players = diff_players(old.get(key, []), value)
+            if players:
+                delta[key] = players
+            removed = removed_players(old.get(key, []), value)
+            if removed:
+                delta['removed_players'] = removed
+        elif old.get(key) != value:
+            delta[key] = value
+    return delta
+
+
+def diff_boxscore(old, new):
+    delta = {}
+    for key, value in new.items():
+        if key in META_FIELDS:
+            continue
+        if key in TEAM_KEYS:
+            team_delta = diff_team(old.get(key, {}), value)
+            if team_delta:
+                delta[key] = team_delta
+        elif old.get(key) != value:
+            delta[key] = value
+    return delta
+
+
+def delta_since(game_id, payload, since):
+    """
+    The response to ``?since=since`` for a remembered ``payload``.
+    """
+    if since == payload['version']:
+        return {'game_id': game_id, 'version': payload['version'], 'since': since, 'delta': True}
+
+    # Anything else can't name a snapshot (and shouldn't reach a cache key)
+    previous = upstream.get_cache().get(snapshot_key(game_id, since)) if VERSION_PATTERN.fullmatch(since) else None
+    if previous is None:
+        return {**payload, 'delta': False}
+
+    return {
+        'game_id': game_id,
+        'version': payload['version'],
+        'since': since,
+        'delta': True,
+        **diff_boxscore(previous, payload),
+    }
@@ -0,0 +1,112 @@
+"""
+In-memory player directory.
+
+Built once per process from nba_api's static player list plus the current
+season CommonAllPlayers table, and rebuilt every REFRESH_INTERVAL seconds.
+Gives O(1) lookups by player id for the player views.
+
+get_current_players() is the player list /api/players/ serves: the rows
+sync_nba stored, or the directory's until it has run. get_search_index()
+is the name index over that same list for /api/players/search/. The stored
+rows are indexed once per sync: sync_nba runs in its own process, so the
+index is rebuilt when the newest Player.updated_at changes.
+"""
+import threading
+import time
+
+from django.db.models import Max
+from nba_api.stats.endpoints import commonallplayers
+from nba_api.stats.static import players
+
+from . import upstream
+from .models import Player
+from .search import PlayerIndex
+
+REFRESH_INTERVAL = 3600
+
+
+class PlayerDirectory:
+    def __init__(self, static_players, current_players_df):
+        self.static_by_id = {player['id']: player for player in static_players}
+
+        # Current season players, as served by /api/players/
+        self.current_players = current_players_df.to_dict(orient='records')
+        self.search_index = PlayerIndex(self.current_players)
+
+        self.team_by_id = {}
+        for person_id, team_id, team_abbr, team_name, team_city in zip(
+            current_players_df['PERSON_ID'],
+            current_players_df['TEAM_ID'],
+            current_players_df['TEAM_ABBREVIATION'],
+            current_players_df['TEAM_NAME'],
+            current_players_df['TEAM_CITY'],
+        ):
+            self.team_by_id[int(person_id)] = {
+                'team_id': int(team_id) if team_id else None,
+                'team_abbreviation': team_abbr if team_abbr else None,
+                'team_name': team_name if team_name else None,
+                'team_city': team_city if team_city else None
+            }
+
+    def get_player(self, player_id):
+        return self.static_by_id.get(int(player_id))
+
+    def get_team_info(self, player_id):
+        return self.team_by_id.get(int(player_id))
+
+
+_directory = None
+_loaded_at = 0
+_lock = threading.Lock()
+
+
+def build_directory():
+    current_players = upstream.fetch(commonallplayers.CommonAllPlayers, is_only_current_season=1)
+    return PlayerDirectory(players.get_players(), current_players.get_data_frames()[0])
+
+
+def get_directory():
+    global _directory, _loaded_at
+
+    if _directory is not None and time.time() - _loaded_at < REFRESH_INTERVAL:
+        return _directory
+
+    # Only one thread rebuilds; the others keep using the previous directory if there is one
+    if not _lock.acquire(blocking=_directory is None):
+        return _directory
+    try:
+        if _directory is None or time.time() - _loaded_at >= REFRESH_INTERVAL:
+            _directory = build_directory()
+            _loaded_at = time.time()
+        return _directory
+    finally:
+        _lock.release()
+
+
+# (newest Player.updated_at, index of the stored players or None)
+_stored_index = None
+
+
+def get_stored_players():
+    # Players synced before the CommonAllPlayers rows were stored have no data,
+    # so those aren't served until the next sync
+    stored = list(Player.objects.filter(is_active=True).order_by('last_name', 'first_name').values_list('data', flat=True))
+    if stored and all(stored):
+        return stored
+    return None
+
+
+def get_current_players():
+    return get_stored_players() or get_directory().current_players
+
+
+def get_search_index():
+    global _stored_index
+
+    # Read before the rows, so a sync in between only causes another rebuild
+    updated_at = Player.objects.aggregate(updated_at=Max('updated_at'))['updated_at']
+    stored_index = _stored_index
+    if stored_index is None or stored_index[0] != updated_at:
+        stored = get_stored_players() if updated_at is not None else None
+        stored_index = _stored_index = (updated_at, PlayerIndex(stored) if stored else None)
+    return stored_index[1] or get_directory().search_index
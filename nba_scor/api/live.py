@@ -0,0 +1,142 @@
+"""
+Live scoreboard assembly and the snapshot written by the poll_live command.
+
+``fetch_live_games`` builds the /api/live/ payload (scoreboard plus real-time
+boxscore data for in-progress games). The poller stores its output with
+``write_snapshot`` so that ``live_game`` only has to read it; when no poller
+is running the snapshot expires and the view falls back to fetching inline.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import time
+
+from django.utils import timezone
+from nba_api.live.nba.endpoints import scoreboard, boxscore
+
+from . import upstream
+from .models import Game, LiveSnapshot
+
+# Live boxscores are fetched concurrently; there are never more than 15 games at once
+LIVE_BOXSCORE_WORKERS = 15
+LIVE_BOXSCORE_TIMEOUT = 5  # seconds, per game
+
+# Poll schedule, in seconds
+LIVE_POLL_INTERVAL = 10  # games in progress
+BREAK_POLL_INTERVAL = 60  # every live game is at halftime or between quarters
+PREGAME_MAX_INTERVAL = 30 * 60  # waiting for the next tip-off
+
+# The live scoreboard switches to the next day's games at about 6 AM Eastern
+SCOREBOARD_ROLLOVER_UTC_HOUR = 10
+
+# A snapshot is trusted until its next scheduled poll plus this grace period
+SNAPSHOT_GRACE = 15
+
+_live_boxscore_pool = ThreadPoolExecutor(max_workers=LIVE_BOXSCORE_WORKERS, thread_name_prefix='live-boxscore')
+
+
+def apply_live_boxscore(game, box_game):
+    # Extract real-time scores and update the game object
+    game['homeTeam']['score'] = box_game.get('homeTeam', {}).get('score', game['homeTeam'].get('score', 0))
+    game['awayTeam']['score'] = box_game.get('awayTeam', {}).get('score', game['awayTeam'].get('score', 0))
+    game['period'] = box_game.get('period', game.get('period', 0))
+    game['gameClock'] = box_game.get('gameClock', game.get('gameClock', ''))
+
+    # Also update period scores if available
+    game['homeTeam']['periods'] = box_game.get('homeTeam', {}).get('periods', game['homeTeam'].get('periods', []))
+    game['awayTeam']['periods'] = box_game.get('awayTeam', {}).get('periods', game['awayTeam'].get('periods', []))
+
+
+def fetch_live_games(fetch=upstream.fetch):
+    # Get the lightweight scoreboard first
+    scoreboard_data = fetch(scoreboard.ScoreBoard)
+    games_json = scoreboard_data.get_dict()
+    games = games_json['scoreboard']['games']
+
+    # For games that are live (gameStatus == 2), fetch real-time boxscore data in parallel
+    pending = {}
+    for game in games:
+        if game.get('gameStatus', 1) == 2:
+            pending[game.get('gameId')] = _live_boxscore_pool.submit(
+                fetch,
+                boxscore.BoxScore,
+                game_id=game.get('gameId'),
+                timeout=LIVE_BOXSCORE_TIMEOUT
+            )
+
+    deadline = time.monotonic() + LIVE_BOXSCORE_TIMEOUT
+    for game in games:
+        future = pending.get(game.get('gameId'))
+        if future is not None:
+            try:
+                live_boxscore = future.result(timeout=max(0, deadline - time.monotonic()))
+                apply_live_boxscore(game, live_boxscore.get_dict().get('game', {}))
+            except Exception:
+                # If boxscore fetch fails or times out, keep the scoreboard data
+                pass
+
+    return games
+
+
+def fetch_live_games_uncached():
+    # The poller runs on its own schedule, so it always goes straight to upstream
+    return fetch_live_games(fetch=lambda endpoint_cls, **params: endpoint_cls(**params))
+
+
+def scoreboard_day(now):
+    return (now - timedelta(hours=SCOREBOARD_ROLLOVER_UTC_HOUR)).date()
+
+
+def seconds_until_rollover(now):
+    rollover = datetime.combine(scoreboard_day(now) + timedelta(days=1), datetime.min.time(), tzinfo=now.tzinfo)
+    rollover += timedelta(hours=SCOREBOARD_ROLLOVER_UTC_HOUR)
+    return max(1, (rollover - now).total_seconds())
+
+
+def known_no_games(now):
+    """
+    True when the synced schedule covers today and has no games on it.
+    Without schedule data nothing is known and the scoreboard has to be asked.
+    """
+    day = scoreboard_day(now)
+    schedule_known = Game.objects.filter(date__date__gte=day).exists()
+    return schedule_known and not Game.objects.filter(date__date=day).exists()
+
+
+def is_break(game):
+    status_text = game.get('gameStatusText', '')
+    return status_text.startswith('Half') or status_text.startswith('End')
+
+
+def next_poll_delay(games, now):
+    live_games = [game for game in games if game.get('gameStatus') == 2]
+    if live_games:
+        if all(is_break(game) for game in live_games):
+            return BREAK_POLL_INTERVAL
+        return LIVE_POLL_INTERVAL
+
+    tip_offs = []
+    for game in games:
+        if game.get('gameStatus') == 1 and game.get('gameTimeUTC'):
+            tip_offs.append(datetime.fromisoformat(game['gameTimeUTC'].replace('Z', '+00:00')))
+    if tip_offs:
+        # Wake up at the next tip-off (tip times can move, so re-check at least every PREGAME_MAX_INTERVAL)
+        until_tip_off = (min(tip_offs) - now).total_seconds()
+        return min(max(until_tip_off, LIVE_POLL_INTERVAL), PREGAME_MAX_INTERVAL)
+
+    # Every game is final (or there were none): nothing changes until tomorrow's scoreboard
+    return seconds_until_rollover(now)
+
+
+def write_snapshot(games, valid_for):
+    LiveSnapshot.objects.update_or_create(
+        pk=1,
+        defaults={
+            'games': games,
+            'valid_until': timezone.now() + timedelta(seconds=valid_for + SNAPSHOT_GRACE),
+        }
+    )
+
+
+def read_snapshot():
+    snapshot = LiveSnapshot.objects.filter(pk=1, valid_until__gte=timezone.now()).first()
+    return snapshot.games if snapshot else None
@@ -0,0 +1,68 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from nba_api.live.nba.endpoints import boxscore
+from nba_api.stats.endpoints import scoreboardv2
+
+from api import archive, sync
+
+logger = logging.getLogger(__name__)
+
+
+def final_game_ids(game_date):
+    scoreboard_data = scoreboardv2.ScoreboardV2(game_date=game_date.strftime('%m/%d/%Y'))
+    games_df = scoreboard_data.game_header.get_data_frame().drop_duplicates('GAME_ID')
+    return [str(game_id) for game_id in games_df.loc[games_df['GAME_STATUS_ID'] == sync.GAME_STATUS_FINAL, 'GAME_ID']]
+
+
+def archive_game(game_id):
+    # Runs in a worker thread, which gets its own database connection
+    try:
+        return archive.store(game_id, boxscore.BoxScore(game_id=game_id).get_dict())
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = 'Archive the boxscores of every finished game between two dates (inclusive)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=date.fromisoformat, required=True, help='First date, YYYY-MM-DD')
+        parser.add_argument('--end', type=date.fromisoformat, default=None, help='Last date, YYYY-MM-DD (default: --start)')
+        parser.add_argument('--workers', type=int, default=4, help='Boxscores fetched concurrently')
+
+    def handle(self, *args, **options):
+        start = options['start']
+        end = options['end'] or start
+        if end < start:
+            raise CommandError('--end is before --start')
+
+        game_ids = []
+        day = start
+        while day <= end:
+            try:
+                game_ids.extend(final_game_ids(day))
+            except Exception:
+                logger.exception('Scoreboard for %s failed', day)
+            day += timedelta(days=1)
+
+        # Archived games are never fetched again
+        pending = sorted(set(game_ids) - archive.archived_ids(game_ids))
+        self.stdout.write(f'{len(game_ids)} finished games, {len(game_ids) - len(pending)} already archived')
+
+        archived = failed = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            futures = {pool.submit(archive_game, game_id): game_id for game_id in pending}
+            for future in as_completed(futures):
+                try:
+                    stored = future.result()
+                except Exception:
+                    logger.exception('Boxscore %s failed', futures[future])
+                    stored = False
+                archived += stored
+                failed += not stored
+
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} boxscores') + (f', {failed} failed' if failed else ''))
@@ -0,0 +1,81 @@
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from api.bench import replay, runner
+
+
+def current_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the API views offline against recorded (or synthetic) upstream fixtures'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per view')
+        parser.add_argument('--only', nargs='+', metavar='CASE', help='Only run these cases')
+        parser.add_argument('--output', default='bench-results.json', help='Where to write the JSON results')
+        parser.add_argument('--compare', metavar='RESULTS', help='Previous results file to compare against')
+        parser.add_argument('--record', action='store_true', help='Record fresh fixtures from the live API instead of benchmarking')
+
+    def handle(self, *args, **options):
+        cases = runner.CASES
+        if options['only']:
+            unknown = set(options['only']) - {name for name, _ in cases}
+            if unknown:
+                raise CommandError(f"Unknown cases: {', '.join(sorted(unknown))}")
+            cases = [case for case in cases if case[0] in options['only']]
+
+        session = replay.RecordingSession() if options['record'] else replay.ReplaySession()
+        previous_sessions = replay.install_session(session)
+
+        # Views may write to the database, so run against a throwaway test database
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            results = runner.run(cases, 1 if options['record'] else options['iterations'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            replay.restore_sessions(previous_sessions)
+
+        if options['record']:
+            self.stdout.write(self.style.SUCCESS(f"Recorded {', '.join(sorted(set(session.recorded)))}"))
+            return
+
+        report = {
+            'commit': current_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'fixtures': session.sources,
+            'results': results,
+        }
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2)
+
+        baseline = {}
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)['results']
+
+        self.stdout.write(f"{'case':<16}{'median ms':>11}{'upstream':>10}{'transform':>11}{'encode':>9}{'peak KB':>10}{'bytes':>10}")
+        for name, result in results.items():
+            line = (
+                f"{name:<16}{result['median_ms']:>11.2f}{result['upstream_ms']:>10.2f}{result['transform_ms']:>11.2f}"
+                f"{result['encode_ms']:>9.2f}{result['peak_kb']:>10.1f}{result['bytes']:>10}"
+            )
+            if name in baseline:
+                line += f"  x{baseline[name]['median_ms'] / result['median_ms']:.2f} vs baseline"
+            if result['status'] != 200:
+                line += f"  (HTTP {result['status']})"
+            self.stdout.write(line)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
@@ -0,0 +1,39 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api import live
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Poll the live scoreboard on a schedule and store the snapshot served by /api/live/'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Poll a single time and exit')
+
+    def handle(self, *args, **options):
+        while True:
+            now = timezone.now()
+            try:
+                if live.known_no_games(now):
+                    # The synced schedule says there is nothing to poll today
+                    games = []
+                    delay = live.seconds_until_rollover(now)
+                else:
+                    games = live.fetch_live_games_uncached()
+                    delay = live.next_poll_delay(games, now)
+
+                live.write_snapshot(games, valid_for=delay)
+                self.stdout.write(f'{now:%H:%M:%S} stored {len(games)} games, next poll in {delay:.0f}s')
+            except Exception:
+                # Leave the previous snapshot to expire so the view falls back to inline fetches
+                logger.exception('Live poll failed')
+                delay = live.BREAK_POLL_INTERVAL
+
+            if options['once']:
+                break
+            time.sleep(delay)
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from nba_api.stats.endpoints import commonallplayers, leaguestandingsv3, scheduleleaguev2
+
+from api import sync
+from api.seasons import get_current_season
+
+
+class Command(BaseCommand):
+    help = 'Upsert teams, current players and the season schedule into the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--season', default=None, help='Season to sync, e.g. 2025-26 (default: current)')
+        parser.add_argument('--skip-players', action='store_true', help='Do not sync players')
+        parser.add_argument('--skip-schedule', action='store_true', help='Do not sync the schedule')
+
+    def handle(self, *args, **options):
+        season = options['season'] or get_current_season()
+
+        standings = leaguestandingsv3.LeagueStandingsV3(league_id='00', season=season, season_type='Regular Season')
+        teams_by_id = sync.sync_teams(standings.get_data_frames()[0])
+        self.stdout.write(f'Synced {len(teams_by_id)} teams')
+
+        if not options['skip_players']:
+            current_players = commonallplayers.CommonAllPlayers(is_only_current_season=1, season=season)
+            count = sync.sync_players(current_players.get_data_frames()[0], teams_by_id)
+            self.stdout.write(f'Synced {count} players')
+
+        if not options['skip_schedule']:
+            schedule = scheduleleaguev2.ScheduleLeagueV2(season=season)
+            count = sync.sync_schedule(schedule.season_games.get_data_frame(), teams_by_id)
+            self.stdout.write(f'Synced {count} games')
+
+        self.stdout.write(self.style.SUCCESS(f'Sync complete for {season}'))
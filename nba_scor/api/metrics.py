@@ -0,0 +1,142 @@
+"""
+In-process metrics, exposed in the Prometheus text format at /metrics.
+
+- request latency per route, recorded by MetricsMiddleware
+- upstream calls per nba_api endpoint class: count, latency and errors,
+  recorded by upstream.py around every real request to nba_api
+- upstream cache lookups per endpoint class: hit, stale or miss
+
+Recording is a dict update under a per-metric lock, so it stays on in
+production. Values are per process: with several workers, scrape each one
+(or aggregate in Prometheus by instance).
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; Prometheus client defaults
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+REGISTRY = []
+
+
+def escape(value):
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def format_labels(names, values, extra=''):
+    pairs = [f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{%s}' % ','.join(pairs) if pairs else ''
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def reset(self):
+        with self.lock:
+            self.values.clear()
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type}']
+        with self.lock:
+            items = sorted(self.values.items())
+            lines.extend(self.sample_lines(items))
+        return lines
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, *labels, amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def sample_lines(self, items):
+        for labels, value in items:
+            yield f'{self.name}{format_labels(self.labelnames, labels)} {value}'
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            state = self.values.get(labels)
+            if state is None:
+                # Per-bucket (not cumulative) counts, with +Inf last; then sum
+                state = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def sample_lines(self, items):
+        bounds = ['le="%r"' % float(bound) for bound in self.buckets] + ['le="+Inf"']
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                yield f'{self.name}_bucket{format_labels(self.labelnames, labels, bound)} {cumulative}'
+            yield f'{self.name}_sum{format_labels(self.labelnames, labels)} {total}'
+            yield f'{self.name}_count{format_labels(self.labelnames, labels)} {cumulative}'
+
+
+REQUEST_LATENCY = Histogram(
+    'nbascore_http_request_duration_seconds', 'Time to produce a response, by route.', ('route', 'method'),
+)
+REQUESTS = Counter(
+    'nbascore_http_requests_total', 'Responses, by route and status code.', ('route', 'method', 'status'),
+)
+UPSTREAM_LATENCY = Histogram(
+    'nbascore_upstream_request_duration_seconds', 'nba_api request time (network and parsing), by endpoint class.', ('endpoint',),
+)
+UPSTREAM_REQUESTS = Counter(
+    'nbascore_upstream_requests_total', 'nba_api requests, by endpoint class.', ('endpoint',),
+)
+UPSTREAM_ERRORS = Counter(
+    'nbascore_upstream_errors_total', 'Failed nba_api requests, by endpoint class and exception.', ('endpoint', 'error'),
+)
+CACHE_LOOKUPS = Counter(
+    'nbascore_upstream_cache_lookups_total', 'Upstream cache lookups by result: hit (fresh), stale (served while refreshing, or as the last good value) or miss (fetched inline).', ('endpoint', 'result'),
+)
+
+
+@contextmanager
+def upstream_call(endpoint_cls):
+    name = endpoint_cls.__name__
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        UPSTREAM_ERRORS.inc(name, type(e).__name__)
+        raise
+    finally:
+        UPSTREAM_REQUESTS.inc(name)
+        UPSTREAM_LATENCY.observe(time.perf_counter() - start, name)
+
+
+def cache_lookup(endpoint_cls, result):
+    CACHE_LOOKUPS.inc(endpoint_cls.__name__, result)
+
+
+def render():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,205 @@
+"""
+Middleware for the API: request metrics, opt-in profiling and response
+compression.
+
+brotli is optional: install it to serve ``Content-Encoding: br`` to clients
+that accept it, otherwise gzip is used.
+"""
+import re
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+from . import metrics, profiling
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this aren't worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+BROTLI_QUALITY = 5
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/')
+
+# Compressed responses carry the representation's ETag plus an encoding suffix,
+# so the tag stays strong and is still unique per encoding (RFC 9110 8.8.3)
+ETAG_SUFFIX = re.compile(r'-(gzip|br)"')
+
+# Label for requests that matched no URL pattern
+UNMATCHED_ROUTE = '<unmatched>'
+
+# Any other method is labelled "other", so clients can't grow the label set
+METRIC_METHODS = ('GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+
+def accepted_encoding(request):
+    accept = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    if brotli is not None and re.search(r'\bbr\b', accept):
+        return 'br'
+    if re.search(r'\bgzip\b', accept):
+        return 'gzip'
+    return None
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return compress_string(content)
+
+
+def with_suffix(etag, encoding):
+    if etag and etag.endswith('"') and not ETAG_SUFFIX.search(etag):
+        return f'{etag[:-1]}-{encoding}"'
+    return etag
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress JSON and text responses with brotli (when installed) or gzip.
+
+    Goes above ConditionalGetMiddleware: If-None-Match is stripped of the
+    encoding suffix on the way in, so ETag checks below this middleware (and
+    in the views) compare the uncompressed representation's tag.
+    """
+
+    def process_request(self, request):
+        request.etag_encoding = None
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            match = ETAG_SUFFIX.search(if_none_match)
+            request.etag_encoding = match.group(1) if match else None
+            request.META['HTTP_IF_NONE_MATCH'] = ETAG_SUFFIX.sub('"', if_none_match)
+
+    def process_response(self, request, response):
+        # A 304 echoes the tag of the representation the client already has
+        if response.status_code == 304:
+            encoding = getattr(request, 'etag_encoding', None)
+            if encoding and response.has_header('ETag'):
+                response.headers['ETag'] = with_suffix(response['ETag'], encoding)
+                # Same Vary as the compressed 200 it revalidates
+                patch_vary_headers(response, ('Accept-Encoding',))
+            return response
+
+        if (
+            response.streaming
+            or response.status_code != 200
+            or response.has_header('Content-Encoding')
+            or not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES)
+            or len(response.content) < MIN_COMPRESS_SIZE
+        ):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = accepted_encoding(request)
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        response.headers['Content-Encoding'] = encoding
+        if response.has_header('ETag'):
+            response.headers['ETag'] = with_suffix(response['ETag'], encoding)
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Record every response's latency and status code by route (see metrics.py).
+
+    Goes first in MIDDLEWARE so the other middleware is timed too. Routes are
+    URL patterns ("api/teams/<str:team_id>/stats/"), not paths. Works
+    natively sync and async, so ASGI requests don't switch threads for it.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self.record(request, response, start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, start)
+        return response
+
+    def record(self, request, response, start):
+        match = request.resolver_match
+        route = match.route if match is not None else UNMATCHED_ROUTE
+        method = request.method if request.method in METRIC_METHODS else 'other'
+        metrics.REQUEST_LATENCY.observe(time.perf_counter() - start, route, method)
+        metrics.REQUESTS.inc(route, method, str(response.status_code))
+
+
+class ProfilingMiddleware:
+    """
+    Attach a phase breakdown to requests that ask for it (see profiling.py).
+
+    Only honoured with DEBUG or for staff users, so it goes after
+    AuthenticationMiddleware. Other requests pass straight through.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        mode = profiling.requested(request)
+        if mode is None or not (settings.DEBUG or getattr(getattr(request, 'user', None), 'is_staff', False)):
+            return self.get_response(request)
+
+        with profiling.recording(mode == profiling.CPROFILE_FLAG) as recorder:
+            with recorder.profiled():
+                response = self.get_response(request)
+        return self.finish(request, response, recorder)
+
+    async def __acall__(self, request):
+        mode = profiling.requested(request)
+        if mode is None or not (settings.DEBUG or await self.is_staff(request)):
+            return await self.get_response(request)
+
+        # On the event loop thread the profiler also sees other requests' coroutines
+        with profiling.recording(mode == profiling.CPROFILE_FLAG) as recorder:
+            with recorder.profiled():
+                response = await self.get_response(request)
+        return self.finish(request, response, recorder)
+
+    async def is_staff(self, request):
+        if not hasattr(request, 'auser'):
+            return False
+        return (await request.auser()).is_staff
+
+    def finish(self, request, response, recorder):
+        response.headers['Server-Timing'] = recorder.server_timing()
+        dump = recorder.dump(settings.PROFILE_DUMP_DIR, request.path)
+        if dump is not None:
+            response.headers['X-Profile-Dump'] = dump
+        return response
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_livesnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='status',
+            field=models.IntegerField(default=1),
+        ),
+    ]
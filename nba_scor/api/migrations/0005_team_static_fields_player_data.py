@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_boxscorearchive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='data',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='nickname',
+            field=models.CharField(blank=True, max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='state',
+            field=models.CharField(blank=True, max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='year_founded',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
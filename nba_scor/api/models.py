@@ -6,6 +6,9 @@ class Team(models.Model):
     full_name = models.CharField(max_length=100)
     abbreviation = models.CharField(max_length=10)
     city = models.CharField(max_length=50)
+    nickname = models.CharField(max_length=50, null=True, blank=True)
+    state = models.CharField(max_length=50, null=True, blank=True)
+    year_founded = models.IntegerField(null=True, blank=True)
     conference = models.CharField(max_length=20, null=True, blank=True)
     division = models.CharField(max_length=50, null=True, blank=True)
 
@@ -20,6 +23,10 @@ class Player(models.Model):
     last_name = models.CharField(max_length=50)
     team = models.ForeignKey(Team, on_delete=models.SET_NULL, null=True, blank=True)
     is_active = models.BooleanField(default=True)
+    # The player's CommonAllPlayers row, as served by /api/players/
+    data = models.JSONField(default=dict, blank=True)
+    # Set by every sync that writes the player; the player search index is rebuilt when it moves
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.full_name
@@ -32,7 +39,28 @@ class Game(models.Model):
     away_team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='away_games')
     home_score = models.IntegerField(default=0)
     away_score = models.IntegerField(default=0)
+    status = models.IntegerField(default=1)  # gameStatus: 1 scheduled, 2 live, 3 final
     is_live = models.BooleanField(default=False)
 
     def __str__(self):
         return f"{self.away_team} at {self.home_team} ({self.date.date()})"
+
+
+class LiveSnapshot(models.Model):
+    games = models.JSONField(default=list)
+    valid_until = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Live snapshot ({self.updated_at})"
+
+
+class BoxScoreArchive(models.Model):
+    # Raw live BoxScore JSON of a finished game, zlib-compressed; written once
+    game_id = models.CharField(max_length=20, unique=True)
+    game_date = models.DateField(null=True, blank=True)
+    data = models.BinaryField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Boxscore archive {self.game_id}"
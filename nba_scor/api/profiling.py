@@ -0,0 +1,183 @@
+"""
+Opt-in per-request profiling.
+
+ProfilingMiddleware profiles a request when it carries ``?profile=1`` or an
+``X-Profile: 1`` header, and the server runs with DEBUG or the user is staff.
+The response then gets a ``Server-Timing`` header with the time spent in:
+
+- upstream: waiting on nba_api requests
+- parse: turning responses into dicts and DataFrames (``get_dict``,
+  ``get_data_frames``, ...), including what nba_api does while loading
+- encode: serializing the response body
+- transform: everything else (pandas work, formatting, view logic)
+
+Phases are timed exclusively (parse inside an upstream call only counts as
+parse) and summed over every thread working on the request, so concurrent
+fetches can add up to more than the total.
+
+``?profile=cprofile`` also writes a cProfile dump of the request thread(s)
+to PROFILE_DUMP_DIR, named in the ``X-Profile-Dump`` header. The dump is a
+pstats file, readable by snakeviz, flameprof or ``python -m pstats``.
+
+Outside a profiled request the phase hooks cost a context variable lookup.
+"""
+import contextvars
+import cProfile
+import pstats
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+from nba_api.library.http import NBAResponse
+from nba_api.stats.endpoints._base import Endpoint as StatsEndpoint
+from nba_api.stats.library.http import NBAStatsResponse
+
+PHASES = ('upstream', 'parse', 'transform', 'encode')
+
+FLAG_VALUES = ('1', 'true', 'yes', 'cprofile')
+CPROFILE_FLAG = 'cprofile'
+
+# (owner, attribute) of the nba_api calls timed as parse
+PARSE_CALLS = [
+    (NBAResponse, 'get_dict'),
+    (NBAStatsResponse, 'get_normalized_dict'),
+    (NBAStatsResponse, 'get_data_sets'),
+    (StatsEndpoint, 'get_data_frames'),
+    (StatsEndpoint.DataSet, 'get_data_frame'),
+]
+
+_recorder = contextvars.ContextVar('profiling_recorder', default=None)
+
+# [phase name, time spent in nested phases] of the innermost running phase
+_frame = contextvars.ContextVar('profiling_frame', default=None)
+
+
+class Recorder:
+    def __init__(self, cprofile=False):
+        self.started = time.perf_counter()
+        self.phases = defaultdict(float)
+        self.lock = threading.Lock()
+        self.profilers = [] if cprofile else None
+
+    def add(self, name, seconds):
+        with self.lock:
+            self.phases[name] += seconds
+
+    @contextmanager
+    def profiled(self):
+        # One cProfile.Profile per thread; a thread that is already profiled is left alone
+        if self.profilers is None or sys.getprofile() is not None:
+            yield
+            return
+        profiler = cProfile.Profile()
+        with self.lock:
+            self.profilers.append(profiler)
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+
+    def breakdown(self):
+        total = time.perf_counter() - self.started
+        with self.lock:
+            phases = {name: self.phases.get(name, 0.0) for name in PHASES}
+        # Whatever isn't in a timed phase is transform
+        phases['transform'] = max(total - phases['upstream'] - phases['parse'] - phases['encode'], 0.0)
+        return phases, total
+
+    def server_timing(self):
+        phases, total = self.breakdown()
+        timings = [f'{name};dur={seconds * 1000:.2f}' for name, seconds in phases.items()]
+        return ', '.join(timings + [f'total;dur={total * 1000:.2f}'])
+
+    def dump(self, directory, path):
+        if not self.profilers:
+            return None
+        stats = pstats.Stats(self.profilers[0])
+        for profiler in self.profilers[1:]:
+            stats.add(profiler)
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', path).strip('-')[:80] or 'root'
+        filename = f"{time.strftime('%Y%m%dT%H%M%S')}-{slug}-{uuid.uuid4().hex[:8]}.prof"
+        stats.dump_stats(directory / filename)
+        return filename
+
+
+def requested(request):
+    # None, 'phases' or 'cprofile'
+    flag = (request.GET.get('profile') or request.headers.get('X-Profile') or '').lower()
+    if flag not in FLAG_VALUES:
+        return None
+    return CPROFILE_FLAG if flag == CPROFILE_FLAG else 'phases'
+
+
+@contextmanager
+def recording(cprofile=False):
+    recorder = Recorder(cprofile)
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+@contextmanager
+def phase(name):
+    recorder = _recorder.get()
+    if recorder is None:
+        yield
+        return
+
+    frame = [name, 0.0]
+    parent = _frame.get()
+    token = _frame.set(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _frame.reset(token)
+        recorder.add(name, elapsed - frame[1])
+        if parent is not None:
+            with recorder.lock:
+                parent[1] += elapsed
+
+
+def timed(name, func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if _recorder.get() is None:
+            return func(*args, **kwargs)
+        with phase(name):
+            return func(*args, **kwargs)
+    wrapper.profiling_phase = name
+    return wrapper
+
+
+def call(func, *args, **kwargs):
+    """
+    ``func(*args, **kwargs)``, under the request's cProfile when one was asked for.
+
+    For work handed to another thread (async views run their sync view this way).
+    """
+    recorder = _recorder.get()
+    if recorder is None or recorder.profilers is None:
+        return func(*args, **kwargs)
+    with recorder.profiled():
+        return func(*args, **kwargs)
+
+
+def install():
+    for owner, attribute in PARSE_CALLS:
+        func = getattr(owner, attribute)
+        if getattr(func, 'profiling_phase', None) is None:
+            setattr(owner, attribute, timed('parse', func))
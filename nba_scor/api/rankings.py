@@ -0,0 +1,65 @@
+"""
+League-wide team rank table.
+
+Built from a LeagueDashTeamStats frame with one vectorized rank pass over
+every numeric stat column, then answers rank lookups by TEAM_ID and column
+in O(1). Views get it through ``get_team_ranks``, which only rebuilds the
+table when the upstream cache has refreshed the league dashboard.
+"""
+import numpy as np
+from nba_api.stats.endpoints import leaguedashteamstats
+
+from . import upstream
+
+# Numeric columns that aren't stats
+NON_STAT_COLUMNS = ('TEAM_ID', 'CFID', 'CFPARAMS')
+
+# Stats where the lowest value is ranked first (OPP_PTS comes with the Opponent measure type)
+ASCENDING_COLUMNS = ('L', 'TOV', 'PF', 'BLKA', 'OPP_PTS')
+
+
+class RankTable:
+    def __init__(self, df, id_column='TEAM_ID'):
+        # Upstream already sends *_RANK columns, they're recomputed here instead
+        self.columns = [
+            column for column in df.select_dtypes(include='number').columns
+            if column not in NON_STAT_COLUMNS and not column.endswith('_RANK')
+        ]
+        self.column_index = {column: i for i, column in enumerate(self.columns)}
+        self.row_index = {int(team_id): i for i, team_id in enumerate(df[id_column])}
+
+        # Flip the ascending stats so a single descending rank covers every column;
+        # ties share the best rank (1, 2, 2, 4)
+        values = df[self.columns].astype(float)
+        flip = [column in ASCENDING_COLUMNS for column in self.columns]
+        values.loc[:, flip] = -values.loc[:, flip]
+        self.ranks = values.rank(ascending=False, method='min').fillna(0).to_numpy(dtype=np.int64)
+
+    def rank(self, team_id, column):
+        row = self.row_index.get(int(team_id))
+        if row is None or column not in self.column_index:
+            return None
+        return int(self.ranks[row, self.column_index[column]])
+
+    def team_ranks(self, team_id):
+        row = self.row_index.get(int(team_id))
+        if row is None:
+            return {}
+        return dict(zip(self.columns, self.ranks[row].tolist()))
+
+
+def build_rank_table(endpoint):
+    return RankTable(endpoint.get_data_frames()[0])
+
+
+def dashboard_request(season, per_mode='PerGame', season_type='Regular Season'):
+    return leaguedashteamstats.LeagueDashTeamStats, {
+        'season': season,
+        'per_mode_detailed': per_mode,
+        'season_type_all_star': season_type,
+    }
+
+
+def get_team_ranks(season, per_mode='PerGame', season_type='Regular Season'):
+    endpoint_cls, params = dashboard_request(season, per_mode, season_type)
+    return upstream.derive(endpoint_cls, build_rank_table, **params)
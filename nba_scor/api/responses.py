@@ -0,0 +1,95 @@
+"""
+JSON responses that understand pandas and NumPy values.
+
+FastJsonResponse is a drop-in for Django's JsonResponse. Values straight out
+of ``get_data_frames()`` (numpy scalars and arrays, NaN, Timestamps) are
+encoded as is: NaN and NaT become null and timestamps ISO 8601 strings, so
+views don't have to cast them first. orjson is used when it is installed,
+otherwise the stdlib encoder with the same conversions.
+
+DataFrameResponse serializes a DataFrame's rows with ``DataFrame.to_json``,
+which writes the JSON in one pass instead of building a dict per row first.
+"""
+import datetime
+import json
+import math
+
+import numpy as np
+import pandas as pd
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+
+from . import profiling
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def convert(obj):
+    # Values neither encoder handles on its own
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, (pd.Timestamp, datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        value = obj.item()
+        return None if isinstance(value, float) and math.isnan(value) else value
+    if isinstance(obj, np.ndarray):
+        return replace_nan(obj.tolist())
+    if isinstance(obj, pd.Series):
+        return obj.tolist()
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict(orient='records')
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class NumpyJSONEncoder(DjangoJSONEncoder):
+    def default(self, obj):
+        try:
+            return convert(obj)
+        except TypeError:
+            return super().default(obj)
+
+    def iterencode(self, obj, _one_shot=False):
+        return super().iterencode(replace_nan(obj), _one_shot)
+
+
+def replace_nan(obj):
+    # The stdlib encoder writes float NaN as a bare NaN, which isn't valid JSON
+    if isinstance(obj, float) and math.isnan(obj):
+        return None
+    if isinstance(obj, dict):
+        return {key: replace_nan(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [replace_nan(value) for value in obj]
+    return obj
+
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(data):
+        return orjson.dumps(data, default=convert, option=ORJSON_OPTIONS)
+else:
+    def dumps(data):
+        return json.dumps(data, cls=NumpyJSONEncoder).encode('utf-8')
+
+
+class FastJsonResponse(JsonResponse):
+    def __init__(self, data, safe=True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError('In order to allow non-dict objects to be serialized set the safe parameter to False.')
+        kwargs.setdefault('content_type', 'application/json')
+        with profiling.phase('encode'):
+            content = dumps(data)
+        HttpResponse.__init__(self, content=content, **kwargs)
+
+
+class DataFrameResponse(FastJsonResponse):
+    def __init__(self, df, orient='records', **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        with profiling.phase('encode'):
+            content = df.to_json(orient=orient, date_format='iso')
+        HttpResponse.__init__(self, content=content, **kwargs)
@@ -0,0 +1,143 @@
+"""
+Player name search for /api/players/search/.
+
+PlayerIndex is built over the rows /api/players/ serves, once per change to
+them (see directory.get_search_index). Names are folded to lowercase ASCII
+tokens ("Nikola Jokić" -> nikola, jokic; "P.J. Washington" -> pj,
+washington) and every prefix of every token maps to the players having it.
+Every query token has to prefix a different name token, in any order.
+Matches are ranked by:
+
+0. the whole name, first-last or last-first
+1. a prefix of the first-last name ("lebron ja"), by first-last name
+2. a prefix of the last-first name ("james le"), by last name
+3. any other match ("jam" for "LeBron James"), by last name
+
+The first two are ranges of sorted name lists, found by bisection, and each
+tier is only read until there are enough results, so a search stays in the
+microseconds however many players a short prefix matches.
+"""
+import re
+import unicodedata
+from bisect import bisect_left
+from itertools import chain
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+# Letters NFKD doesn't decompose into an ASCII base letter
+FOLDED_LETTERS = str.maketrans({'ø': 'o', 'đ': 'd', 'ł': 'l', 'ı': 'i', 'æ': 'ae', 'œ': 'oe', 'þ': 'th'})
+
+# Dropped inside tokens rather than splitting them: O'Neal, P.J., D’Angelo
+JOINING_CHARACTERS = re.compile(r"['.’`]")
+TOKEN_SEPARATORS = re.compile(r'[^0-9a-z]+')
+
+
+def fold(text):
+    text = unicodedata.normalize('NFKD', text.casefold()).translate(FOLDED_LETTERS)
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    text = JOINING_CHARACTERS.sub('', fold(text or ''))
+    return [token for token in TOKEN_SEPARATORS.split(text) if token]
+
+
+def parse_limit(value):
+    if not value:
+        return DEFAULT_LIMIT
+    limit = int(value)
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f'limit must be between 1 and {MAX_LIMIT}')
+    return limit
+
+
+class PlayerIndex:
+    def __init__(self, records, name_field='DISPLAY_FIRST_LAST', last_first_field='DISPLAY_LAST_COMMA_FIRST'):
+        entries = []
+        for record in records:
+            tokens = tokenize(record.get(name_field))
+            if not tokens:
+                continue
+            last_first = tokenize(record.get(last_first_field)) or tokens
+            entries.append((' '.join(last_first), ' '.join(tokens), tokens, record))
+        # Positions follow the last-first order, so sorted positions are alphabetical by last name
+        entries.sort(key=lambda entry: entry[0])
+
+        self.records = [record for _, _, _, record in entries]
+        self.tokens = [tokens for _, _, tokens, _ in entries]
+
+        # Sorted (name, position) pairs, for prefix ranges by bisection
+        self.by_last_first = [(last_first, position) for position, (last_first, _, _, _) in enumerate(entries)]
+        self.by_first_last = sorted((first_last, position) for position, (_, first_last, _, _) in enumerate(entries))
+
+        self.exact = {}
+        # token prefix -> sorted positions of the players with a token starting with it
+        prefixes = {}
+        for position, (last_first, first_last, tokens, _) in enumerate(entries):
+            for name in {first_last, last_first}:
+                self.exact.setdefault(name, []).append(position)
+            for token in tokens:
+                for end in range(1, len(token) + 1):
+                    positions = prefixes.setdefault(token[:end], [])
+                    if not positions or positions[-1] != position:
+                        positions.append(position)
+        self.prefixes = {prefix: tuple(positions) for prefix, positions in prefixes.items()}
+
+    def __len__(self):
+        return len(self.records)
+
+    def prefix_range(self, names, query):
+        # Positions whose name starts with query, in the order of names
+        for i in range(bisect_left(names, (query,)), len(names)):
+            name, position = names[i]
+            if not name.startswith(query):
+                return
+            yield position
+
+    def token_matches(self, query_tokens):
+        # Positions where every query token prefixes a name token, alphabetically
+        postings = sorted((self.prefixes.get(token, ()) for token in set(query_tokens)), key=len)
+        if len(postings) == 1 and len(query_tokens) == 1:
+            yield from postings[0]
+            return
+        candidates = set(postings[0]).intersection(*postings[1:])
+        for position in sorted(candidates):
+            if self.matches_all(position, query_tokens):
+                yield position
+
+    def matches_all(self, position, query_tokens):
+        # Each query token prefixes a different name token ("j j" needs two j-names)
+        remaining = list(self.tokens[position])
+        for query_token in sorted(query_tokens, key=len, reverse=True):
+            for i, token in enumerate(remaining):
+                if token.startswith(query_token):
+                    del remaining[i]
+                    break
+            else:
+                return False
+        return True
+
+    def search(self, text, limit=DEFAULT_LIMIT):
+        query_tokens = tokenize(text)
+        if not query_tokens:
+            return []
+
+        # Best tier first; later tiers are only looked at while results are short
+        query = ' '.join(query_tokens)
+        ranked = chain(
+            self.exact.get(query, ()),
+            self.prefix_range(self.by_first_last, query),
+            self.prefix_range(self.by_last_first, query),
+            self.token_matches(query_tokens),
+        )
+        results = []
+        seen = set()
+        for position in ranked:
+            if position in seen:
+                continue
+            seen.add(position)
+            results.append(self.records[position])
+            if len(results) == limit:
+                break
+        return results
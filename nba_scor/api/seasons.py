@@ -0,0 +1,78 @@
+"""
+Season query parameters for the season-scoped views.
+
+Seasons are nba_api strings like "2025-26". ``season_params`` reads
+``?season=`` and ``?season_type=`` from a request, defaulting to the current
+season's regular season. Seasons before the current one are complete: their
+upstream responses can't change anymore, so upstream.py caches them without
+expiry (see ``is_completed``).
+"""
+import re
+from datetime import date
+
+DEFAULT_SEASON_TYPE = 'Regular Season'
+SEASON_TYPES = ('Regular Season', 'Playoffs', 'Pre Season', 'PlayIn', 'All Star')
+
+# The first season stats.nba.com has data for, 1946-47
+FIRST_SEASON_YEAR = 1946
+
+SEASON_PATTERN = re.compile(r'(\d{4})-(\d{2})')
+
+# nba_api request parameters that carry the season
+SEASON_PARAMS = ('season', 'season_nullable')
+
+
+class InvalidSeason(ValueError):
+    pass
+
+
+def format_season(start_year):
+    return f"{start_year}-{str(start_year + 1)[-2:]}"
+
+
+def get_current_season():
+    today = date.today()
+    # Season starts in October
+    return format_season(today.year if today.month >= 10 else today.year - 1)
+
+
+def parse_season(value):
+    match = SEASON_PATTERN.fullmatch(value)
+    if not match or int(match.group(2)) != (int(match.group(1)) + 1) % 100:
+        raise InvalidSeason(f'Invalid season {value!r}. Use YYYY-YY, e.g. {get_current_season()}')
+
+    current = get_current_season()
+    if not FIRST_SEASON_YEAR <= int(match.group(1)) <= int(current[:4]):
+        raise InvalidSeason(f'season must be between {format_season(FIRST_SEASON_YEAR)} and {current}')
+    return value
+
+
+def parse_season_type(value):
+    if value not in SEASON_TYPES:
+        raise InvalidSeason(f"Invalid season_type {value!r}. Use one of: {', '.join(SEASON_TYPES)}")
+    return value
+
+
+def season_params(request):
+    """
+    ``(season, season_type)`` from the request's query string, validated.
+    """
+    season = request.GET.get('season')
+    season_type = request.GET.get('season_type')
+    return (
+        parse_season(season) if season else get_current_season(),
+        parse_season_type(season_type) if season_type else DEFAULT_SEASON_TYPE,
+    )
+
+
+def is_completed(season):
+    # "YYYY-YY" strings order the same way as the seasons
+    return season < get_current_season()
+
+
+def season_of(params):
+    # The season an upstream request is for, or None when it isn't season-scoped
+    for name in SEASON_PARAMS:
+        if params.get(name):
+            return params[name]
+    return None
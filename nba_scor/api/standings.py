@@ -0,0 +1,74 @@
+"""
+Shared league standings snapshot.
+
+Built once per LeagueStandingsV3 refresh (see ``upstream.derive``) and read
+by every view that needs standings: the formatted conference and league
+tables, plus conference/league rank and the raw standings row per TeamID.
+"""
+from nba_api.stats.endpoints import leaguestandingsv3
+
+from . import transforms, upstream
+from .transforms import Column
+
+STANDINGS_COLUMNS = [
+    Column('rank', 'rank', int),
+    Column('TeamID', 'team_id', int),
+    Column('TeamName', 'team_name'),
+    Column('TeamCity', 'team_city'),
+    Column('TeamSlug', 'team_abbreviation', default='N/A'),
+    Column('WINS', 'wins', int),
+    Column('LOSSES', 'losses', int),
+    Column('WinPCT', 'win_pct', float),
+    Column('ConferenceGamesBack', 'games_back', default='0'),
+    Column('Conference', 'conference'),
+    Column('Division', 'division', default='N/A'),
+    Column('HOME', 'home_record', default='N/A'),
+    Column('ROAD', 'road_record', default='N/A'),
+    Column('L10', 'last_10', default='N/A'),
+    Column('strCurrentStreak', 'streak', default='N/A'),
+]
+
+
+def sort_by_win_pct(df):
+    # Stable, so teams tied on WinPCT keep upstream's order in every view
+    return df.sort_values('WinPCT', ascending=False, kind='stable')
+
+
+class StandingsSnapshot:
+    def __init__(self, standings_df):
+        self.teams = {int(row['TeamID']): row for row in standings_df.to_dict(orient='records')}
+
+        self.conferences = {}
+        self.conference_rank = {}
+        for conference, conference_df in standings_df.groupby('Conference', sort=False):
+            conference_df = sort_by_win_pct(conference_df)
+            self.conferences[conference] = transforms.to_records(transforms.with_rank(conference_df), STANDINGS_COLUMNS)
+            self.conference_rank.update({int(team_id): rank for rank, team_id in enumerate(conference_df['TeamID'], 1)})
+
+        league_df = sort_by_win_pct(standings_df)
+        self.league = transforms.to_records(transforms.with_rank(league_df), STANDINGS_COLUMNS)
+        self.league_rank = {int(team_id): rank for rank, team_id in enumerate(league_df['TeamID'], 1)}
+
+    def conference(self, conference):
+        return self.conferences.get(conference, [])
+
+    def get_team(self, team_id):
+        return self.teams.get(int(team_id))
+
+
+def build_snapshot(endpoint):
+    return StandingsSnapshot(endpoint.get_data_frames()[0])
+
+
+def standings_request(season, season_type='Regular Season'):
+    return leaguestandingsv3.LeagueStandingsV3, {'league_id': '00', 'season': season, 'season_type': season_type}
+
+
+def get_standings(season, season_type='Regular Season'):
+    endpoint_cls, params = standings_request(season, season_type)
+    return upstream.derive(endpoint_cls, build_snapshot, **params)
+
+
+def get_etag(season, season_type='Regular Season'):
+    endpoint_cls, params = standings_request(season, season_type)
+    return upstream.etag(endpoint_cls, **params)
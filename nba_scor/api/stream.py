@@ -0,0 +1,132 @@
+"""
+Server-Sent Events feed for live scores (served through app/asgi.py).
+
+A single LiveFeed per process reads the live games on a fixed interval and
+fans the result out to every connected client. Clients get the full game list
+once on connect, then only the fields that changed per game.
+"""
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+
+from . import live
+
+logger = logging.getLogger(__name__)
+
+STREAM_INTERVAL = 5  # seconds between reads of the live games
+KEEPALIVE_INTERVAL = 15  # seconds of silence before a keepalive comment
+SUBSCRIBER_QUEUE_SIZE = 16
+
+# Fields pushed when they change
+GAME_FIELDS = ('gameStatus', 'gameStatusText', 'period', 'gameClock')
+TEAM_FIELDS = ('score', 'periods')
+
+
+def format_event(event, data):
+    return f'event: {event}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+
+def diff_game(old, new):
+    changes = {}
+    for field in GAME_FIELDS:
+        if old.get(field) != new.get(field):
+            changes[field] = new.get(field)
+
+    for side in ('homeTeam', 'awayTeam'):
+        old_team = old.get(side, {})
+        new_team = new.get(side, {})
+        team_changes = {
+            field: new_team.get(field)
+            for field in TEAM_FIELDS
+            if old_team.get(field) != new_team.get(field)
+        }
+        if team_changes:
+            changes[side] = team_changes
+
+    if changes:
+        changes['gameId'] = new.get('gameId')
+    return changes
+
+
+def load_games():
+    games = live.read_snapshot()
+    if games is None:
+        games = live.fetch_live_games()
+    return games
+
+
+class LiveFeed:
+    def __init__(self):
+        self.games = None
+        self.snapshot_event = None
+        self.subscribers = set()
+        self.task = None
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self.run())
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    def update(self, games):
+        """
+        Store the latest games and return the event to broadcast, if any.
+        """
+        previous = self.games
+        self.games = games
+        self.snapshot_event = format_event('snapshot', games)
+
+        if previous is None or [g.get('gameId') for g in previous] != [g.get('gameId') for g in games]:
+            # First read or a different slate of games: everyone needs the full list
+            return self.snapshot_event
+
+        changes = [diff_game(old, new) for old, new in zip(previous, games)]
+        changes = [change for change in changes if change]
+        if not changes:
+            return None
+        return format_event('update', changes)
+
+    def publish(self, event):
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow client: drop what it hasn't read and resync it with the full list
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self.snapshot_event)
+
+    async def run(self):
+        # One upstream/snapshot read per interval, shared by every subscriber
+        while self.subscribers:
+            try:
+                games = await sync_to_async(load_games)()
+                event = self.update(games)
+                if event is not None:
+                    self.publish(event)
+            except Exception:
+                logger.warning('Live feed refresh failed', exc_info=True)
+            await asyncio.sleep(STREAM_INTERVAL)
+
+
+live_feed = LiveFeed()
+
+
+async def stream_events(feed):
+    queue = feed.subscribe()
+    try:
+        if feed.snapshot_event is not None:
+            yield feed.snapshot_event
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+    finally:
+        feed.unsubscribe(queue)
@@ -0,0 +1,165 @@
+"""
+Bulk upserts of nba_api data into the Team, Player and Game models.
+
+Used by the sync_nba management command, and by views that persist data
+which can no longer change (e.g. final scores). Rows are written with
+bulk_create(update_conflicts=True) in batches, one transaction per batch.
+"""
+from datetime import datetime, timezone
+
+import pandas as pd
+from django.db import transaction
+from nba_api.stats.static import players, teams
+
+from .models import Game, Player, Team
+
+BATCH_SIZE = 500
+
+TEAM_UPDATE_FIELDS = ['full_name', 'abbreviation', 'city', 'nickname', 'state', 'year_founded', 'conference', 'division']
+PLAYER_UPDATE_FIELDS = ['full_name', 'first_name', 'last_name', 'team', 'is_active', 'data', 'updated_at']
+
+# Keys of nba_api's static team records, served by /api/teams/ in this order
+STATIC_TEAM_FIELDS = ['full_name', 'abbreviation', 'nickname', 'city', 'state', 'year_founded']
+GAME_UPDATE_FIELDS = ['date', 'home_team', 'away_team', 'home_score', 'away_score', 'status', 'is_live']
+
+# gameStatus values used by both the stats and live APIs
+GAME_STATUS_SCHEDULED = 1
+GAME_STATUS_LIVE = 2
+GAME_STATUS_FINAL = 3
+
+
+def upsert(model, objs, update_fields):
+    for start in range(0, len(objs), BATCH_SIZE):
+        with transaction.atomic():
+            model.objects.bulk_create(
+                objs[start:start + BATCH_SIZE],
+                update_conflicts=True,
+                unique_fields=['nba_id'],
+                update_fields=update_fields,
+            )
+
+
+def game_day(value):
+    # Games are stored at midnight UTC of their (Eastern) game date
+    return datetime.combine(pd.Timestamp(value).date(), datetime.min.time(), tzinfo=timezone.utc)
+
+
+def teams_by_nba_id():
+    return {team.nba_id: team for team in Team.objects.all()}
+
+
+def sync_teams(standings_df=None):
+    # Conference and division come from the standings when available
+    conferences = {}
+    if standings_df is not None and not standings_df.empty:
+        for team_id, conference, division in zip(standings_df['TeamID'], standings_df['Conference'], standings_df['Division']):
+            conferences[int(team_id)] = (conference, division)
+
+    upsert(Team, [
+        Team(
+            nba_id=team['id'],
+            **{field: team[field] for field in STATIC_TEAM_FIELDS},
+            conference=conferences.get(team['id'], (None, None))[0],
+            division=conferences.get(team['id'], (None, None))[1],
+        )
+        for team in teams.get_teams()
+    ], TEAM_UPDATE_FIELDS)
+    return teams_by_nba_id()
+
+
+def ensure_teams():
+    # Create any missing teams from static data without overwriting synced ones
+    if Team.objects.count() < len(teams.get_teams()):
+        Team.objects.bulk_create([
+            Team(nba_id=team['id'], **{field: team[field] for field in STATIC_TEAM_FIELDS})
+            for team in teams.get_teams()
+        ], ignore_conflicts=True)
+    return teams_by_nba_id()
+
+
+def team_record(team):
+    # A Team as nba_api's static team record
+    return {'id': team.nba_id, **{field: getattr(team, field) for field in STATIC_TEAM_FIELDS}}
+
+
+def sync_players(current_players_df, teams_by_id):
+    static_by_id = {player['id']: player for player in players.get_players()}
+    # Rows as JSON-safe dicts, nulls as None
+    records = current_players_df.astype(object).where(current_players_df.notna(), None).to_dict(orient='records')
+
+    objs = []
+    for person_id, full_name, last_comma_first, team_id, record in zip(
+        current_players_df['PERSON_ID'],
+        current_players_df['DISPLAY_FIRST_LAST'],
+        current_players_df['DISPLAY_LAST_COMMA_FIRST'],
+        current_players_df['TEAM_ID'],
+        records,
+    ):
+        person_id = int(person_id)
+        static_player = static_by_id.get(person_id)
+        if static_player:
+            first_name, last_name = static_player['first_name'], static_player['last_name']
+        else:
+            last_name, _, first_name = last_comma_first.partition(', ')
+
+        objs.append(Player(
+            nba_id=person_id,
+            full_name=full_name,
+            first_name=first_name,
+            last_name=last_name,
+            team=teams_by_id.get(int(team_id)) if team_id else None,
+            is_active=True,
+            data=record,
+        ))
+
+    upsert(Player, objs, PLAYER_UPDATE_FIELDS)
+
+    # Anyone not in the current season list is no longer active
+    Player.objects.filter(is_active=True).exclude(nba_id__in=[obj.nba_id for obj in objs]).update(
+        is_active=False, updated_at=datetime.now(timezone.utc)
+    )
+    return len(objs)
+
+
+def make_game(game_id, game_date, home_team, away_team, home_score, away_score, status):
+    return Game(
+        nba_id=int(game_id),
+        date=game_day(game_date),
+        home_team=home_team,
+        away_team=away_team,
+        home_score=home_score,
+        away_score=away_score,
+        status=status,
+        is_live=status == GAME_STATUS_LIVE,
+    )
+
+
+def upsert_games(games):
+    upsert(Game, games, GAME_UPDATE_FIELDS)
+
+
+def sync_schedule(schedule_df, teams_by_id):
+    objs = []
+    for game_id, game_date, status, home_id, home_score, away_id, away_score in zip(
+        schedule_df['gameId'],
+        schedule_df['gameDateEst'],
+        schedule_df['gameStatus'],
+        schedule_df['homeTeam_teamId'],
+        schedule_df['homeTeam_score'],
+        schedule_df['awayTeam_teamId'],
+        schedule_df['awayTeam_score'],
+    ):
+        home_team = teams_by_id.get(int(home_id))
+        away_team = teams_by_id.get(int(away_id))
+        if home_team is None or away_team is None:
+            continue  # All-Star and exhibition games against non-NBA teams
+
+        objs.append(make_game(
+            game_id, game_date, home_team, away_team,
+            int(home_score) if pd.notna(home_score) else 0,
+            int(away_score) if pd.notna(away_score) else 0,
+            int(status),
+        ))
+
+    upsert_games(objs)
+    return len(objs)
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import zlib
+from datetime import date
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import TransactionTestCase
+
+from api import archive, sync, upstream
+from api.models import BoxScoreArchive
+
+GAME_ID = '0022400001'
+
+
+def boxscore_data(status=sync.GAME_STATUS_FINAL, home_score=112):
+    return {'game': {
+        'gameId': GAME_ID,
+        'gameStatus': status,
+        'gameStatusText': 'Final' if status == sync.GAME_STATUS_FINAL else 'Q3 5:00',
+        'gameEt': '2024-10-22T19:30:00Z',
+        'homeTeam': {'teamId': 1610612738, 'teamTricode': 'BOS', 'score': home_score, 'players': [], 'statistics': {}},
+        'awayTeam': {'teamId': 1610612752, 'teamTricode': 'NYK', 'score': 96, 'players': [], 'statistics': {}},
+    }}
+
+
+class ArchiveStoreTests(TransactionTestCase):
+    def setUp(self):
+        archive._memory.clear()
+        self.addCleanup(archive._memory.clear)
+
+    def test_only_final_games_are_stored(self):
+        self.assertFalse(archive.store(GAME_ID, boxscore_data(status=sync.GAME_STATUS_LIVE)))
+        self.assertFalse(BoxScoreArchive.objects.exists())
+        self.assertIsNone(archive.load(GAME_ID))
+        self.assertIsNone(archive.etag(GAME_ID))
+
+    def test_stored_compressed_and_loaded_back(self):
+        self.assertTrue(archive.store(GAME_ID, boxscore_data()))
+
+        row = BoxScoreArchive.objects.get(game_id=GAME_ID)
+        self.assertEqual(row.game_date, date(2024, 10, 22))
+        self.assertEqual(json.loads(zlib.decompress(row.data)), boxscore_data())
+        self.assertEqual(archive.load(GAME_ID), boxscore_data())
+
+    def test_archive_is_write_once(self):
+        archive.store(GAME_ID, boxscore_data())
+        first_tag = archive.etag(GAME_ID)
+
+        # A later final response (e.g. a stat correction) doesn't replace the archived one
+        archive._memory.clear()
+        archive.store(GAME_ID, boxscore_data(home_score=113))
+
+        self.assertEqual(BoxScoreArchive.objects.count(), 1)
+        self.assertEqual(archive.load(GAME_ID)['game']['homeTeam']['score'], 112)
+        self.assertEqual(archive.etag(GAME_ID), first_tag)
+
+    def test_etag_is_stable_and_prefixed(self):
+        archive.store(GAME_ID, boxscore_data())
+        tag = archive.etag(GAME_ID)
+
+        self.assertTrue(tag.startswith(f'{archive.TAG_PREFIX}{GAME_ID}-'))
+        self.assertTrue(archive.is_tag(tag))
+        self.assertFalse(archive.is_tag('3f2a9c'))
+        # The same from the database and from memory
+        archive._memory.clear()
+        self.assertEqual(archive.etag(GAME_ID), tag)
+        self.assertEqual(archive.get(GAME_ID)[0], tag)
+        self.assertEqual(archive.etag(GAME_ID), tag)
+
+    def test_loaded_games_are_kept_in_memory(self):
+        archive.store(GAME_ID, boxscore_data())
+        archive.load(GAME_ID)
+
+        # Served from memory once loaded, even without the row
+        BoxScoreArchive.objects.all().delete()
+        self.assertEqual(archive.load(GAME_ID), boxscore_data())
+
+    def test_memory_drops_the_least_recently_used(self):
+        for game_id in ['0022400001', '0022400002', '0022400003']:
+            data = boxscore_data()
+            data['game']['gameId'] = game_id
+            archive.store(game_id, data)
+
+        with mock.patch.object(archive, 'MEMORY_ENTRIES', 2):
+            archive.load('0022400001')
+            archive.load('0022400002')
+            archive.load('0022400001')
+            archive.load('0022400003')
+
+        self.assertEqual(list(archive._memory), ['0022400001', '0022400003'])
+
+    def test_archived_ids(self):
+        archive.store(GAME_ID, boxscore_data())
+        self.assertEqual(archive.archived_ids([GAME_ID, '0022400002']), {GAME_ID})
+
+    def test_ais_archived(self):
+        self.assertFalse(asyncio.run(archive.ais_archived(GAME_ID)))
+        archive.store(GAME_ID, boxscore_data())
+        self.assertTrue(asyncio.run(archive.ais_archived(GAME_ID)))
+
+
+class ArchivedBoxscoreViewTests(TransactionTestCase):
+    # The view may run in async worker threads, on their own database connections
+    def setUp(self):
+        archive._memory.clear()
+        self.addCleanup(archive._memory.clear)
+        self.upstream_data = boxscore_data()
+        for target, attribute, value in [
+            (upstream, 'fetch', mock.Mock(side_effect=lambda *args, **kwargs: SimpleNamespace(get_dict=lambda: self.upstream_data))),
+            (upstream, 'etag', mock.Mock(return_value='3f2a9c')),
+            # Used instead of upstream.fetch when the async views are routed
+            (upstream, 'afetch_many', mock.AsyncMock(return_value={})),
+        ]:
+            patcher = mock.patch.object(target, attribute, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def get(self, **headers):
+        return self.client.get(f'/api/games/{GAME_ID}/', headers=headers)
+
+    def test_archived_game_is_served_without_an_upstream_call(self):
+        archive.store(GAME_ID, boxscore_data())
+
+        response = self.get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['home_team']['score'], 112)
+        self.assertEqual(response['Cache-Control'], archive.IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(response['ETag'], f'"{archive.etag(GAME_ID)}"')
+        upstream.fetch.assert_not_called()
+        upstream.etag.assert_not_called()
+
+    def test_archived_game_304_keeps_the_immutable_cache_control(self):
+        archive.store(GAME_ID, boxscore_data())
+        tag = self.get()['ETag']
+
+        response = self.get(if_none_match=tag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], tag)
+        self.assertEqual(response['Cache-Control'], archive.IMMUTABLE_CACHE_CONTROL)
+        upstream.fetch.assert_not_called()
+
+    def test_final_game_is_archived_on_first_view(self):
+        first = self.get()
+        self.assertEqual(first['Cache-Control'], 'no-cache')
+        self.assertTrue(BoxScoreArchive.objects.filter(game_id=GAME_ID).exists())
+
+        # From then on it's the archive's, even if upstream would answer differently
+        self.upstream_data = boxscore_data(home_score=113)
+        second = self.get()
+        self.assertEqual(second.json()['home_team']['score'], 112)
+        self.assertEqual(second['Cache-Control'], archive.IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(upstream.fetch.call_count, 1)
+
+    def test_live_game_is_not_archived(self):
+        self.upstream_data = boxscore_data(status=sync.GAME_STATUS_LIVE)
+
+        response = self.get()
+        self.get()
+
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        self.assertFalse(archive.is_tag(response['ETag'].strip('"')))
+        self.assertFalse(BoxScoreArchive.objects.exists())
+        self.assertEqual(upstream.fetch.call_count, 2)
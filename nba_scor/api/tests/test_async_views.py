@@ -0,0 +1,79 @@
+import asyncio
+import json
+import threading
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from api import async_views, upstream
+from api.responses import FastJsonResponse
+
+from .test_upstream import LOCMEM_CACHES, FakeEndpoint
+
+
+def team_view(request, team_id):
+    try:
+        return FastJsonResponse({'team_id': upstream.fetch(FakeEndpoint, team_id=team_id).team_id})
+    except Exception as e:
+        return FastJsonResponse({'error': str(e)}, status=400)
+
+
+def team_requests(request, team_id):
+    return [(FakeEndpoint, {'team_id': team_id})]
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AsyncVariantTests(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+        FakeEndpoint.calls = 0
+        self.factory = RequestFactory()
+
+    def test_prefetched_endpoint_is_not_fetched_again(self):
+        async def load(endpoint):
+            return endpoint
+
+        view = async_views.async_variant(team_view, team_requests)
+        with mock.patch.object(upstream.async_client, 'load', load):
+            response = asyncio.run(view(self.factory.get('/'), 7))
+
+        self.assertEqual(response.status_code, 200)
+        # Built once by the prefetch, with get_request=False, and reused by the sync view
+        self.assertEqual(FakeEndpoint.calls, 1)
+
+    def test_failed_prefetch_is_not_retried_by_the_sync_view(self):
+        load = mock.AsyncMock(side_effect=ConnectionError('upstream down'))
+
+        view = async_views.async_variant(team_view, team_requests)
+        with mock.patch.object(upstream.async_client, 'load', load):
+            response = asyncio.run(view(self.factory.get('/'), 7))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content), {'error': 'upstream down'})
+        self.assertEqual(load.await_count, 1)
+        # Only the prefetch built an endpoint; the sync view didn't send a request of its own
+        self.assertEqual(FakeEndpoint.calls, 1)
+
+    def test_database_views_run_concurrently(self):
+        # Both views have to be running at once to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+
+        def db_view(request):
+            barrier.wait()
+            return FastJsonResponse({'thread': threading.get_ident()})
+
+        view = async_views.async_variant(db_view, db=True)
+
+        async def main():
+            return await asyncio.gather(view(self.factory.get('/')), view(self.factory.get('/')))
+
+        responses = asyncio.run(main())
+        threads = {json.loads(response.content)['thread'] for response in responses}
+        self.assertEqual(len(threads), 2)
+
+    def test_wsgi_request_closes_its_event_loop_client(self):
+        view = async_views.async_variant(lambda request: FastJsonResponse({}))
+        with mock.patch.object(async_views.async_client, 'close_client', mock.AsyncMock()) as close_client:
+            asyncio.run(view(self.factory.get('/')))
+        close_client.assert_awaited_once()
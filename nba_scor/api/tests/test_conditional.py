@@ -0,0 +1,129 @@
+import gzip
+from unittest import mock
+
+import pandas as pd
+from django.core.cache import caches
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from nba_api.stats.endpoints import leagueleaders
+
+from api import middleware, upstream, views
+
+from .test_upstream import LOCMEM_CACHES
+
+
+class LeagueLeaders:
+    # Stands in for nba_api's LeagueLeaders; cached (pickled) like the real one
+    calls = 0
+
+    def __init__(self, get_request=True, **params):
+        LeagueLeaders.calls += 1
+
+    def get_data_frames(self):
+        count = 60
+        return [pd.DataFrame({
+            'PLAYER_ID': range(1, count + 1),
+            'PLAYER': [f'Player {i}' for i in range(1, count + 1)],
+            'TEAM': ['AAA'] * count,
+            'GP': [10] * count,
+            **{column: [float(i) for i in range(count)] for column in ['PTS', 'REB', 'AST', 'BLK', 'STL', 'FGM']},
+        })]
+
+
+@override_settings(CACHES=LOCMEM_CACHES, UPSTREAM_CACHE_TTLS={'LeagueLeaders': 60})
+class UpstreamEtagTests(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+        upstream._derived.clear()
+        LeagueLeaders.calls = 0
+        self.now = 1000.0
+        for target, attribute, value in [
+            (upstream.time, 'time', lambda: self.now),
+            (upstream, '_schedule_refresh', mock.Mock()),
+            (leagueleaders, 'LeagueLeaders', LeagueLeaders),
+            # Used instead of the constructor's request when the async views are routed
+            (upstream.async_client, 'load', mock.AsyncMock(side_effect=lambda endpoint: endpoint)),
+        ]:
+            patcher = mock.patch.object(target, attribute, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def get(self, path='/api/leaders/', **headers):
+        return self.client.get(path, {'categories': 'pts', 'limit': 5}, headers=headers)
+
+    def test_matching_if_none_match_gets_304_without_a_fetch(self):
+        first = self.get()
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first['Cache-Control'], 'no-cache')
+
+        second = self.get(if_none_match=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(second['Cache-Control'], 'no-cache')
+        self.assertEqual(LeagueLeaders.calls, 1)
+
+    def test_etag_changes_with_the_upstream_version(self):
+        first = self.get()
+
+        # Past the stale window the entry is refetched, with a new version
+        self.now += 60 * upstream.STALE_MULTIPLIER
+        self.get()
+        self.assertEqual(LeagueLeaders.calls, 2)
+
+        second = self.get(if_none_match=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        self.assertEqual(self.get(if_none_match=second['ETag']).status_code, 304)
+
+    def test_compressed_response_tag_has_an_encoding_suffix(self):
+        path = '/api/leaders/'
+        params = {'categories': 'pts,reb,ast', 'limit': 60}
+        plain = self.client.get(path, params)
+        compressed = self.client.get(path, params, headers={'accept_encoding': 'gzip'})
+
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(compressed['ETag'], plain['ETag'][:-1] + '-gzip"')
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+
+        # The suffix is stripped before comparing, and put back on the 304
+        revalidated = self.client.get(path, params, headers={'accept_encoding': 'gzip', 'if_none_match': compressed['ETag']})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated['ETag'], compressed['ETag'])
+        self.assertIn('Accept-Encoding', revalidated['Vary'])
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.get(accept_encoding='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertFalse(response.has_header('Vary') and 'Accept-Encoding' in response['Vary'])
+
+    def test_invalid_query_with_a_matching_tag_is_rejected(self):
+        tag = self.get()['ETag']
+        for params in [{'categories': 'pts,dunks'}, {'limit': 0}, {'limit': 'ten'}, {'season': '1999'}]:
+            with self.subTest(params=params):
+                response = self.client.get('/api/leaders/', params, headers={'if_none_match': tag})
+                self.assertEqual(response.status_code, 400)
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    def test_encoding_suffix_is_stripped_from_if_none_match(self):
+        request = RequestFactory().get('/', headers={'if_none_match': '"abc-gzip"'})
+        middleware.CompressionMiddleware(lambda request: None).process_request(request)
+        self.assertEqual(request.META['HTTP_IF_NONE_MATCH'], '"abc"')
+        self.assertEqual(request.etag_encoding, 'gzip')
+
+    def test_with_suffix_is_added_once(self):
+        self.assertEqual(middleware.with_suffix('"abc"', 'br'), '"abc-br"')
+        self.assertEqual(middleware.with_suffix('"abc-br"', 'br'), '"abc-br"')
+        self.assertEqual(middleware.with_suffix('W/"abc"', 'gzip'), 'W/"abc-gzip"')
+
+
+class NotModifiedTests(SimpleTestCase):
+    def test_archived_boxscore_304_is_immutable(self):
+        request = RequestFactory().get('/', headers={'if_none_match': '"archive-0022400001-1700000000"'})
+        response = views.not_modified(request, 'archive-0022400001-1700000000')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['Cache-Control'], views.archive.IMMUTABLE_CACHE_CONTROL)
+
+    def test_other_tag_is_no_match(self):
+        request = RequestFactory().get('/', headers={'if_none_match': '"abc"'})
+        self.assertIsNone(views.not_modified(request, 'def'))
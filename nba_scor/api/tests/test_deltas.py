@@ -0,0 +1,146 @@
+import copy
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from api import deltas
+
+from .test_upstream import LOCMEM_CACHES
+
+GAME_ID = '0022400001'
+
+
+def player(player_id, points=0, rebounds=0):
+    return {'player_id': player_id, 'name': f'Player {player_id}', 'statistics': {'points': points, 'reboundsTotal': rebounds}}
+
+
+def boxscore():
+    return {
+        'game_id': GAME_ID,
+        'game_status_text': 'Q2 5:00',
+        'period': 2,
+        'game_clock': 'PT05M00.00S',
+        'home_team': {
+            'team_id': 1,
+            'score': 40,
+            'statistics': {'points': 40, 'assists': 10},
+            'players': [player(11, 10), player(12, 8), player(13, 2)],
+        },
+        'away_team': {
+            'team_id': 2,
+            'score': 38,
+            'statistics': {'points': 38, 'assists': 7},
+            'players': [player(21, 12), player(22, 6)],
+        },
+    }
+
+
+def merge_team(team, delta):
+    # Mirrors mergeTeam in frontend/src/components/GameBoxscore.jsx
+    if not delta:
+        return team
+    fields = {key: value for key, value in delta.items() if key != 'removed_players'}
+    removed = set(delta.get('removed_players', []))
+    changed = {p['player_id']: p for p in delta.get('players', [])}
+    players = [{**p, **changed.get(p['player_id'], {})} for p in team['players'] if p['player_id'] not in removed]
+    known = {p['player_id'] for p in team['players']}
+    added = [p for p in delta.get('players', []) if p['player_id'] not in known]
+    return {
+        **team,
+        **fields,
+        'statistics': {**team['statistics'], **delta.get('statistics', {})},
+        'players': players + added,
+    }
+
+
+def apply_delta(previous, response):
+    # Mirrors applyBoxscoreDelta in the same component
+    if not response['delta']:
+        return response
+    fields = {key: value for key, value in response.items() if key not in ('home_team', 'away_team', 'delta', 'since')}
+    return {
+        **previous,
+        **fields,
+        'home_team': merge_team(previous['home_team'], response.get('home_team')),
+        'away_team': merge_team(previous['away_team'], response.get('away_team')),
+    }
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class DeltaSinceTests(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.old = boxscore()
+        deltas.remember(GAME_ID, self.old)
+        self.new = copy.deepcopy(self.old)
+        self.new.pop('version')
+
+    def delta(self):
+        deltas.remember(GAME_ID, self.new)
+        return deltas.delta_since(GAME_ID, self.new, self.old['version'])
+
+    def assertAppliesCleanly(self, response):
+        # The client's copy has the new version and content after merging the delta
+        self.assertTrue(response['delta'])
+        self.assertEqual(apply_delta(self.old, response), self.new)
+
+    def test_unchanged_version_sends_no_content(self):
+        response = deltas.delta_since(GAME_ID, self.old, self.old['version'])
+        self.assertEqual(response, {'game_id': GAME_ID, 'version': self.old['version'], 'since': self.old['version'], 'delta': True})
+
+    def test_changed_fields_and_stats_only(self):
+        self.new['game_clock'] = 'PT04M31.00S'
+        self.new['home_team']['score'] = 42
+        self.new['home_team']['statistics']['points'] = 42
+        self.new['home_team']['players'][1]['statistics'] = {'points': 10, 'reboundsTotal': 0}
+
+        response = self.delta()
+
+        self.assertEqual(response['game_clock'], 'PT04M31.00S')
+        self.assertNotIn('period', response)
+        self.assertNotIn('away_team', response)
+        self.assertEqual(response['home_team'], {
+            'score': 42,
+            'statistics': {'points': 42},
+            'players': [{'player_id': 12, 'statistics': {'points': 10, 'reboundsTotal': 0}}],
+        })
+        self.assertAppliesCleanly(response)
+
+    def test_new_player_is_sent_whole(self):
+        self.new['away_team']['players'].append(player(23, 2))
+
+        response = self.delta()
+
+        self.assertEqual(response['away_team'], {'players': [player(23, 2)]})
+        self.assertAppliesCleanly(response)
+
+    def test_removed_players_are_listed(self):
+        del self.new['home_team']['players'][1]
+        self.new['away_team']['players'] = []
+
+        response = self.delta()
+
+        self.assertEqual(response['home_team'], {'removed_players': [12]})
+        self.assertEqual(response['away_team'], {'removed_players': [21, 22]})
+        self.assertAppliesCleanly(response)
+
+    def test_removed_added_and_changed_players_together(self):
+        home_players = self.new['home_team']['players']
+        home_players[0]['statistics']['reboundsTotal'] = 3
+        del home_players[2]
+        home_players.append(player(14, 1))
+
+        response = self.delta()
+
+        self.assertEqual(response['home_team']['removed_players'], [13])
+        self.assertEqual([p['player_id'] for p in response['home_team']['players']], [11, 14])
+        self.assertAppliesCleanly(response)
+
+    def test_unknown_or_malformed_since_returns_full_response(self):
+        deltas.remember(GAME_ID, self.new)
+        for since in ['0123456789abcdef', 'not-a-version', '']:
+            with self.subTest(since=since):
+                response = deltas.delta_since(GAME_ID, self.new, since)
+                self.assertFalse(response['delta'])
+                self.assertEqual(response['home_team'], self.new['home_team'])
+                self.assertEqual(response['version'], self.new['version'])
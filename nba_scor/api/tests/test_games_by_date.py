@@ -0,0 +1,111 @@
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+import pandas as pd
+from django.test import TransactionTestCase
+
+from api import sync, upstream, views
+from api.models import Game
+
+CELTICS_ID = 1610612738
+LAKERS_ID = 1610612747
+KNICKS_ID = 1610612752
+HEAT_ID = 1610612748
+
+PAST_DATE = date(2024, 1, 15)
+
+
+def scoreboard(statuses):
+    # ScoreboardV2 with two games; statuses are their GAME_STATUS_IDs
+    game_header = pd.DataFrame({
+        'GAME_ID': ['0022300601', '0022300602'],
+        'GAME_STATUS_ID': statuses,
+        'HOME_TEAM_ID': [CELTICS_ID, KNICKS_ID],
+        'VISITOR_TEAM_ID': [LAKERS_ID, HEAT_ID],
+    })
+    line_score = pd.DataFrame({
+        'GAME_ID': ['0022300601', '0022300601', '0022300602', '0022300602'],
+        'TEAM_ID': [CELTICS_ID, LAKERS_ID, KNICKS_ID, HEAT_ID],
+        'PTS': [114, 105, 98, None],
+    })
+    return SimpleNamespace(
+        game_header=SimpleNamespace(get_data_frame=lambda: game_header),
+        line_score=SimpleNamespace(get_data_frame=lambda: line_score),
+    )
+
+
+class GamesByDateTests(TransactionTestCase):
+    # The view may run in async worker threads, on their own database connections
+    def setUp(self):
+        self.teams = sync.ensure_teams()
+        patcher = mock.patch.object(upstream, 'fetch')
+        self.fetch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def store(self, game_date, status, game_id='0022300601', home_score=100, away_score=90):
+        sync.upsert_games([sync.make_game(
+            game_id, game_date, self.teams[CELTICS_ID], self.teams[LAKERS_ID], home_score, away_score, status,
+        )])
+
+    def get(self, game_date):
+        return self.client.get(f'/api/games/date/{game_date.isoformat()}/')
+
+    def test_no_stored_games(self):
+        self.assertIsNone(views.get_stored_games(PAST_DATE))
+
+    def test_finished_date_is_served_from_the_database(self):
+        self.store(PAST_DATE, sync.GAME_STATUS_FINAL)
+
+        response = self.get(PAST_DATE)
+
+        self.fetch.assert_not_called()
+        self.assertEqual(response.json(), [views.format_date_game('0022300601', CELTICS_ID, 'BOS', 100, LAKERS_ID, 'LAL', 90)])
+
+    def test_past_date_with_a_pending_game_is_not_trusted(self):
+        self.store(PAST_DATE, sync.GAME_STATUS_FINAL)
+        self.store(PAST_DATE, sync.GAME_STATUS_SCHEDULED, game_id='0022300602')
+        self.assertIsNone(views.get_stored_games(PAST_DATE))
+
+    def test_today_with_a_live_game_is_not_trusted(self):
+        self.store(date.today(), sync.GAME_STATUS_LIVE)
+        self.assertIsNone(views.get_stored_games(date.today()))
+
+    def test_future_date_is_served_from_the_schedule(self):
+        future = date.today() + timedelta(days=30)
+        self.store(future, sync.GAME_STATUS_SCHEDULED, home_score=0, away_score=0)
+        self.assertEqual(len(views.get_stored_games(future)), 1)
+
+    def test_games_of_a_finished_date_are_stored_as_final(self):
+        self.fetch.return_value = scoreboard([sync.GAME_STATUS_FINAL, sync.GAME_STATUS_FINAL])
+
+        first = self.get(PAST_DATE).json()
+        self.assertEqual([(game['homeTeam']['score'], game['awayTeam']['score']) for game in first], [(114, 105), (98, 0)])
+
+        stored = {game.nba_id: game for game in Game.objects.all()}
+        self.assertEqual(set(stored), {22300601, 22300602})
+        self.assertTrue(all(game.status == sync.GAME_STATUS_FINAL for game in stored.values()))
+        self.assertEqual((stored[22300601].home_score, stored[22300601].away_score), (114, 105))
+
+        # The next request for the date doesn't go upstream, and gets the same games
+        self.assertEqual(self.get(PAST_DATE).json(), first)
+        self.assertEqual(self.fetch.call_count, 1)
+
+    def test_games_are_not_stored_until_every_game_is_final(self):
+        self.fetch.return_value = scoreboard([sync.GAME_STATUS_FINAL, sync.GAME_STATUS_LIVE])
+
+        self.get(PAST_DATE)
+        self.get(PAST_DATE)
+
+        self.assertFalse(Game.objects.exists())
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_pending_stored_games_are_replaced_by_final_scores(self):
+        self.store(PAST_DATE, sync.GAME_STATUS_SCHEDULED, home_score=0, away_score=0)
+        self.fetch.return_value = scoreboard([sync.GAME_STATUS_FINAL, sync.GAME_STATUS_FINAL])
+
+        self.get(PAST_DATE)
+
+        game = Game.objects.get(nba_id=22300601)
+        self.assertEqual((game.status, game.home_score, game.away_score), (sync.GAME_STATUS_FINAL, 114, 105))
+        self.assertEqual(len(views.get_stored_games(PAST_DATE)), 2)
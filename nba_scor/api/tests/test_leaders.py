@@ -0,0 +1,79 @@
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase, override_settings
+
+from api import views
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'leaders-tests'}}
+
+
+def leaders_df():
+    return pd.DataFrame({
+        'PLAYER_ID': [1, 2, 3, 4, 5],
+        'PLAYER': ['A', 'B', 'C', 'D', 'E'],
+        'TEAM': ['AAA', 'BBB', 'CCC', 'DDD', 'EEE'],
+        'GP': [10, 10, 10, 10, 10],
+        'PTS': [20.0, 30.0, 25.0, 30.0, np.nan],
+        'REB': [5.0, 4.0, 3.0, 2.0, 1.0],
+        'AST': [1.0, 2.0, 3.0, 4.0, 5.0],
+        'BLK': [0.0, 0.0, 0.0, 0.0, 0.0],
+        'STL': [1.0, 1.0, 1.0, 1.0, 1.0],
+        'FGM': [8.0, 9.0, 7.0, 6.0, 5.0],
+    })
+
+
+class ComputeLeadersTests(SimpleTestCase):
+    def test_orders_by_value_and_shares_ranks_on_ties(self):
+        leaders = views.compute_leaders(leaders_df(), ['pts'], limit=3)['pts']
+        self.assertEqual([leader['player_id'] for leader in leaders], [2, 4, 3])
+        self.assertEqual([leader['rank'] for leader in leaders], [1, 1, 3])
+        self.assertEqual(leaders[0]['points'], 30.0)
+
+    def test_limit_of_one(self):
+        leaders = views.compute_leaders(leaders_df(), ['reb'], limit=1)['reb']
+        self.assertEqual([leader['player_id'] for leader in leaders], [1])
+
+    def test_limit_above_row_count_returns_every_row(self):
+        leaders = views.compute_leaders(leaders_df(), ['ast'], limit=100)['ast']
+        self.assertEqual([leader['player_id'] for leader in leaders], [5, 4, 3, 2, 1])
+
+    def test_missing_values_rank_last(self):
+        leaders = views.compute_leaders(leaders_df(), ['pts'], limit=5)['pts']
+        self.assertEqual(leaders[-1]['player_id'], 5)
+
+    def test_non_positive_limit_returns_nothing(self):
+        self.assertEqual(views.compute_leaders(leaders_df(), ['pts'], limit=0), {'pts': []})
+        self.assertEqual(views.compute_leaders(leaders_df(), ['pts'], limit=-5), {'pts': []})
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class GetLeadersTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(views, 'get_league_leaders_df', side_effect=lambda *args: leaders_df())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, limit):
+        return self.client.get('/api/leaders/', {'categories': 'pts', 'limit': limit})
+
+    def test_limit_edges(self):
+        self.assertEqual(len(self.get(1).json()['pts']), 1)
+        self.assertEqual(len(self.get(views.MAX_LEADERS_LIMIT).json()['pts']), 5)
+
+    def test_default_limit(self):
+        response = self.client.get('/api/leaders/', {'categories': 'pts'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['pts']), 5)
+
+    def test_invalid_limits_are_rejected(self):
+        for limit in ['0', '-5', str(views.MAX_LEADERS_LIMIT + 1), 'ten', '1.5']:
+            with self.subTest(limit=limit):
+                response = self.get(limit)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('limit', response.json()['error'])
+
+    def test_unknown_category_is_rejected(self):
+        response = self.client.get('/api/leaders/', {'categories': 'pts,dunks'})
+        self.assertEqual(response.status_code, 400)
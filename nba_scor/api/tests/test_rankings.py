@@ -0,0 +1,128 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from api import rankings, upstream, views
+from api.rankings import RankTable
+
+
+def dashboard_df():
+    # A slice of LeagueDashTeamStats: four teams
+    return pd.DataFrame({
+        'TEAM_ID': [1, 2, 3, 4],
+        'TEAM_NAME': ['A', 'B', 'C', 'D'],
+        'GP': [10, 10, 10, 10],
+        'W': [8, 5, 5, 2],
+        'L': [2, 5, 5, 8],
+        'PTS': [110.0, 120.5, 99.0, 120.5],
+        'FGM': [40.0, 41.0, 42.0, 43.0],
+        'FGA': [85.0, 86.0, 87.0, 88.0],
+        'FG_PCT': [0.47, 0.48, 0.49, 0.5],
+        'FG3_PCT': [0.35, 0.36, 0.37, 0.38],
+        'FT_PCT': [0.75, 0.8, 0.85, 0.9],
+        'REB': [44.0, 45.0, 46.0, np.nan],
+        'AST': [25.0, 24.0, 23.0, 22.0],
+        'TOV': [12.0, 15.0, 11.0, 15.0],
+        'STL': [7.0, 8.0, 9.0, 10.0],
+        'BLK': [5.0, 4.0, 3.0, 2.0],
+        'OPP_PTS': [105.0, 112.0, 101.0, 118.0],
+        'W_RANK': [1, 2, 2, 4],
+        'CFID': [10, 10, 10, 10],
+    })
+
+
+class RankTableTests(SimpleTestCase):
+    def setUp(self):
+        self.table = RankTable(dashboard_df())
+
+    def ranks(self, column):
+        return [self.table.rank(team_id, column) for team_id in [1, 2, 3, 4]]
+
+    def test_higher_is_better_by_default(self):
+        self.assertEqual(self.ranks('AST'), [1, 2, 3, 4])
+
+    def test_lower_is_better_columns_are_flipped(self):
+        self.assertEqual(self.ranks('L'), [1, 2, 2, 4])
+        self.assertEqual(self.ranks('TOV'), [2, 3, 1, 3])
+        self.assertEqual(self.ranks('OPP_PTS'), [2, 3, 1, 4])
+
+    def test_ties_share_the_best_rank(self):
+        self.assertEqual(self.ranks('PTS'), [3, 1, 4, 1])
+        self.assertEqual(self.ranks('W'), [1, 2, 2, 4])
+
+    def test_missing_values_get_rank_zero(self):
+        self.assertEqual(self.ranks('REB'), [3, 2, 1, 0])
+
+    def test_only_stat_columns_are_ranked(self):
+        self.assertNotIn('TEAM_ID', self.table.columns)
+        self.assertNotIn('CFID', self.table.columns)
+        self.assertNotIn('W_RANK', self.table.columns)
+        self.assertNotIn('TEAM_NAME', self.table.columns)
+
+    def test_unknown_team_or_column(self):
+        self.assertIsNone(self.table.rank(99, 'PTS'))
+        self.assertIsNone(self.table.rank(1, 'DUNKS'))
+        self.assertEqual(self.table.team_ranks(99), {})
+
+    def test_team_ranks_cover_every_column(self):
+        ranks = self.table.team_ranks('3')
+        self.assertEqual(set(ranks), set(self.table.columns))
+        self.assertEqual(ranks['TOV'], 1)
+
+
+class TeamAveragesTests(SimpleTestCase):
+    # Keys the averages endpoint returned before the rank table, which the frontend reads
+    LEGACY_KEYS = {
+        'team_id': int,
+        'games_played': int,
+        'wins': int,
+        'losses': int,
+        'points': float,
+        'points_rank': int,
+        'field_goals_made': float,
+        'field_goals_attempted': float,
+        'field_goal_pct': float,
+        'three_point_pct': float,
+        'free_throw_pct': float,
+        'total_rebounds': float,
+        'assists': float,
+        'turnovers': float,
+        'steals': float,
+        'blocks': float,
+    }
+
+    def setUp(self):
+        df = dashboard_df()
+        dashboard = SimpleNamespace(get_data_frames=lambda: [df[df['TEAM_ID'] == 3]])
+        for target, attribute, value in [
+            (rankings, 'get_team_ranks', mock.Mock(return_value=RankTable(df))),
+            (upstream, 'fetch', mock.Mock(return_value=dashboard)),
+        ]:
+            patcher = mock.patch.object(target, attribute, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_legacy_keys_and_types(self):
+        averages, status = views.build_team_averages(3, '2025-26')
+        self.assertEqual(status, 200)
+        for key, kind in self.LEGACY_KEYS.items():
+            with self.subTest(key=key):
+                self.assertIsInstance(averages[key], kind)
+        self.assertEqual(averages['points'], 99.0)
+        self.assertEqual(averages['points_rank'], 4)
+
+    def test_every_reported_stat_has_a_rank(self):
+        averages, _ = views.build_team_averages(3, '2025-26')
+        self.assertEqual(averages['turnovers_rank'], 1)
+        self.assertEqual(averages['losses_rank'], 2)
+        for key, _, rank_key in views.TEAM_AVERAGE_STATS:
+            with self.subTest(key=key):
+                self.assertIsInstance(averages[rank_key], int)
+        self.assertEqual(averages['ranks']['OPP_PTS'], 1)
+
+    def test_empty_dashboard_is_404(self):
+        upstream.fetch.return_value = SimpleNamespace(get_data_frames=lambda: [dashboard_df().iloc[0:0]])
+        self.assertEqual(views.build_team_averages(3, '2025-26')[1], 404)
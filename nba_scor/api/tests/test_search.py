@@ -0,0 +1,157 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import pandas as pd
+from django.test import SimpleTestCase, TransactionTestCase
+
+from api import directory, search, sync
+from api.search import PlayerIndex
+
+NAMES = [
+    ('LeBron James', 'James, LeBron'),
+    ('James Harden', 'Harden, James'),
+    ('Jamal Murray', 'Murray, Jamal'),
+    ('Kevin Durant', 'Durant, Kevin'),
+    ('Durant Kevinson', 'Kevinson, Durant'),
+    ('Kevin Love', 'Love, Kevin'),
+    ('Jaren Jackson Jr.', 'Jackson Jr., Jaren'),
+    ('Nikola Jokić', 'Jokić, Nikola'),
+    ('Luka Dončić', 'Dončić, Luka'),
+    ('Dennis Schröder', 'Schröder, Dennis'),
+    ('P.J. Washington', 'Washington, P.J.'),
+    ("Shaquille O'Neal", "O'Neal, Shaquille"),
+]
+
+
+def player_records(names=NAMES):
+    return [
+        {'PERSON_ID': person_id, 'DISPLAY_FIRST_LAST': first_last, 'DISPLAY_LAST_COMMA_FIRST': last_first, 'TEAM_ID': 0}
+        for person_id, (first_last, last_first) in enumerate(names, start=1)
+    ]
+
+
+class PlayerIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = PlayerIndex(player_records())
+
+    def names(self, text, limit=search.DEFAULT_LIMIT):
+        return [record['DISPLAY_FIRST_LAST'] for record in self.index.search(text, limit)]
+
+    def test_first_last_prefix_ranks_before_last_first_prefix(self):
+        self.assertEqual(self.names('james'), ['James Harden', 'LeBron James'])
+
+    def test_prefix_tiers_are_ordered_by_name(self):
+        self.assertEqual(self.names('jam'), ['Jamal Murray', 'James Harden', 'LeBron James'])
+
+    def test_exact_name_ranks_first(self):
+        # "durant kevinson" starts with the query, but Kevin Durant is an exact match
+        self.assertEqual(self.names('durant kevin'), ['Kevin Durant', 'Durant Kevinson'])
+        self.assertEqual(self.names('Kevin Durant'), ['Kevin Durant', 'Durant Kevinson'])
+
+    def test_other_token_matches_come_last_by_last_name(self):
+        self.assertEqual(self.names('kevin'), ['Kevin Durant', 'Kevin Love', 'Durant Kevinson'])
+
+    def test_tokens_match_in_any_order(self):
+        self.assertEqual(self.names('love kevin'), ['Kevin Love'])
+        self.assertEqual(self.names('lo ke'), ['Kevin Love'])
+
+    def test_each_query_token_needs_its_own_name_token(self):
+        self.assertEqual(self.names('j j'), ['Jaren Jackson Jr.'])
+        self.assertEqual(self.names('james james'), [])
+
+    def test_accents_are_folded(self):
+        self.assertEqual(self.names('jokic'), ['Nikola Jokić'])
+        self.assertEqual(self.names('JOKIĆ'), ['Nikola Jokić'])
+        self.assertEqual(self.names('doncic'), ['Luka Dončić'])
+        self.assertEqual(self.names('schroder'), ['Dennis Schröder'])
+
+    def test_records_are_returned_unfolded(self):
+        self.assertEqual(self.index.search('doncic')[0], player_records()[8])
+
+    def test_punctuation_inside_names_is_dropped(self):
+        for text in ['pj', 'P.J.', 'p.j. wash', 'washington pj']:
+            with self.subTest(text=text):
+                self.assertEqual(self.names(text), ['P.J. Washington'])
+        for text in ['oneal', "o'neal", 'O’Neal']:
+            with self.subTest(text=text):
+                self.assertEqual(self.names(text), ["Shaquille O'Neal"])
+
+    def test_limit(self):
+        self.assertEqual(self.names('j', limit=2), ['Jamal Murray', 'James Harden'])
+        self.assertEqual(len(self.names('j', limit=search.MAX_LIMIT)), 5)
+
+    def test_empty_queries_match_nothing(self):
+        for text in ['', '   ', '.,-']:
+            with self.subTest(text=text):
+                self.assertEqual(self.index.search(text), [])
+
+
+class ParseLimitTests(SimpleTestCase):
+    def test_default(self):
+        self.assertEqual(search.parse_limit(None), search.DEFAULT_LIMIT)
+        self.assertEqual(search.parse_limit(''), search.DEFAULT_LIMIT)
+
+    def test_edges(self):
+        self.assertEqual(search.parse_limit('1'), 1)
+        self.assertEqual(search.parse_limit(str(search.MAX_LIMIT)), search.MAX_LIMIT)
+
+    def test_invalid(self):
+        for value in ['0', '-1', str(search.MAX_LIMIT + 1), 'ten']:
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    search.parse_limit(value)
+
+
+def current_players_df(names):
+    records = player_records(names)
+    return pd.DataFrame({
+        'PERSON_ID': [record['PERSON_ID'] for record in records],
+        'DISPLAY_FIRST_LAST': [record['DISPLAY_FIRST_LAST'] for record in records],
+        'DISPLAY_LAST_COMMA_FIRST': [record['DISPLAY_LAST_COMMA_FIRST'] for record in records],
+        'TEAM_ID': [0] * len(records),
+    })
+
+
+class SearchIndexSourceTests(TransactionTestCase):
+    # The search view runs in async worker threads, on their own database connections
+    def setUp(self):
+        self.fallback_players = player_records(NAMES[:3])
+        fake_directory = SimpleNamespace(
+            current_players=self.fallback_players,
+            search_index=PlayerIndex(self.fallback_players),
+        )
+        for target, attribute, value in [
+            (directory, 'get_directory', mock.Mock(return_value=fake_directory)),
+            (directory, '_stored_index', None),
+            (sync.players, 'get_players', mock.Mock(return_value=[])),
+        ]:
+            patcher = mock.patch.object(target, attribute, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def search(self, q, **params):
+        return self.client.get('/api/players/search/', {'q': q, **params})
+
+    def names(self, q):
+        return [record['DISPLAY_FIRST_LAST'] for record in self.search(q).json()]
+
+    def test_searches_the_directory_until_players_are_synced(self):
+        self.assertEqual(self.names('james'), ['James Harden', 'LeBron James'])
+
+    def test_searches_the_synced_players_and_is_rebuilt_by_each_sync(self):
+        sync.sync_players(current_players_df(NAMES[:4]), {})
+        self.assertEqual(self.names('kevin'), ['Kevin Durant'])
+
+        # Kevin Durant leaves the current player list, Kevin Love joins
+        sync.sync_players(current_players_df(NAMES[:3] + NAMES[5:6]), {})
+        self.assertEqual(self.names('kevin'), ['Kevin Love'])
+
+    def test_results_match_the_player_list(self):
+        sync.sync_players(current_players_df(NAMES), {})
+        all_players = self.client.get('/api/players/').json()
+        self.assertEqual(self.search('jokic').json(), [p for p in all_players if p['DISPLAY_FIRST_LAST'] == 'Nikola Jokić'])
+
+    def test_invalid_limit_is_rejected(self):
+        response = self.search('james', limit=0)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('limit', response.json()['error'])
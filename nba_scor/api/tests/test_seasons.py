@@ -0,0 +1,112 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from api import seasons, upstream
+from api.seasons import InvalidSeason
+
+SEASON_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'seasons-tests-default'},
+    'seasons': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'seasons-tests-seasons'},
+}
+
+
+CURRENT_SEASON = '2025-26'
+
+
+def next_season():
+    return seasons.format_season(int(seasons.get_current_season()[:4]) + 1)
+
+
+class SeasonEndpoint:
+    # Stands in for a season-scoped nba_api endpoint
+    calls = 0
+
+    def __init__(self, season, get_request=True):
+        SeasonEndpoint.calls += 1
+        self.season = season
+
+
+class ParseSeasonTests(SimpleTestCase):
+    def test_valid_seasons(self):
+        for value in ['1946-47', '1999-00', '2023-24', seasons.get_current_season()]:
+            with self.subTest(value=value):
+                self.assertEqual(seasons.parse_season(value), value)
+
+    def test_malformed_seasons_are_rejected(self):
+        for value in ['2023', '2023-25', '23-24', '2023-2024', '2023/24', 'abcd-ef', ' 2023-24']:
+            with self.subTest(value=value):
+                with self.assertRaises(InvalidSeason):
+                    seasons.parse_season(value)
+
+    def test_seasons_out_of_range_are_rejected(self):
+        for value in ['1945-46', next_season()]:
+            with self.subTest(value=value):
+                with self.assertRaises(InvalidSeason):
+                    seasons.parse_season(value)
+
+    def test_season_type(self):
+        self.assertEqual(seasons.parse_season_type('Playoffs'), 'Playoffs')
+        with self.assertRaises(InvalidSeason):
+            seasons.parse_season_type('playoffs')
+
+
+class SeasonParamsViewTests(SimpleTestCase):
+    def test_invalid_season_params_get_400(self):
+        for params in [{'season': '2023-2024'}, {'season': next_season()}, {'season': '1900-01'}, {'season_type': 'Finals'}]:
+            for path in ['/api/standings/', '/api/leaders/points/', '/api/teams/1610612738/stats/']:
+                with self.subTest(path=path, params=params):
+                    response = self.client.get(path, params)
+                    self.assertEqual(response.status_code, 400)
+                    self.assertIn('season', response.json()['error'])
+
+
+@override_settings(CACHES=SEASON_CACHES, UPSTREAM_COMPLETED_SEASON_CACHE_ALIAS='seasons', UPSTREAM_CACHE_TTLS={'SeasonEndpoint': 60})
+class SeasonCachePolicyTests(SimpleTestCase):
+    def setUp(self):
+        for alias in SEASON_CACHES:
+            caches[alias].clear()
+        SeasonEndpoint.calls = 0
+        self.now = 1000.0
+        for target, attribute, value in [
+            # Patching time.time moves date.today() too, so the current season is pinned
+            (upstream.time, 'time', lambda: self.now),
+            (seasons, 'get_current_season', lambda: CURRENT_SEASON),
+            (upstream, '_schedule_refresh', mock.Mock()),
+        ]:
+            patcher = mock.patch.object(target, attribute, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def stored(self, alias, season):
+        return caches[alias].get(upstream.cache_key(SeasonEndpoint, {'season': season}))
+
+    def test_completed_season_has_no_ttl(self):
+        self.assertIsNone(upstream.get_ttl(SeasonEndpoint, {'season': '2019-20'}))
+        self.assertEqual(upstream.get_ttl(SeasonEndpoint, {'season': CURRENT_SEASON}), 60)
+        # Requests that aren't season-scoped keep their TTL
+        self.assertEqual(upstream.get_ttl(SeasonEndpoint, {'game_id': '0022400001'}), 60)
+
+    def test_completed_season_goes_to_the_long_lived_alias(self):
+        upstream.fetch(SeasonEndpoint, season='2019-20')
+        self.assertIsNotNone(self.stored('seasons', '2019-20'))
+        self.assertIsNone(self.stored('default', '2019-20'))
+
+    def test_current_season_stays_in_the_default_alias(self):
+        upstream.fetch(SeasonEndpoint, season=CURRENT_SEASON)
+        self.assertIsNotNone(self.stored('default', CURRENT_SEASON))
+        self.assertIsNone(self.stored('seasons', CURRENT_SEASON))
+
+    def test_completed_season_never_goes_stale(self):
+        upstream.fetch(SeasonEndpoint, season='2019-20')
+        self.now += 365 * 24 * 3600
+        upstream.fetch(SeasonEndpoint, season='2019-20')
+        self.assertEqual(SeasonEndpoint.calls, 1)
+        upstream._schedule_refresh.assert_not_called()
+
+    def test_current_season_is_refreshed(self):
+        upstream.fetch(SeasonEndpoint, season=CURRENT_SEASON)
+        self.now += 60 * upstream.STALE_MULTIPLIER
+        upstream.fetch(SeasonEndpoint, season=CURRENT_SEASON)
+        self.assertEqual(SeasonEndpoint.calls, 2)
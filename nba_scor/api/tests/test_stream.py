@@ -0,0 +1,28 @@
+import asyncio
+import io
+import json
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from api import views
+
+
+def asgi_request(path):
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'', 'headers': []}
+    return ASGIRequest(scope, io.BytesIO())
+
+
+class LiveStreamTests(SimpleTestCase):
+    def test_wsgi_request_is_told_to_poll(self):
+        response = asyncio.run(views.live_stream(RequestFactory().get('/api/live/stream/')))
+        self.assertEqual(response.status_code, 501)
+        self.assertIn('/api/live/', json.loads(response.content)['error'])
+
+    def test_asgi_request_streams(self):
+        response = asyncio.run(views.live_stream(asgi_request('/api/live/stream/')))
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertTrue(response.is_async)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from django.test import TransactionTestCase
+from nba_api.stats.static import teams
+
+from api import directory, sync
+from api.models import Player
+
+CELTICS_ID = 1610612738
+LAKERS_ID = 1610612747
+
+
+def current_players_df():
+    # A slice of CommonAllPlayers (is_only_current_season=1)
+    return pd.DataFrame({
+        'PERSON_ID': [1628369, 2544],
+        'DISPLAY_LAST_COMMA_FIRST': ['Tatum, Jayson', 'James, LeBron'],
+        'DISPLAY_FIRST_LAST': ['Jayson Tatum', 'LeBron James'],
+        'ROSTERSTATUS': [1, 1],
+        'FROM_YEAR': ['2017', '2003'],
+        'TO_YEAR': ['2025', '2025'],
+        'PLAYERCODE': ['jayson_tatum', 'lebron_james'],
+        'TEAM_ID': [CELTICS_ID, LAKERS_ID],
+        'TEAM_CITY': ['Boston', 'Los Angeles'],
+        'TEAM_NAME': ['Celtics', 'Lakers'],
+        'TEAM_ABBREVIATION': ['BOS', 'LAL'],
+        'GAMES_PLAYED_FLAG': ['Y', 'Y'],
+        'OTHERLEAGUE_EXPERIENCE_CH': ['00', np.nan],
+    })
+
+
+class ListEndpointSchemaTests(TransactionTestCase):
+    # The list views run in async worker threads, on their own database connections
+    def setUp(self):
+        self.df = current_players_df()
+        self.fallback_players = self.df.astype(object).where(self.df.notna(), None).to_dict(orient='records')
+        fake_directory = SimpleNamespace(current_players=self.fallback_players)
+        patcher = mock.patch.object(directory, 'get_directory', return_value=fake_directory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_teams_keep_the_static_schema_after_sync(self):
+        before = self.client.get('/api/teams/').json()
+        self.assertEqual(before, teams.get_teams())
+
+        sync.sync_teams()
+        after = self.client.get('/api/teams/').json()
+        self.assertEqual(sorted(after, key=lambda team: team['id']), sorted(before, key=lambda team: team['id']))
+
+    def test_players_keep_the_common_all_players_schema_after_sync(self):
+        before = self.client.get('/api/players/').json()
+        self.assertEqual(before, self.fallback_players)
+
+        sync.sync_players(self.df, sync.sync_teams())
+        after = self.client.get('/api/players/').json()
+        self.assertEqual(sorted(after, key=lambda player: player['PERSON_ID']), sorted(before, key=lambda player: player['PERSON_ID']))
+        self.assertIsNone(after[0]['OTHERLEAGUE_EXPERIENCE_CH'])
+
+    def test_players_synced_without_rows_fall_back_to_the_directory(self):
+        sync.sync_players(self.df, sync.sync_teams())
+        Player.objects.filter(nba_id=2544).update(data={})
+        self.assertEqual(self.client.get('/api/players/').json(), self.fallback_players)
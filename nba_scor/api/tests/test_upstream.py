@@ -0,0 +1,291 @@
+import asyncio
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from api import upstream
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'upstream-tests'}}
+
+
+class FakeEndpoint:
+    # Stands in for an nba_api endpoint class; counts the "requests" it makes
+    calls = 0
+    calls_lock = threading.Lock()
+
+    def __init__(self, team_id, get_request=True):
+        with FakeEndpoint.calls_lock:
+            FakeEndpoint.calls += 1
+        self.team_id = team_id
+
+
+class SlowEndpoint(FakeEndpoint):
+    # Holds its request open until the test releases it
+    started = None
+    release = None
+    error = None
+
+    def __init__(self, team_id, get_request=True):
+        super().__init__(team_id, get_request)
+        if get_request:
+            SlowEndpoint.started.set()
+            SlowEndpoint.release.wait(5)
+            if SlowEndpoint.error is not None:
+                raise SlowEndpoint.error
+
+
+@override_settings(CACHES=LOCMEM_CACHES, UPSTREAM_CACHE_TTLS={'FakeEndpoint': 60})
+class UpstreamTestCase(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+        upstream._derived.clear()
+        FakeEndpoint.calls = 0
+        self.now = 1000.0
+        patcher = mock.patch.object(upstream.time, 'time', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class DeriveTests(UpstreamTestCase):
+    def test_builds_once_per_fetched_entry(self):
+        build = mock.Mock(side_effect=lambda endpoint: {'team_id': endpoint.team_id})
+
+        first = upstream.derive(FakeEndpoint, build, team_id=1)
+        second = upstream.derive(FakeEndpoint, build, team_id=1)
+
+        self.assertIs(first, second)
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(FakeEndpoint.calls, 1)
+
+    def test_rebuilds_after_the_entry_is_refreshed(self):
+        build = mock.Mock(side_effect=lambda endpoint: object())
+        first = upstream.derive(FakeEndpoint, build, team_id=1)
+
+        # Past the stale window the entry is refreshed inline, and the value rebuilt from it
+        self.now += 60 * upstream.STALE_MULTIPLIER
+        second = upstream.derive(FakeEndpoint, build, team_id=1)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(build.call_count, 2)
+        self.assertEqual(FakeEndpoint.calls, 2)
+
+    def test_builds_are_kept_per_params(self):
+        build = mock.Mock(side_effect=lambda endpoint: endpoint.team_id)
+        self.assertEqual(upstream.derive(FakeEndpoint, build, team_id=1), 1)
+        self.assertEqual(upstream.derive(FakeEndpoint, build, team_id=2), 2)
+        self.assertEqual(build.call_count, 2)
+
+
+class SingleFlightTests(UpstreamTestCase):
+    CALLERS = 8
+
+    def setUp(self):
+        super().setUp()
+        SlowEndpoint.started = threading.Event()
+        SlowEndpoint.release = threading.Event()
+        SlowEndpoint.error = None
+
+    def count_refreshes(self, name):
+        # Callers that missed the cache and reached the single-flight refresh
+        entered = []
+        original = getattr(upstream, name)
+
+        def counted(*args, **kwargs):
+            entered.append(args[0])
+            return original(*args, **kwargs)
+
+        patcher = mock.patch.object(upstream, name, counted)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return entered
+
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.005)
+
+    def fetch_concurrently(self):
+        entered = self.count_refreshes('_refresh')
+        results = [None] * self.CALLERS
+
+        def call(index):
+            try:
+                results[index] = upstream.fetch(SlowEndpoint, team_id=1)
+            except Exception as e:
+                results[index] = e
+
+        threads = [threading.Thread(target=call, args=(index,)) for index in range(self.CALLERS)]
+        for thread in threads:
+            thread.start()
+        # Release the upstream call only once every caller is inside the refresh
+        self.wait_for(lambda: len(entered) == self.CALLERS)
+        SlowEndpoint.release.set()
+        for thread in threads:
+            thread.join(5)
+        return results
+
+    def test_concurrent_callers_share_one_upstream_call(self):
+        results = self.fetch_concurrently()
+
+        self.assertEqual(SlowEndpoint.calls, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(upstream._inflight, {})
+
+    def test_concurrent_callers_share_the_error(self):
+        SlowEndpoint.error = ConnectionError('upstream down')
+        results = self.fetch_concurrently()
+
+        self.assertEqual(SlowEndpoint.calls, 1)
+        self.assertTrue(all(result is SlowEndpoint.error for result in results))
+        self.assertEqual(upstream._inflight, {})
+
+    def test_concurrent_coroutines_share_one_upstream_call(self):
+        entered = self.count_refreshes('_arefresh')
+        release = asyncio.Event()
+        loads = []
+
+        async def load(endpoint):
+            loads.append(endpoint)
+            await release.wait()
+            return endpoint
+
+        async def main():
+            tasks = [asyncio.ensure_future(upstream.afetch(SlowEndpoint, team_id=1)) for _ in range(self.CALLERS)]
+            while len(entered) < self.CALLERS:
+                await asyncio.sleep(0.005)
+            # Let the last one reach the shared future
+            await asyncio.sleep(0)
+            release.set()
+            return await asyncio.gather(*tasks)
+
+        with mock.patch.object(upstream.async_client, 'load', load):
+            results = asyncio.run(asyncio.wait_for(main(), 5))
+
+        self.assertEqual(len(loads), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(upstream._inflight, {})
+
+    def test_coroutines_on_separate_event_loops_share_one_upstream_call(self):
+        # Async views under WSGI: every request runs its own event loop in its own thread
+        entered = self.count_refreshes('_arefresh')
+        release = threading.Event()
+        loads = []
+
+        async def load(endpoint):
+            loads.append(endpoint)
+            while not release.is_set():
+                await asyncio.sleep(0.005)
+            return endpoint
+
+        results = [None] * self.CALLERS
+
+        def call(index):
+            results[index] = asyncio.run(upstream.afetch(SlowEndpoint, team_id=1))
+
+        with mock.patch.object(upstream.async_client, 'load', load):
+            threads = [threading.Thread(target=call, args=(index,)) for index in range(self.CALLERS)]
+            for thread in threads:
+                thread.start()
+            self.wait_for(lambda: len(entered) == self.CALLERS)
+            release.set()
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(len(loads), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(upstream._inflight, {})
+
+    def test_threads_wait_on_a_coroutine_fetch(self):
+        entered = self.count_refreshes('_refresh')
+        release = threading.Event()
+        loads = []
+
+        async def load(endpoint):
+            loads.append(endpoint)
+            while not release.is_set():
+                await asyncio.sleep(0.005)
+            return endpoint
+
+        results = []
+        with mock.patch.object(upstream.async_client, 'load', load):
+            leader = threading.Thread(target=lambda: results.append(asyncio.run(upstream.afetch(SlowEndpoint, team_id=1))))
+            leader.start()
+            self.wait_for(lambda: len(loads) == 1)
+            waiter = threading.Thread(target=lambda: results.append(upstream.fetch(SlowEndpoint, team_id=1)))
+            waiter.start()
+            self.wait_for(lambda: len(entered) == 1)
+            release.set()
+            leader.join(5)
+            waiter.join(5)
+
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(len(results), 2)
+        self.assertIs(results[0], results[1])
+
+    def test_cancelled_leader_is_taken_over_by_a_waiter(self):
+        loads = []
+
+        async def load(endpoint):
+            loads.append(endpoint)
+            if len(loads) == 1:
+                await asyncio.Event().wait()
+            return endpoint
+
+        async def main():
+            leader = asyncio.ensure_future(upstream.afetch(SlowEndpoint, team_id=1))
+            while not loads:
+                await asyncio.sleep(0.005)
+            waiter = asyncio.ensure_future(upstream.afetch(SlowEndpoint, team_id=1))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await waiter
+
+        with mock.patch.object(upstream.async_client, 'load', load):
+            result = asyncio.run(asyncio.wait_for(main(), 5))
+
+        self.assertEqual(result.team_id, 1)
+        self.assertEqual(len(loads), 2)
+        self.assertEqual(upstream._inflight, {})
+
+
+@override_settings(UPSTREAM_CROSS_PROCESS_LOCK=True)
+class CrossProcessLockTests(UpstreamTestCase):
+    def refresh(self):
+        # The path of a caller that just missed the cache
+        key = upstream.cache_key(FakeEndpoint, {'team_id': 1})
+        return upstream._refresh(key, FakeEndpoint, {'team_id': 1}, 60), key
+
+    def store_from_another_process(self, fetched_at):
+        key = upstream.cache_key(FakeEndpoint, {'team_id': 1})
+        entry = {'fetched_at': fetched_at, 'endpoint': FakeEndpoint(team_id=1)}
+        caches['default'].set(key, entry)
+        FakeEndpoint.calls = 0
+        return entry
+
+    def test_entry_stored_before_the_lock_is_taken_is_not_fetched_again(self):
+        # Another process filled the key and released the lock after this one missed
+        stored = self.store_from_another_process(fetched_at=self.now - 1)
+
+        entry, key = self.refresh()
+
+        self.assertEqual(entry['fetched_at'], stored['fetched_at'])
+        self.assertEqual(FakeEndpoint.calls, 0)
+        self.assertIsNone(caches['default'].get(f'{key}:lock'))
+
+    def test_stale_entry_is_fetched_under_the_lock(self):
+        self.store_from_another_process(fetched_at=self.now - 60)
+
+        entry, key = self.refresh()
+
+        self.assertEqual(entry['fetched_at'], self.now)
+        self.assertEqual(FakeEndpoint.calls, 1)
+        self.assertIsNone(caches['default'].get(f'{key}:lock'))
+
+    def test_cold_key_is_fetched_once(self):
+        upstream.fetch(FakeEndpoint, team_id=1)
+        upstream.fetch(FakeEndpoint, team_id=1)
+        self.assertEqual(FakeEndpoint.calls, 1)
@@ -0,0 +1,208 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from api import async_client, upstream_http
+from api.upstream_http import CircuitBreaker, UpstreamUnavailable
+
+URL = 'https://stats.example.test/stats/endpoint'
+
+UPSTREAM_HTTP = {
+    'connect_timeout': 3.05,
+    'read_timeout': 10,
+    'retries': 2,
+    'backoff': 0,
+    'backoff_max': 0,
+    'pool_maxsize': 4,
+    'breaker_threshold': 3,
+    'breaker_reset': 30,
+}
+
+
+def ok_response():
+    response = requests.Response()
+    response.status_code = 200
+    return response
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(upstream_http.time, 'monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker('stats.example.test', threshold=2, reset_after=30)
+
+    def open_breaker(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+    def test_opens_after_threshold_failures(self):
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, 'closed')
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, 'open')
+        with self.assertRaises(UpstreamUnavailable):
+            self.breaker.check()
+
+    def test_success_resets_failure_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, 'closed')
+
+    def test_half_open_allows_one_trial(self):
+        self.open_breaker()
+        self.now += 30
+        self.assertEqual(self.breaker.state, 'half-open')
+        self.assertIs(self.breaker.check(), True)
+        self.assertFalse(self.breaker.allow())
+
+    def test_trial_success_closes(self):
+        self.open_breaker()
+        self.now += 30
+        self.breaker.check()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, 'closed')
+        self.assertIs(self.breaker.check(), False)
+
+    def test_trial_failure_reopens(self):
+        self.open_breaker()
+        self.now += 30
+        self.breaker.check()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, 'open')
+        self.now += 30
+        self.assertTrue(self.breaker.allow())
+
+    def test_release_only_frees_the_trial(self):
+        self.open_breaker()
+        self.now += 30
+        trial = self.breaker.check()
+        self.breaker.release(False)
+        self.assertFalse(self.breaker.allow())
+        self.breaker.release(trial)
+        self.assertTrue(self.breaker.allow())
+
+
+@override_settings(UPSTREAM_HTTP=UPSTREAM_HTTP)
+class ResilientSessionTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        for target, attribute, value in [
+            (upstream_http.time, 'monotonic', lambda: self.now),
+            (upstream_http.time, 'sleep', lambda seconds: None),
+            (upstream_http, '_breakers', {}),
+        ]:
+            patcher = mock.patch.object(target, attribute, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.session = upstream_http.ResilientSession()
+
+    def send(self, *outcomes, **kwargs):
+        # requests.Session.request returns or raises each outcome in turn
+        def request(session, method, url, *args, **kwargs):
+            outcome = outcomes[calls.call_count - 1]
+            if isinstance(outcome, BaseException):
+                raise outcome
+            return outcome
+
+        with mock.patch.object(requests.Session, 'request', autospec=True, side_effect=request) as calls:
+            try:
+                return self.session.request('GET', URL, **kwargs)
+            finally:
+                self.calls = calls
+
+    def open_breaker(self):
+        with self.assertRaises(requests.ConnectionError):
+            self.send(*[requests.ConnectionError()] * 3)
+        self.assertEqual(upstream_http.get_breaker(URL).state, 'open')
+
+    def test_retries_connection_errors(self):
+        response = self.send(requests.ConnectionError(), ok_response())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.calls.call_count, 2)
+
+    def test_open_breaker_fails_fast(self):
+        self.open_breaker()
+        with self.assertRaises(UpstreamUnavailable):
+            self.send(ok_response())
+        self.assertEqual(self.calls.call_count, 0)
+
+    def test_trial_failing_with_other_exception_reopens_for_one_window(self):
+        self.open_breaker()
+        self.now += 30
+        with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+            self.send(requests.exceptions.ChunkedEncodingError())
+        with self.assertRaises(UpstreamUnavailable):
+            self.send(ok_response())
+
+        # The breaker isn't stuck: after the next window a trial goes out again
+        self.now += 30
+        self.assertEqual(self.send(ok_response()).status_code, 200)
+        self.assertEqual(upstream_http.get_breaker(URL).state, 'closed')
+
+    def test_cancelled_trial_lets_the_next_request_probe(self):
+        self.open_breaker()
+        self.now += 30
+        with self.assertRaises(KeyboardInterrupt):
+            self.send(KeyboardInterrupt())
+        self.assertEqual(self.send(ok_response()).status_code, 200)
+
+    def test_default_timeouts(self):
+        self.send(ok_response())
+        self.assertEqual(self.calls.call_args.kwargs['timeout'], (3.05, 10))
+
+    def test_shorter_caller_timeout_is_kept(self):
+        self.send(ok_response(), timeout=5)
+        self.assertEqual(self.calls.call_args.kwargs['timeout'], (3.05, 5))
+
+    def test_longer_caller_timeout_is_capped(self):
+        # nba_api's default
+        self.send(ok_response(), timeout=30)
+        self.assertEqual(self.calls.call_args.kwargs['timeout'], (3.05, 10))
+
+
+@unittest.skipIf(async_client.httpx is None, 'httpx is not installed')
+@override_settings(UPSTREAM_HTTP=UPSTREAM_HTTP)
+class AsyncClientBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        for target, attribute, value in [
+            (upstream_http.time, 'monotonic', lambda: self.now),
+            (upstream_http, '_breakers', {}),
+        ]:
+            patcher = mock.patch.object(target, attribute, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def half_open_breaker(self):
+        breaker = upstream_http.get_breaker(URL)
+        for _ in range(UPSTREAM_HTTP['breaker_threshold']):
+            breaker.record_failure()
+        self.now += UPSTREAM_HTTP['breaker_reset']
+        self.assertEqual(breaker.state, 'half-open')
+        return breaker
+
+    def get(self, error):
+        client = mock.Mock()
+        client.get = mock.AsyncMock(side_effect=error)
+        with mock.patch.object(async_client, 'get_client', return_value=client):
+            return asyncio.run(async_client.get(URL, [], {}))
+
+    def test_cancelled_trial_lets_the_next_request_probe(self):
+        breaker = self.half_open_breaker()
+        with self.assertRaises(asyncio.CancelledError):
+            self.get(asyncio.CancelledError())
+        self.assertTrue(breaker.allow())
+
+    def test_trial_failing_with_other_exception_reopens(self):
+        breaker = self.half_open_breaker()
+        with self.assertRaises(ValueError):
+            self.get(ValueError('bad response'))
+        self.assertEqual(breaker.state, 'open')
+        self.now += 30
+        self.assertTrue(breaker.allow())
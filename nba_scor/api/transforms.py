@@ -0,0 +1,110 @@
+"""
+Declarative DataFrame -> JSON record mapping.
+
+A view describes its output as a list of Column(source, key, cast, default)
+and calls to_records(df, columns). Each column is converted as a whole
+(fill, cast, tolist) and the rows are zipped together at the end, instead of
+building a dict per row with iterrows.
+
+to_columns(df, columns) is the columnar form of the same mapping: a schema
+header plus one array per column, for ``?format=columnar`` responses.
+"""
+import datetime
+
+import numpy as np
+
+# JSON types of the schema header, by NumPy dtype kind
+DTYPE_KINDS = {'b': 'boolean', 'i': 'integer', 'u': 'integer', 'f': 'number', 'M': 'datetime'}
+# Checked in order, since bool is an int
+PYTHON_TYPES = [
+    (bool, 'boolean'), (int, 'integer'), (float, 'number'), (str, 'string'), (datetime.date, 'datetime'),
+]
+
+
+def plain_values(series):
+    # The values as a list, with None for nulls
+    if not series.hasnans:
+        return series.tolist()
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def plain_array(series):
+    # Numeric columns stay NumPy arrays, which the encoder writes directly
+    if series.dtype.kind in 'biuf':
+        return series.to_numpy()
+    return plain_values(series)
+
+
+class Column:
+    def __init__(self, source, key=None, cast=None, default=None):
+        self.source = source
+        self.key = key or source
+        self.cast = cast
+        self.default = default
+
+    def values(self, df):
+        # A missing source column becomes the default for every row
+        if self.source not in df:
+            return [self.default] * len(df)
+
+        series = df[self.source]
+        if self.default is not None:
+            series = series.fillna(self.default)
+        if self.cast is None:
+            return plain_values(series)
+
+        present = series.notna()
+        if present.all():
+            return series.astype(self.cast).tolist()
+
+        # Nulls without a default are emitted as None
+        values = series.astype(object)
+        values[present] = series[present].astype(self.cast)
+        return values.where(present, None).tolist()
+
+    def array(self, df):
+        # For to_columns: columns taken as they are go through plain_array
+        if self.cast is None and self.default is None and self.source in df:
+            return plain_array(df[self.source])
+        return self.values(df)
+
+
+def to_records(df, columns):
+    keys = [column.key for column in columns]
+    return [dict(zip(keys, row)) for row in zip(*(column.values(df) for column in columns))]
+
+
+def value_type(values):
+    if isinstance(values, np.ndarray):
+        return DTYPE_KINDS.get(values.dtype.kind, 'string')
+    sample = next((value for value in values if value is not None), None)
+    for cls, name in PYTHON_TYPES:
+        if isinstance(sample, cls):
+            return name
+    return 'null' if sample is None else 'json'
+
+
+def columnar(arrays, length):
+    """
+    The columnar body for ``{key: values}``: a schema header and the arrays in the same order.
+    """
+    return {
+        'format': 'columnar',
+        'schema': [{'name': key, 'type': value_type(values)} for key, values in arrays.items()],
+        'length': length,
+        'columns': list(arrays.values()),
+    }
+
+
+def to_columns(df, columns):
+    return columnar({column.key: column.array(df) for column in columns}, len(df))
+
+
+def frame_columns(df):
+    # Every column of df, as it is
+    return columnar({name: plain_array(series) for name, series in df.items()}, len(df))
+
+
+def with_rank(df, column='rank'):
+    # Positional 1-based rank, for frames that are already sorted
+    return df.assign(**{column: range(1, len(df) + 1)})
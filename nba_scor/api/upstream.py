@@ -0,0 +1,414 @@
+"""
+Cached access to nba_api endpoints.
+
+Every view goes through ``fetch`` instead of instantiating an nba_api endpoint
+class directly. Responses are stored in Django's cache keyed by endpoint class
+plus parameters, with a freshness TTL per endpoint (see UPSTREAM_CACHE_TTLS in
+settings). Once an entry goes stale it is still served while a background
+thread re-fetches it, so only a completely cold key waits on upstream. Past
+the stale window an entry is refreshed inline, but it is still returned if
+that refresh fails, so an upstream outage serves the last cached value.
+
+Fetches are single-flight: concurrent callers missing the same key wait on
+one in-flight upstream call and share its result, whether they are threads or
+coroutines, on any event loop. With
+UPSTREAM_CROSS_PROCESS_LOCK a lock in the cache extends this across worker
+processes.
+
+Responses for a completed season (see seasons.py) can't change anymore: they
+have no TTL, never go stale and are stored without expiry in the
+UPSTREAM_COMPLETED_SEASON_CACHE_ALIAS cache, which can be a persistent backend.
+
+``derive`` memoizes in-process structures built from a cached endpoint (rank
+tables, indexes) and rebuilds them only when that endpoint is refreshed.
+
+Async views use ``afetch_many`` (see async_client.py for the HTTP side) and
+then run their sync counterpart under ``prefetched``, which makes ``fetch``
+and ``derive`` return the already loaded endpoints, or raise the error the
+prefetch ran into.
+"""
+import asyncio
+import contextvars
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+from . import async_client, metrics, profiling, seasons
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 60
+
+# Stale entries are served for this many TTLs while they refresh in the background
+STALE_MULTIPLIER = 12
+
+# After that they are kept this much longer as the last known value, served
+# only when refreshing fails (upstream down, circuit breaker open)
+LAST_GOOD_RETENTION = 24 * 3600
+
+# Request options that don't change the response, so they stay out of the cache key
+NON_KEY_PARAMS = ('timeout', 'proxy', 'headers')
+
+# Cross-process fetch lock: how long it is held at most, and how often waiters
+# check the cache for the holder's result
+LOCK_TIMEOUT = 30
+LOCK_POLL_INTERVAL = 0.1
+
+_refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='upstream-refresh')
+_fetch_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='upstream-fetch')
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+# cache key -> Future of the fetch currently running for it, from a thread or a coroutine
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+# (cache key, build function) -> (fetched_at, derived value)
+_derived = {}
+_derived_lock = threading.Lock()
+
+# cache key -> entry, loaded by afetch_many for the current request (see prefetched)
+_prefetched = contextvars.ContextVar('upstream_prefetched', default=None)
+
+
+def get_cache(ttl=DEFAULT_TTL):
+    alias = getattr(settings, 'UPSTREAM_CACHE_ALIAS', 'default')
+    if ttl is None:
+        alias = getattr(settings, 'UPSTREAM_COMPLETED_SEASON_CACHE_ALIAS', alias)
+    return caches[alias]
+
+
+def get_ttl(endpoint_cls, params=None):
+    # None: the request is for a completed season and never goes stale
+    season = seasons.season_of(params) if params else None
+    if season is not None and seasons.is_completed(season):
+        return None
+    ttls = getattr(settings, 'UPSTREAM_CACHE_TTLS', {})
+    return ttls.get(endpoint_cls.__name__, DEFAULT_TTL)
+
+
+def entry_timeout(ttl):
+    return None if ttl is None else ttl * STALE_MULTIPLIER + LAST_GOOD_RETENTION
+
+
+def is_stale(fetched_at, ttl, multiplier=1):
+    return ttl is not None and time.time() - fetched_at >= ttl * multiplier
+
+
+def cache_key(endpoint_cls, params):
+    raw = '&'.join(f'{name}={params[name]}' for name in sorted(params) if name not in NON_KEY_PARAMS)
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f'upstream:{endpoint_cls.__module__}.{endpoint_cls.__name__}:{digest}'
+
+
+def fetch(endpoint_cls, **params):
+    """
+    Return a loaded ``endpoint_cls(**params)`` instance, from cache when possible.
+    """
+    return _get_entry(endpoint_cls, params)['endpoint']
+
+
+def fetch_many(*calls):
+    """
+    Fetch several ``(endpoint_cls, params)`` pairs concurrently, in order.
+    """
+    futures = [submit(fetch, endpoint_cls, **params) for endpoint_cls, params in calls]
+    return [future.result() for future in futures]
+
+
+def submit(func, *args, **kwargs):
+    """
+    Run an upstream-bound call (``fetch``, ``derive`` or a wrapper) on the fetch pool.
+    """
+    # Run in a copy of the caller's context so prefetched entries stay visible
+    return _fetch_pool.submit(contextvars.copy_context().run, func, *args, **kwargs)
+
+
+def derive(endpoint_cls, build, **params):
+    """
+    Return ``build(endpoint)`` for the cached endpoint, rebuilt only after it refreshes.
+    """
+    key = (cache_key(endpoint_cls, params), build)
+    with _derived_lock:
+        derived = _derived.get(key)
+
+    # While the source entry is still fresh the cache isn't consulted at all
+    if derived is not None and not is_stale(derived[0], get_ttl(endpoint_cls, params)):
+        # A prefetched entry was already counted when afetch_many looked it up
+        entries = _prefetched.get()
+        if not (entries and key[0] in entries):
+            metrics.cache_lookup(endpoint_cls, 'hit')
+        return derived[1]
+
+    entry = _get_entry(endpoint_cls, params)
+    if derived is not None and derived[0] == entry['fetched_at']:
+        return derived[1]
+
+    # Concurrent rebuilds of the same entry are harmless, the last one wins
+    value = build(entry['endpoint'])
+    with _derived_lock:
+        _derived[key] = (entry['fetched_at'], value)
+    return value
+
+
+def etag(endpoint_cls, **params):
+    """
+    Strong ETag for the cached response to these params, or None when nothing is cached.
+
+    Only reads the small version key stored next to the entry, so a view can
+    answer If-None-Match without loading the endpoint or serializing anything.
+    """
+    key = cache_key(endpoint_cls, params)
+    ttl = get_ttl(endpoint_cls, params)
+    fetched_at = get_cache(ttl).get(f'{key}:version')
+    if fetched_at is None:
+        return None
+
+    # Requests answered with 304 never reach fetch, so schedule the refresh here
+    if is_stale(fetched_at, ttl):
+        _schedule_refresh(key, endpoint_cls, params, ttl)
+
+    return '"%s"' % hashlib.md5(f'{key}:{fetched_at!r}'.encode('utf-8')).hexdigest()
+
+
+async def afetch(endpoint_cls, **params):
+    """
+    Async ``fetch``: a cold key is loaded with the async client instead of a blocking request.
+    """
+    return (await _aget_entry(endpoint_cls, params))['endpoint']
+
+
+async def afetch_many(*calls, return_exceptions=False):
+    """
+    Fetch several ``(endpoint_cls, params)`` pairs concurrently, returning the cache entries by key.
+
+    With ``return_exceptions`` a failed fetch gives its exception in place of the
+    entry; under ``prefetched``, ``fetch`` then raises it instead of fetching again.
+    """
+    entries = await asyncio.gather(
+        *(_aget_entry(endpoint_cls, params) for endpoint_cls, params in calls),
+        return_exceptions=return_exceptions,
+    )
+    return {cache_key(endpoint_cls, params): entry for (endpoint_cls, params), entry in zip(calls, entries)}
+
+
+class prefetched:
+    """
+    Context in which ``fetch`` and ``derive`` use entries returned by ``afetch_many``.
+
+    The context variable is copied into threads started through asgiref's
+    ``sync_to_async``, so sync view code run from an async view sees it.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    def __enter__(self):
+        current = _prefetched.get() or {}
+        self.token = _prefetched.set({**current, **self.entries})
+        return self
+
+    def __exit__(self, *exc_info):
+        _prefetched.reset(self.token)
+
+
+def _get_entry(endpoint_cls, params):
+    key = cache_key(endpoint_cls, params)
+    ttl = get_ttl(endpoint_cls, params)
+
+    entries = _prefetched.get()
+    if entries and key in entries:
+        entry = entries[key]
+        # The async prefetch already failed on this request; don't hit upstream twice
+        if isinstance(entry, BaseException):
+            raise entry
+        return entry
+
+    entry = get_cache(ttl).get(key)
+    if entry is None:
+        metrics.cache_lookup(endpoint_cls, 'miss')
+        return _refresh(key, endpoint_cls, params, ttl)
+
+    if is_stale(entry['fetched_at'], ttl, STALE_MULTIPLIER):
+        try:
+            refreshed = _refresh(key, endpoint_cls, params, ttl)
+        except Exception:
+            logger.warning('Refresh of %s failed, serving the last cached value', endpoint_cls.__name__, exc_info=True)
+            metrics.cache_lookup(endpoint_cls, 'stale')
+            return entry
+        metrics.cache_lookup(endpoint_cls, 'miss')
+        return refreshed
+
+    if is_stale(entry['fetched_at'], ttl):
+        metrics.cache_lookup(endpoint_cls, 'stale')
+        _schedule_refresh(key, endpoint_cls, params, ttl)
+    else:
+        metrics.cache_lookup(endpoint_cls, 'hit')
+
+    return entry
+
+
+def _join_inflight(key):
+    # (future, leader): the first caller fetches into a new future, the others wait on it
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is None:
+            future = _inflight[key] = Future()
+            return future, True
+        return future, False
+
+
+def _refresh(key, endpoint_cls, params, ttl):
+    # Single-flight: the first caller fetches, concurrent callers wait for its result
+    future, leader = _join_inflight(key)
+    while not leader:
+        try:
+            return future.result()
+        except CancelledError:
+            # An async fetch was cancelled with its request; take it over
+            future, leader = _join_inflight(key)
+
+    try:
+        if getattr(settings, 'UPSTREAM_CROSS_PROCESS_LOCK', False):
+            entry = _load_locked(key, endpoint_cls, params, ttl)
+        else:
+            entry = _load(key, endpoint_cls, params, ttl)
+        future.set_result(entry)
+        return entry
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
+
+async def _aget_entry(endpoint_cls, params):
+    key = cache_key(endpoint_cls, params)
+    ttl = get_ttl(endpoint_cls, params)
+
+    entry = await get_cache(ttl).aget(key)
+    if entry is None:
+        metrics.cache_lookup(endpoint_cls, 'miss')
+        return await _arefresh(key, endpoint_cls, params, ttl)
+
+    if is_stale(entry['fetched_at'], ttl, STALE_MULTIPLIER):
+        try:
+            refreshed = await _arefresh(key, endpoint_cls, params, ttl)
+        except Exception:
+            logger.warning('Refresh of %s failed, serving the last cached value', endpoint_cls.__name__, exc_info=True)
+            metrics.cache_lookup(endpoint_cls, 'stale')
+            return entry
+        metrics.cache_lookup(endpoint_cls, 'miss')
+        return refreshed
+
+    if is_stale(entry['fetched_at'], ttl):
+        metrics.cache_lookup(endpoint_cls, 'stale')
+        _schedule_refresh(key, endpoint_cls, params, ttl)
+    else:
+        metrics.cache_lookup(endpoint_cls, 'hit')
+
+    return entry
+
+
+async def _arefresh(key, endpoint_cls, params, ttl):
+    # The cross-process lock polls with sleeps, it keeps using the threaded path
+    if getattr(settings, 'UPSTREAM_CROSS_PROCESS_LOCK', False):
+        return await sync_to_async(_refresh, thread_sensitive=False)(key, endpoint_cls, params, ttl)
+
+    # Shares the threads' in-flight table: under WSGI every request runs its own
+    # event loop, so a per-loop table would never coalesce anything
+    future, leader = _join_inflight(key)
+    while not leader:
+        try:
+            # Shielded: a waiter going away mustn't cancel the shared fetch
+            return await asyncio.shield(asyncio.wrap_future(future))
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+            # The leader was cancelled with its request; take it over
+            future, leader = _join_inflight(key)
+
+    try:
+        with metrics.upstream_call(endpoint_cls), profiling.phase('upstream'):
+            endpoint = await async_client.load(endpoint_cls(**params, get_request=False))
+        entry = {'fetched_at': time.time(), 'endpoint': endpoint}
+        await get_cache(ttl).aset_many({key: entry, f'{key}:version': entry['fetched_at']}, timeout=entry_timeout(ttl))
+        future.set_result(entry)
+        return entry
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
+
+def _load(key, endpoint_cls, params, ttl):
+    with metrics.upstream_call(endpoint_cls), profiling.phase('upstream'):
+        endpoint = endpoint_cls(**params)
+    entry = {'fetched_at': time.time(), 'endpoint': endpoint}
+    get_cache(ttl).set_many({key: entry, f'{key}:version': entry['fetched_at']}, timeout=entry_timeout(ttl))
+    return entry
+
+
+def _load_locked(key, endpoint_cls, params, ttl):
+    cache = get_cache(ttl)
+    lock_key = f'{key}:lock'
+    started = time.time()
+    deadline = time.monotonic() + LOCK_TIMEOUT
+
+    def fresh_entry():
+        entry = cache.get(key)
+        if entry is not None and (entry['fetched_at'] >= started or not is_stale(entry['fetched_at'], ttl)):
+            return entry
+        return None
+
+    # cache.add is atomic on shared backends, so only one process holds the lock
+    while not cache.add(lock_key, started, timeout=LOCK_TIMEOUT):
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = fresh_entry()
+        if entry is not None:
+            return entry
+        if time.monotonic() >= deadline:
+            # The holder died or hung; fetch without the lock
+            logger.warning('Timed out waiting for the fetch lock on %s', endpoint_cls.__name__)
+            return _load(key, endpoint_cls, params, ttl)
+
+    try:
+        # Another process may have stored the entry between our miss and taking the lock
+        entry = fresh_entry()
+        if entry is not None:
+            return entry
+        return _load(key, endpoint_cls, params, ttl)
+    finally:
+        cache.delete(lock_key)
+
+
+def _schedule_refresh(key, endpoint_cls, params, ttl):
+    # Only one background refresh per key at a time
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def run():
+        try:
+            _refresh(key, endpoint_cls, params, ttl)
+        except Exception:
+            # Keep serving the stale entry, the next request will retry
+            logger.warning('Background refresh of %s failed', endpoint_cls.__name__, exc_info=True)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    _refresh_pool.submit(run)
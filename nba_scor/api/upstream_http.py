@@ -0,0 +1,202 @@
+"""
+Shared, resilient HTTP for nba_api.
+
+``install()`` (run from ApiConfig.ready) points nba_api's HTTP classes at
+one ResilientSession, so every endpoint request shares:
+
+- a keep-alive connection pool per host
+- connect/read timeouts from UPSTREAM_HTTP instead of nba_api's flat 30 s,
+  or the caller's own timeout where it is shorter
+- retries for GETs on connection errors, timeouts, 429 and 5xx, with
+  jittered exponential backoff
+- a circuit breaker per host: after ``breaker_threshold`` consecutive
+  failures, requests fail immediately with UpstreamUnavailable for
+  ``breaker_reset`` seconds, then a single trial request decides whether it
+  closes again
+
+async_client.py applies the same timeouts, retries and breakers to the
+requests it sends through httpx.
+"""
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from nba_api.library.http import NBAHTTP
+from nba_api.live.nba.library.http import NBALiveHTTP
+from nba_api.stats.library.http import NBAStatsHTTP
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'connect_timeout': 3.05,
+    'read_timeout': 10,
+    'retries': 2,
+    'backoff': 0.3,
+    'backoff_max': 5,
+    'pool_maxsize': 32,
+    'breaker_threshold': 5,
+    'breaker_reset': 30,
+}
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+HTTP_CLASSES = (NBAHTTP, NBAStatsHTTP, NBALiveHTTP)
+
+
+class UpstreamUnavailable(Exception):
+    pass
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'UPSTREAM_HTTP', {})}
+
+
+def backoff_delay(attempt, config):
+    # Full jitter: anywhere between 0 and the exponential cap
+    return random.uniform(0, min(config['backoff_max'], config['backoff'] * 2 ** attempt))
+
+
+def effective_timeout(timeout, config):
+    """
+    ``(connect, read)``: the configured timeouts, lowered to the caller's ``timeout``.
+
+    nba_api always passes one (30 s unless the endpoint was given another), so
+    only a shorter one, like live.py's per-boxscore timeout, takes effect.
+    """
+    connect, read = config['connect_timeout'], config['read_timeout']
+    if timeout is None:
+        return connect, read
+    caller_connect, caller_read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    return (
+        connect if caller_connect is None else min(connect, caller_connect),
+        read if caller_read is None else min(read, caller_read),
+    )
+
+
+class CircuitBreaker:
+    def __init__(self, host, threshold, reset_after):
+        self.host = host
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return 'half-open'
+        return 'open'
+
+    def acquire(self):
+        # None when the request may not go out, otherwise whether it is the half-open trial
+        with self.lock:
+            state = self.state
+            if state == 'closed':
+                return False
+            # Half-open lets exactly one request through to probe the host
+            if state == 'half-open' and not self.trial_running:
+                self.trial_running = True
+                return True
+            return None
+
+    def allow(self):
+        return self.acquire() is not None
+
+    def check(self):
+        # Returns whether the request is the half-open trial
+        trial = self.acquire()
+        if trial is None:
+            raise UpstreamUnavailable(f'{self.host} is unavailable (circuit open)')
+        return trial
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial_running or self.failures >= self.threshold:
+                if self.opened_at is None or self.trial_running:
+                    logger.warning('Opening circuit for %s after %d failures', self.host, self.failures)
+                self.opened_at = time.monotonic()
+            self.trial_running = False
+
+    def release(self, trial):
+        # An attempt that ended without an answer from the host (cancelled, interrupted)
+        # doesn't count; if it was the trial, the next request probes instead
+        if trial:
+            with self.lock:
+                self.trial_running = False
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(url):
+    host = urlparse(url).netloc
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            config = get_config()
+            breaker = _breakers[host] = CircuitBreaker(host, config['breaker_threshold'], config['breaker_reset'])
+        return breaker
+
+
+class ResilientSession(requests.Session):
+    def __init__(self):
+        super().__init__()
+        config = get_config()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=config['pool_maxsize'])
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        config = get_config()
+        kwargs['timeout'] = effective_timeout(kwargs.get('timeout'), config)
+        breaker = get_breaker(url)
+        attempts = 1 + (config['retries'] if method.upper() in IDEMPOTENT_METHODS else 0)
+
+        for attempt in range(attempts):
+            trial = breaker.check()
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                breaker.record_failure()
+                if attempt + 1 == attempts:
+                    raise
+            except Exception:
+                # Broken responses (ChunkedEncodingError, ...) count against the host, without a retry
+                breaker.record_failure()
+                raise
+            except BaseException:
+                breaker.release(trial)
+                raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                if attempt + 1 == attempts:
+                    return response
+            time.sleep(backoff_delay(attempt, config))
+
+
+def install():
+    session = ResilientSession()
+    for http_cls in HTTP_CLASSES:
+        http_cls.set_session(session)
+    return session
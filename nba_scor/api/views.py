@@ -1,147 +1,248 @@
 from django.shortcuts import render
-from django.http import JsonResponse, Http404
-from nba_api.stats.static import teams, players
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from nba_api.stats.static import teams
 import pandas as pd
-from nba_api.stats.endpoints import playercareerstats, playergamelog, commonallplayers, playerdashboardbyyearoveryear, leagueleaders, leaguestandingsv3, boxscoretraditionalv2, scoreboardv2, PlayerGameLog, teamdashboardbygeneralsplits, commonteamroster, teamgamelogs
-from nba_api.live.nba.endpoints import scoreboard, boxscore
-from datetime import date
-
-
-def get_current_season():
-    today = date.today()
-    year = today.year
-    month = today.month
-    if month >= 10:  # Season starts in October
-        return f"{year}-{str(year + 1)[-2:]}"
-    else:
-        return f"{year - 1}-{str(year)[-2:]}"
-    
-def get_player_game_log(request, player_id):
+import numpy as np
+from nba_api.stats.endpoints import playercareerstats, playergamelog, playerdashboardbyyearoveryear, leagueleaders, boxscoretraditionalv2, scoreboardv2, PlayerGameLog, teamdashboardbygeneralsplits, commonteamroster, teamgamelogs
+from nba_api.live.nba.endpoints import boxscore
+from datetime import date, datetime
+from functools import wraps
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import contextvars
+import time
+from . import archive, deltas, directory, live, metrics, rankings, search, seasons, standings, stream, sync, transforms, upstream
+from .transforms import Column
+from .models import Game, Team
+from .responses import DataFrameResponse, FastJsonResponse
+from .seasons import DEFAULT_SEASON_TYPE
+
+
+# Conditional responses are revalidated before every reuse; archived boxscores never change
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+
+def upstream_etag(etag_func):
+    # Conditional GET for views built only from cached upstream data: the ETag is
+    # the cache entry's version, so a 304 is answered before any fetch or serialization.
+    # etag_func validates the query like the view does, so a bad request gets its 400
+    def decorator(view):
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            tag = request_etag(etag_func, request, *args, **kwargs)
+            if tag is not None:
+                response = not_modified(request, tag)
+                if response is not None:
+                    return response
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                # A cold request fetched inside the view, its version exists now. A tag read
+                # before an inline refresh is older than the content, which only costs the
+                # client one more 200; one read after it could be newer and pin stale content
+                tag = tag or request_etag(etag_func, request, *args, **kwargs)
+                if tag is not None:
+                    response.headers.setdefault('ETag', quote_etag(tag))
+                    response.headers.setdefault('Cache-Control', cache_control(tag))
+            return response
+        inner.etag_func = etag_func
+        return inner
+    return decorator
+
+
+def request_etag(etag_func, request, *args, **kwargs):
+    # A malformed query (bad season, limit, format...) has no tag, the view answers it with a 400
     try:
-        season = get_current_season()
+        return etag_func(request, *args, **kwargs)
+    except ValueError:
+        return None
+
+
+def cache_control(tag):
+    return archive.IMMUTABLE_CACHE_CONTROL if archive.is_tag(tag) else REVALIDATE_CACHE_CONTROL
+
+
+def not_modified(request, tag):
+    # 304 when the request's If-None-Match matches tag, otherwise None
+    response = get_conditional_response(request, etag=quote_etag(tag))
+    if response is not None:
+        response.headers['ETag'] = quote_etag(tag)
+        response.headers['Cache-Control'] = cache_control(tag)
+    return response
+
+
+# ?format= values; records (an object per row) is the default
+RESPONSE_FORMATS = ('records', 'columnar')
+
+
+def wants_columnar(request):
+    # ?format=columnar: a schema header and one array per column instead of a list of objects
+    value = request.GET.get('format') or 'records'
+    if value not in RESPONSE_FORMATS:
+        raise ValueError(f"Invalid format {value!r}. Use one of: {', '.join(RESPONSE_FORMATS)}")
+    return value == 'columnar'
+
+
+def player_game_log_etag(request, player_id):
+    wants_columnar(request)
+    endpoint_cls, params = player_game_log_request(player_id, *seasons.season_params(request))
+    return upstream.etag(endpoint_cls, **params)
+
+
+# Upstream requests behind the views, as (endpoint_cls, params). The sync views
+# fetch them; the async variants in async_views.py load them ahead of time.
+def player_game_log_request(player_id, season, season_type=DEFAULT_SEASON_TYPE):
+    return PlayerGameLog, {'player_id': player_id, 'season': season, 'season_type_all_star': season_type}
 
-        response = PlayerGameLog(
-            player_id=player_id,
-            season=season
-        )
 
-        gamelog = response.get_data_frames()[0].to_dict(orient='records')
+def player_career_request(player_id):
+    return playercareerstats.PlayerCareerStats, {'player_id': player_id}
+
+
+def player_dashboard_request(player_id, season, season_type=DEFAULT_SEASON_TYPE):
+    return playerdashboardbyyearoveryear.PlayerDashboardByYearOverYear, {
+        'player_id': player_id,
+        'season': season,
+        'per_mode_detailed': 'PerGame',
+        'season_type_playoffs': season_type,
+    }
+
+
+def boxscore_request(game_id):
+    return boxscore.BoxScore, {'game_id': game_id}
+
+
+def team_dashboard_request(team_id, season, season_type=DEFAULT_SEASON_TYPE):
+    return teamdashboardbygeneralsplits.TeamDashboardByGeneralSplits, {
+        'team_id': team_id,
+        'season': season,
+        'per_mode_detailed': 'PerGame',
+        'season_type_all_star': season_type,
+    }
+
+
+def team_roster_request(team_id, season):
+    return commonteamroster.CommonTeamRoster, {'team_id': team_id, 'season': season}
+
+
+def team_game_log_request(team_id, season, season_type=DEFAULT_SEASON_TYPE):
+    return teamgamelogs.TeamGameLogs, {
+        'team_id_nullable': team_id,
+        'season_nullable': season,
+        'season_type_nullable': season_type,
+    }
+
+
+@upstream_etag(player_game_log_etag)
+def get_player_game_log(request, player_id):
+    try:
+        endpoint_cls, params = player_game_log_request(player_id, *seasons.season_params(request))
+        response = upstream.fetch(endpoint_cls, **params)
+        game_log_df = response.get_data_frames()[0]
 
-        return JsonResponse(gamelog, safe=False)
+        if wants_columnar(request):
+            return FastJsonResponse(transforms.frame_columns(game_log_df))
+        # Written straight from the DataFrame, without a dict per game
+        return DataFrameResponse(game_log_df)
 
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)      
+        return FastJsonResponse({'error': str(e)}, status=400)      
     
 
 def live_game(request):
     try:
-        # Get the lightweight scoreboard first
-        scoreboard_data = scoreboard.ScoreBoard()
-        games_json = scoreboard_data.get_dict()
-        games = games_json['scoreboard']['games']
-        
-        # For games that are live (gameStatus == 2), fetch real-time boxscore data
-        enhanced_games = []
-        for game in games:
-            game_status = game.get('gameStatus', 1)
-            
-            # If game is live (status 2), get real-time scores from boxscore
-            if game_status == 2:
-                try:
-                    game_id = game.get('gameId')
-                    live_boxscore = boxscore.BoxScore(game_id=game_id)
-                    boxscore_data = live_boxscore.get_dict()
-                    
-                    # Extract real-time scores and update the game object
-                    box_game = boxscore_data.get('game', {})
-                    game['homeTeam']['score'] = box_game.get('homeTeam', {}).get('score', game['homeTeam'].get('score', 0))
-                    game['awayTeam']['score'] = box_game.get('awayTeam', {}).get('score', game['awayTeam'].get('score', 0))
-                    game['period'] = box_game.get('period', game.get('period', 0))
-                    game['gameClock'] = box_game.get('gameClock', game.get('gameClock', ''))
-                    
-                    # Also update period scores if available
-                    game['homeTeam']['periods'] = box_game.get('homeTeam', {}).get('periods', game['homeTeam'].get('periods', []))
-                    game['awayTeam']['periods'] = box_game.get('awayTeam', {}).get('periods', game['awayTeam'].get('periods', []))
-                except Exception as box_error:
-                    # If boxscore fetch fails, keep the scoreboard data
-                    pass
-            
-            enhanced_games.append(game)
-        
-        return JsonResponse(enhanced_games, safe=False)
+        # The poll_live command keeps a snapshot up to date; without it fetch inline
+        games = live.read_snapshot()
+        if games is None:
+            games = live.fetch_live_games()
+
+        return FastJsonResponse(games, safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)
+        return FastJsonResponse({'error': str(e)}, status=400)
+
+
+def get_metrics(request):
+    # Prometheus scrape target for this process
+    return HttpResponse(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
+async def live_stream(request):
+    # Server-Sent Events; under WSGI Django would buffer the endless stream and
+    # never answer, so the client is told to poll /api/live/ instead
+    if not isinstance(request, ASGIRequest):
+        return FastJsonResponse({'error': 'Live streaming needs the ASGI server (app/asgi.py); poll /api/live/'}, status=501)
+    response = StreamingHttpResponse(stream.stream_events(stream.live_feed), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 def get_all_teams(request):
     try:
-        all_teams = teams.get_teams()
-        return JsonResponse(all_teams, safe=False)
+        # Served from the database once sync_nba has run, with the same keys as the static list
+        stored_teams = Team.objects.order_by('nba_id')
+        if stored_teams.exists():
+            all_teams = [sync.team_record(team) for team in stored_teams]
+        else:
+            all_teams = teams.get_teams()
+        return FastJsonResponse(all_teams, safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)
+        return FastJsonResponse({'error': str(e)}, status=400)
 
 
 def get_all_players(request):
     try:
-        response = commonallplayers.CommonAllPlayers(is_only_current_season=1)
-        all_players = response.get_data_frames()[0].to_dict(orient='records')
-        return JsonResponse(all_players, safe=False)
+        # Served from the database once sync_nba has run
+        all_players = directory.get_current_players()
+        return FastJsonResponse(all_players, safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)
+        return FastJsonResponse({'error': str(e)}, status=400)
+
+
+def search_players(request):
+    try:
+        limit = search.parse_limit(request.GET.get('limit'))
+        results = directory.get_search_index().search(request.GET.get('q', ''), limit)
+        return FastJsonResponse(results, safe=False)
+    except Exception as e:
+        return FastJsonResponse({'error': str(e)}, status=400)
 
 
 def get_player_stats(request, player_id):
     try:
-        career_stats = playercareerstats.PlayerCareerStats(player_id=player_id)
-        stats_dict = career_stats.get_dict()
-        
+        player_directory = directory.get_directory()
+
         # Get player info from static data
-        all_players = players.get_players()
-        player_info = next((player for player in all_players if player['id'] == int(player_id)), None)
+        player_info = player_directory.get_player(player_id)
         
         if not player_info:
             raise Http404("Player not found")
         
-        # Get current team from CommonAllPlayers
-        current_players = commonallplayers.CommonAllPlayers(is_only_current_season=1)
-        current_players_df = current_players.get_data_frames()[0]
-        player_current = current_players_df[current_players_df['PERSON_ID'] == int(player_id)]
+        endpoint_cls, params = player_career_request(player_id)
+        career_stats = upstream.fetch(endpoint_cls, **params)
+        stats_dict = career_stats.get_dict()
         
-        team_info = None
-        if not player_current.empty:
-            team_id = player_current.iloc[0].get('TEAM_ID')
-            team_abbr = player_current.iloc[0].get('TEAM_ABBREVIATION')
-            team_name = player_current.iloc[0].get('TEAM_NAME')
-            team_city = player_current.iloc[0].get('TEAM_CITY')
-            
-            team_info = {
-                'team_id': int(team_id) if team_id else None,
-                'team_abbreviation': team_abbr if team_abbr else None,
-                'team_name': team_name if team_name else None,
-                'team_city': team_city if team_city else None
-            }
-            
         response_data = {
             'player_info': player_info,
-            'team_info': team_info,
+            'team_info': player_directory.get_team_info(player_id),
             'career_stats': stats_dict
         }
         
-        return JsonResponse(response_data)
+        return FastJsonResponse(response_data)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)
+        return FastJsonResponse({'error': str(e)}, status=400)
 
 
 def get_player_current_stats(request, player_id):
     try:
-        # Define current season (2025-26)
-        current_season = '2025-26'
+        # The requested season, the current one by default
+        current_season, season_type = seasons.season_params(request)
         
         # Get current season stats (year-over-year dashboard)
-        dashboard = playerdashboardbyyearoveryear.PlayerDashboardByYearOverYear(
-            player_id=player_id,
-            per_mode_detailed='PerGame'
-        )
+        endpoint_cls, params = player_dashboard_request(player_id, current_season, season_type)
+        dashboard = upstream.fetch(endpoint_cls, **params)
         
         # Get the dataframe with per-game stats
         stats_df = dashboard.get_data_frames()[1]  # OverallPlayerDashboard contains the stats
@@ -154,7 +255,7 @@ def get_player_current_stats(request, player_id):
         
         if current_season_data.empty:
             # Player hasn't played this season yet
-            return JsonResponse({
+            return FastJsonResponse({
                 'points': 0.0,
                 'rebounds': 0.0,
                 'assists': 0.0,
@@ -186,447 +287,456 @@ def get_player_current_stats(request, player_id):
             'has_played': True
         }
         
-        return JsonResponse(basic_stats)
+        return FastJsonResponse(basic_stats)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)
+        return FastJsonResponse({'error': str(e)}, status=400)
+
+
+# Leader category -> (LeagueLeaders column, response key)
+LEADER_CATEGORIES = {
+    'pts': ('PTS', 'points'),
+    'reb': ('REB', 'rebounds'),
+    'ast': ('AST', 'assists'),
+    'blk': ('BLK', 'blocks'),
+    'stl': ('STL', 'steals'),
+    'fgm': ('FGM', 'field_goals'),
+}
+DEFAULT_LEADERS_LIMIT = 10
+MAX_LEADERS_LIMIT = 100
+
+
+LEAGUE_LEADERS_PARAMS = {
+    'league_id': '00',
+    'per_mode48': 'PerGame',
+    'scope': 'S',
+    'stat_category_abbreviation': 'PTS',
+}
+
+
+def leaders_request(season, season_type=DEFAULT_SEASON_TYPE):
+    return leagueleaders.LeagueLeaders, {**LEAGUE_LEADERS_PARAMS, 'season': season, 'season_type_all_star': season_type}
+
+
+def get_league_leaders_df(season, season_type=DEFAULT_SEASON_TYPE):
+    # One LeagueLeaders table carries every category column for all qualified players
+    endpoint_cls, params = leaders_request(season, season_type)
+    leaders = upstream.fetch(endpoint_cls, **params)
+    return leaders.get_data_frames()[0]
+
+
+def leaders_etag(request, *args, **kwargs):
+    endpoint_cls, params = leaders_request(*seasons.season_params(request))
+    return upstream.etag(endpoint_cls, **params)
+
+
+def parse_leaders_query(request):
+    # (categories, limit) of /api/leaders/
+    categories = request.GET.get('categories', ','.join(LEADER_CATEGORIES)).split(',')
+    unknown = [category for category in categories if category not in LEADER_CATEGORIES]
+    if unknown:
+        raise ValueError(f"Unknown categories: {', '.join(unknown)}")
+    return categories, parse_leaders_limit(request.GET.get('limit'))
+
 
+def leaders_query_etag(request):
+    parse_leaders_query(request)
+    return leaders_etag(request)
 
+
+def parse_leaders_limit(value):
+    if not value:
+        return DEFAULT_LEADERS_LIMIT
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError('limit must be an integer') from None
+    if not 1 <= limit <= MAX_LEADERS_LIMIT:
+        raise ValueError(f'limit must be between 1 and {MAX_LEADERS_LIMIT}')
+    return limit
+
+
+def compute_leaders(leaders_df, categories, limit=DEFAULT_LEADERS_LIMIT):
+    team_column = 'TEAM_ABBREVIATION' if 'TEAM_ABBREVIATION' in leaders_df else 'TEAM'
+
+    result = {}
+    for category in categories:
+        column, stat_key = LEADER_CATEGORIES[category]
+        values = np.nan_to_num(leaders_df[column].to_numpy(dtype=float), nan=-np.inf)
+        count = max(min(limit, len(values)), 0)
+        if count == 0:
+            result[category] = []
+            continue
+
+        # Partial sort: select the top N without sorting the whole column, then order only those
+        top = np.argpartition(-values, count - 1)[:count]
+        top = top[np.lexsort((top, -values[top]))]
+        top_values = values[top]
+
+        # Tied players share the best rank, like the upstream RANK column
+        ranks = np.searchsorted(-top_values, -top_values, side='left') + 1
+
+        top_df = leaders_df.iloc[top].assign(RANK=ranks, VALUE=top_values)
+        result[category] = transforms.to_records(top_df, [
+            Column('RANK', 'rank', int),
+            Column('PLAYER_ID', 'player_id', int),
+            Column('PLAYER', 'player_name'),
+            Column(team_column, 'team', default='N/A'),
+            Column('GP', 'games_played', int),
+            Column('VALUE', stat_key, float),
+        ])
+
+    return result
+
+
+@upstream_etag(leaders_query_etag)
+def get_leaders(request):
+    try:
+        categories, limit = parse_leaders_query(request)
+        return FastJsonResponse(compute_leaders(get_league_leaders_df(*seasons.season_params(request)), categories, limit))
+    except Exception as e:
+        return FastJsonResponse({'error': str(e)}, status=400)
+
+
+def category_leaders(request, category):
+    return compute_leaders(get_league_leaders_df(*seasons.season_params(request)), [category])[category]
+
+
+@upstream_etag(leaders_etag)
 def get_points_leaders(request):
     try:
-        # Get league leaders for points per game
-        leaders = leagueleaders.LeagueLeaders(
-            league_id='00',
-            per_mode48='PerGame',
-            scope='S',
-            season='2025-26',
-            season_type_all_star='Regular Season',
-            stat_category_abbreviation='PTS'
-        )
-        
-        leaders_df = leaders.get_data_frames()[0]
-        
-        top_10 = leaders_df.head(10)
-        
-        # Format the response
-        leaders_list = []
-        for _, row in top_10.iterrows():
-            leaders_list.append({
-                'rank': int(row['RANK']),
-                'player_id': int(row['PLAYER_ID']),
-                'player_name': row['PLAYER'],
-                'team': row.get('TEAM_ABBREVIATION', row.get('TEAM', 'N/A')),
-                'games_played': int(row['GP']),
-                'points': float(row['PTS']),
-            })
-        
-        return JsonResponse(leaders_list, safe=False)
+        return FastJsonResponse(category_leaders(request, 'pts'), safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)
+        return FastJsonResponse({'error': str(e)}, status=400)
 
+@upstream_etag(leaders_etag)
 def get_rebound_leaders(request):
     try:
-        # Get league leaders for points per game
-        leaders = leagueleaders.LeagueLeaders(
-            league_id='00',
-            per_mode48='PerGame',
-            scope='S',
-            season='2025-26',
-            season_type_all_star='Regular Season',
-            stat_category_abbreviation='REB'
-        )
-        
-        leaders_df = leaders.get_data_frames()[0]
-        
-        top_10 = leaders_df.head(10)
-        
-        # Format the response
-        leaders_list = []
-        for _, row in top_10.iterrows():
-            leaders_list.append({
-                'rank': int(row['RANK']),
-                'player_id': int(row['PLAYER_ID']),
-                'player_name': row['PLAYER'],
-                'team': row.get('TEAM_ABBREVIATION', row.get('TEAM', 'N/A')),
-                'games_played': int(row['GP']),
-                'rebounds': float(row['REB']),
-            })
-        
-        return JsonResponse(leaders_list, safe=False)
+        return FastJsonResponse(category_leaders(request, 'reb'), safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)
+        return FastJsonResponse({'error': str(e)}, status=400)
 
+@upstream_etag(leaders_etag)
 def get_assist_leaders(request):
     try:
-        # Get league leaders for assists per game
-        leaders = leagueleaders.LeagueLeaders(
-            league_id='00',
-            per_mode48='PerGame',
-            scope='S',
-            season='2025-26',
-            season_type_all_star='Regular Season',
-            stat_category_abbreviation='AST'
-        )
-        
-        leaders_df = leaders.get_data_frames()[0]
-        
-        top_10 = leaders_df.head(10)
-        
-        # Format the response
-        leaders_list = []
-        for _, row in top_10.iterrows():
-            leaders_list.append({
-                'rank': int(row['RANK']),
-                'player_id': int(row['PLAYER_ID']),
-                'player_name': row['PLAYER'],
-                'team': row.get('TEAM_ABBREVIATION', row.get('TEAM', 'N/A')),
-                'games_played': int(row['GP']),
-                'assists': float(row['AST']),
-            })
-        
-        return JsonResponse(leaders_list, safe=False)
+        return FastJsonResponse(category_leaders(request, 'ast'), safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)
+        return FastJsonResponse({'error': str(e)}, status=400)
     
+@upstream_etag(leaders_etag)
 def get_blocks_leaders(request):
     try:
-        # Get league leaders for assists per game
-        leaders = leagueleaders.LeagueLeaders(
-            league_id='00',
-            per_mode48='PerGame',
-            scope='S',
-            season='2025-26',
-            season_type_all_star='Regular Season',
-            stat_category_abbreviation='BLK'
-        )
-        
-        leaders_df = leaders.get_data_frames()[0]
-        
-        top_10 = leaders_df.head(10)
-        
-        # Format the response
-        leaders_list = []
-        for _, row in top_10.iterrows():
-            leaders_list.append({
-                'rank': int(row['RANK']),
-                'player_id': int(row['PLAYER_ID']),
-                'player_name': row['PLAYER'],
-                'team': row.get('TEAM_ABBREVIATION', row.get('TEAM', 'N/A')),
-                'games_played': int(row['GP']),
-                'blocks': float(row['BLK']),
-            })
-        
-        return JsonResponse(leaders_list, safe=False)
+        return FastJsonResponse(category_leaders(request, 'blk'), safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)    
+        return FastJsonResponse({'error': str(e)}, status=400)    
     
+@upstream_etag(leaders_etag)
 def get_steals_leaders(request):
     try:
-        # Get league leaders for assists per game
-        leaders = leagueleaders.LeagueLeaders(
-            league_id='00',
-            per_mode48='PerGame',
-            scope='S',
-            season='2025-26',
-            season_type_all_star='Regular Season',
-            stat_category_abbreviation='STL'
-        )
-        
-        leaders_df = leaders.get_data_frames()[0]
-        
-        top_10 = leaders_df.head(10)
-        
-        # Format the response
-        leaders_list = []
-        for _, row in top_10.iterrows():
-            leaders_list.append({
-                'rank': int(row['RANK']),
-                'player_id': int(row['PLAYER_ID']),
-                'player_name': row['PLAYER'],
-                'team': row.get('TEAM_ABBREVIATION', row.get('TEAM', 'N/A')),
-                'games_played': int(row['GP']),
-                'steals': float(row['STL']),
-            })
-        
-        return JsonResponse(leaders_list, safe=False)
+        return FastJsonResponse(category_leaders(request, 'stl'), safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)    
+        return FastJsonResponse({'error': str(e)}, status=400)    
     
+@upstream_etag(leaders_etag)
 def get_fgm_leaders(request):
     try:
-        leaders = leagueleaders.LeagueLeaders(
-            league_id='00',
-            per_mode48='PerGame',
-            scope='S',
-            season='2025-26',
-            season_type_all_star='Regular Season',
-            stat_category_abbreviation='FGM'
-        )
-        
-        leaders_df = leaders.get_data_frames()[0]
-        
-        top_10 = leaders_df.head(10)
-        
-        # Format the response
-        leaders_list = []
-        for _, row in top_10.iterrows():
-            leaders_list.append({
-                'rank': int(row['RANK']),
-                'player_id': int(row['PLAYER_ID']),
-                'player_name': row['PLAYER'],
-                'team': row.get('TEAM_ABBREVIATION', row.get('TEAM', 'N/A')),
-                'games_played': int(row['GP']),
-                'field_goals': float(row['FGM']),
-            })
-        
-        return JsonResponse(leaders_list, safe=False)
+        return FastJsonResponse(category_leaders(request, 'fgm'), safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400) 
+        return FastJsonResponse({'error': str(e)}, status=400) 
+
+def standings_etag(request):
+    return standings.get_etag(*seasons.season_params(request))
 
+
+@upstream_etag(standings_etag)
 def get_league_standings(request):
     try:
-        standings = leaguestandingsv3.LeagueStandingsV3(
-            league_id='00',
-            season='2025-26',
-            season_type='Regular Season'
-        )
-        
-        standings_df = standings.get_data_frames()[0]
-        
-        # Separate by conference
-        eastern_conf = standings_df[standings_df['Conference'] == 'East'].copy()
-        western_conf = standings_df[standings_df['Conference'] == 'West'].copy()
-        
-        # Sort by win percentage
-        eastern_conf = eastern_conf.sort_values('WinPCT', ascending=False)
-        western_conf = western_conf.sort_values('WinPCT', ascending=False)
-        
-        # Format Eastern Conference
-        eastern_standings = []
-        for idx, (_, row) in enumerate(eastern_conf.iterrows(), 1):
-            eastern_standings.append({
-                'rank': idx,
-                'team_id': int(row['TeamID']),
-                'team_name': row['TeamName'],
-                'team_city': row['TeamCity'],
-                'team_abbreviation': row.get('TeamSlug', 'N/A'),
-                'wins': int(row['WINS']),
-                'losses': int(row['LOSSES']),
-                'win_pct': float(row['WinPCT']),
-                'games_back': row.get('ConferenceGamesBack', '0'),
-                'conference': 'East',
-                'division': row.get('Division', 'N/A'),
-                'home_record': row.get('HOME', 'N/A'),
-                'road_record': row.get('ROAD', 'N/A'),
-                'last_10': row.get('L10', 'N/A'),
-                'streak': row.get('strCurrentStreak', 'N/A')
-            })
-        
-        # Format Western Conference
-        western_standings = []
-        for idx, (_, row) in enumerate(western_conf.iterrows(), 1):
-            western_standings.append({
-                'rank': idx,
-                'team_id': int(row['TeamID']),
-                'team_name': row['TeamName'],
-                'team_city': row['TeamCity'],
-                'team_abbreviation': row.get('TeamSlug', 'N/A'),
-                'wins': int(row['WINS']),
-                'losses': int(row['LOSSES']),
-                'win_pct': float(row['WinPCT']),
-                'games_back': row.get('ConferenceGamesBack', '0'),
-                'conference': 'West',
-                'division': row.get('Division', 'N/A'),
-                'home_record': row.get('HOME', 'N/A'),
-                'road_record': row.get('ROAD', 'N/A'),
-                'last_10': row.get('L10', 'N/A'),
-                'streak': row.get('strCurrentStreak', 'N/A')
-            })
+        season, season_type = seasons.season_params(request)
+        snapshot = standings.get_standings(season, season_type)
         
         response_data = {
-            'eastern_conference': eastern_standings,
-            'western_conference': western_standings,
-            'season': '2025-26'
+            'eastern_conference': snapshot.conference('East'),
+            'western_conference': snapshot.conference('West'),
+            'season': season,
+            'season_type': season_type,
         }
         
-        return JsonResponse(response_data, safe=False)
+        return FastJsonResponse(response_data, safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)
+        return FastJsonResponse({'error': str(e)}, status=400)
+
+
+def boxscore_options(request):
+    # (columnar, since) of /api/games/<id>/
+    columnar = wants_columnar(request)
+    since = request.GET.get('since')
+    if columnar and since:
+        raise ValueError("format=columnar can't be combined with since")
+    return columnar, since
+
 
+def boxscore_etag(request, game_id):
+    boxscore_options(request)
+    # Archived games keep one tag for good
+    tag = archive.etag(game_id)
+    if tag is not None:
+        return tag
+    endpoint_cls, params = boxscore_request(game_id)
+    return upstream.etag(endpoint_cls, **params)
 
+
+@upstream_etag(boxscore_etag)
 def get_game_boxscore(request, game_id):
     try:
-        # Get live boxscore data (works for live, finished, and recent games)
-        game_boxscore = boxscore.BoxScore(game_id=game_id)
-        boxscore_data = game_boxscore.get_dict()
-        
-        # Extract game info
-        game_info = boxscore_data.get('game', {})
-        
-        # Extract team stats
-        home_team = game_info.get('homeTeam', {})
-        away_team = game_info.get('awayTeam', {})
-        
-        # Format player stats for home team
-        home_players = []
-        for player in home_team.get('players', []):
-            stats = player.get('statistics', {})
-            home_players.append({
-                'player_id': player.get('personId'),
-                'name': player.get('name', ''),
-                'jersey_num': player.get('jerseyNum', ''),
-                'position': player.get('position', ''),
-                'starter': player.get('starter', '0') == '1',
-                'minutes': stats.get('minutes', '0'),
-                'points': stats.get('points', 0),
-                'rebounds': stats.get('reboundsTotal', 0),
-                'assists': stats.get('assists', 0),
-                'steals': stats.get('steals', 0),
-                'blocks': stats.get('blocks', 0),
-                'turnovers': stats.get('turnovers', 0),
-                'fouls': stats.get('foulsPersonal', 0),
-                'fg_made': stats.get('fieldGoalsMade', 0),
-                'fg_attempted': stats.get('fieldGoalsAttempted', 0),
-                'fg_percentage': stats.get('fieldGoalsPercentage', 0),
-                'three_pt_made': stats.get('threePointersMade', 0),
-                'three_pt_attempted': stats.get('threePointersAttempted', 0),
-                'three_pt_percentage': stats.get('threePointersPercentage', 0),
-                'ft_made': stats.get('freeThrowsMade', 0),
-                'ft_attempted': stats.get('freeThrowsAttempted', 0),
-                'ft_percentage': stats.get('freeThrowsPercentage', 0),
-                'plus_minus': stats.get('plusMinusPoints', 0)
-            })
-        
-        # Format player stats for away team
-        away_players = []
-        for player in away_team.get('players', []):
-            stats = player.get('statistics', {})
-            away_players.append({
-                'player_id': player.get('personId'),
-                'name': player.get('name', ''),
-                'jersey_num': player.get('jerseyNum', ''),
-                'position': player.get('position', ''),
-                'starter': player.get('starter', '0') == '1',
-                'minutes': stats.get('minutes', '0'),
-                'points': stats.get('points', 0),
-                'rebounds': stats.get('reboundsTotal', 0),
-                'assists': stats.get('assists', 0),
-                'steals': stats.get('steals', 0),
-                'blocks': stats.get('blocks', 0),
-                'turnovers': stats.get('turnovers', 0),
-                'fouls': stats.get('foulsPersonal', 0),
-                'fg_made': stats.get('fieldGoalsMade', 0),
-                'fg_attempted': stats.get('fieldGoalsAttempted', 0),
-                'fg_percentage': stats.get('fieldGoalsPercentage', 0),
-                'three_pt_made': stats.get('threePointersMade', 0),
-                'three_pt_attempted': stats.get('threePointersAttempted', 0),
-                'three_pt_percentage': stats.get('threePointersPercentage', 0),
-                'ft_made': stats.get('freeThrowsMade', 0),
-                'ft_attempted': stats.get('freeThrowsAttempted', 0),
-                'ft_percentage': stats.get('freeThrowsPercentage', 0),
-                'plus_minus': stats.get('plusMinusPoints', 0)
-            })
-        
-        # Format team statistics
-        home_team_stats = home_team.get('statistics', {})
-        away_team_stats = away_team.get('statistics', {})
-        
-        response_data = {
-            'game_id': game_id,
-            'game_status': game_info.get('gameStatus'),
-            'game_status_text': game_info.get('gameStatusText', ''),
-            'period': game_info.get('period', 0),
-            'game_clock': game_info.get('gameClock', ''),
-            'home_team': {
-                'team_id': home_team.get('teamId'),
-                'team_name': home_team.get('teamName', ''),
-                'team_city': home_team.get('teamCity', ''),
-                'team_tricode': home_team.get('teamTricode', ''),
-                'score': home_team.get('score', 0),
-                'periods': home_team.get('periods', []),
-                'statistics': {
-                    'points': home_team_stats.get('points', 0),
-                    'fg_made': home_team_stats.get('fieldGoalsMade', 0),
-                    'fg_attempted': home_team_stats.get('fieldGoalsAttempted', 0),
-                    'fg_percentage': home_team_stats.get('fieldGoalsPercentage', 0),
-                    'three_pt_made': home_team_stats.get('threePointersMade', 0),
-                    'three_pt_attempted': home_team_stats.get('threePointersAttempted', 0),
-                    'three_pt_percentage': home_team_stats.get('threePointersPercentage', 0),
-                    'ft_made': home_team_stats.get('freeThrowsMade', 0),
-                    'ft_attempted': home_team_stats.get('freeThrowsAttempted', 0),
-                    'ft_percentage': home_team_stats.get('freeThrowsPercentage', 0),
-                    'rebounds_total': home_team_stats.get('reboundsTotal', 0),
-                    'rebounds_offensive': home_team_stats.get('reboundsOffensive', 0),
-                    'rebounds_defensive': home_team_stats.get('reboundsDefensive', 0),
-                    'assists': home_team_stats.get('assists', 0),
-                    'steals': home_team_stats.get('steals', 0),
-                    'blocks': home_team_stats.get('blocks', 0),
-                    'turnovers': home_team_stats.get('turnovers', 0),
-                    'fouls': home_team_stats.get('foulsPersonal', 0)
-                },
-                'players': home_players
+        # Finished games are served from the archive, without an upstream call
+        boxscore_data = archive.load(game_id)
+        archived = boxscore_data is not None
+        if not archived:
+            # Get live boxscore data (works for live, finished, and recent games)
+            endpoint_cls, params = boxscore_request(game_id)
+            game_boxscore = upstream.fetch(endpoint_cls, **params)
+            boxscore_data = game_boxscore.get_dict()
+            archive.store(game_id, boxscore_data)
+
+        columnar, since = boxscore_options(request)
+        payload = format_boxscore(game_id, boxscore_data, columnar)
+        if not columnar:
+            deltas.remember(game_id, payload)
+            # ?since=<version> sends only what changed since that version
+            if since:
+                payload = deltas.delta_since(game_id, payload, since)
+        response = FastJsonResponse(payload)
+        if archived:
+            response.headers['Cache-Control'] = archive.IMMUTABLE_CACHE_CONTROL
+        return response
+    except Exception as e:
+        return FastJsonResponse({'error': str(e)}, status=400)
+
+
+# (response key, player field, default) of boxscore player lines, around 'starter'
+BOXSCORE_PLAYER_INFO = [
+    ('player_id', 'personId', None),
+    ('name', 'name', ''),
+    ('jersey_num', 'jerseyNum', ''),
+    ('position', 'position', ''),
+]
+# (response key, player statistics field, default)
+BOXSCORE_PLAYER_STATS = [
+    ('minutes', 'minutes', '0'),
+    ('points', 'points', 0),
+    ('rebounds', 'reboundsTotal', 0),
+    ('assists', 'assists', 0),
+    ('steals', 'steals', 0),
+    ('blocks', 'blocks', 0),
+    ('turnovers', 'turnovers', 0),
+    ('fouls', 'foulsPersonal', 0),
+    ('fg_made', 'fieldGoalsMade', 0),
+    ('fg_attempted', 'fieldGoalsAttempted', 0),
+    ('fg_percentage', 'fieldGoalsPercentage', 0),
+    ('three_pt_made', 'threePointersMade', 0),
+    ('three_pt_attempted', 'threePointersAttempted', 0),
+    ('three_pt_percentage', 'threePointersPercentage', 0),
+    ('ft_made', 'freeThrowsMade', 0),
+    ('ft_attempted', 'freeThrowsAttempted', 0),
+    ('ft_percentage', 'freeThrowsPercentage', 0),
+    ('plus_minus', 'plusMinusPoints', 0),
+]
+
+
+def format_boxscore_players(players, columnar=False):
+    statistics = [player.get('statistics', {}) for player in players]
+    fields = {key: [player.get(source, default) for player in players] for key, source, default in BOXSCORE_PLAYER_INFO}
+    fields['starter'] = [player.get('starter', '0') == '1' for player in players]
+    fields.update({key: [stats.get(source, default) for stats in statistics] for key, source, default in BOXSCORE_PLAYER_STATS})
+
+    if columnar:
+        return transforms.columnar(fields, len(players))
+    keys = list(fields)
+    return [dict(zip(keys, row)) for row in zip(*fields.values())]
+
+
+def format_boxscore(game_id, boxscore_data, columnar=False):
+    # Extract game info
+    game_info = boxscore_data.get('game', {})
+    
+    # Extract team stats
+    home_team = game_info.get('homeTeam', {})
+    away_team = game_info.get('awayTeam', {})
+    
+    # Format player stats for both teams
+    home_players = format_boxscore_players(home_team.get('players', []), columnar)
+    away_players = format_boxscore_players(away_team.get('players', []), columnar)
+    
+    # Format team statistics
+    home_team_stats = home_team.get('statistics', {})
+    away_team_stats = away_team.get('statistics', {})
+    
+    response_data = {
+        'game_id': game_id,
+        'game_status': game_info.get('gameStatus'),
+        'game_status_text': game_info.get('gameStatusText', ''),
+        'period': game_info.get('period', 0),
+        'game_clock': game_info.get('gameClock', ''),
+        'home_team': {
+            'team_id': home_team.get('teamId'),
+            'team_name': home_team.get('teamName', ''),
+            'team_city': home_team.get('teamCity', ''),
+            'team_tricode': home_team.get('teamTricode', ''),
+            'score': home_team.get('score', 0),
+            'periods': home_team.get('periods', []),
+            'statistics': {
+                'points': home_team_stats.get('points', 0),
+                'fg_made': home_team_stats.get('fieldGoalsMade', 0),
+                'fg_attempted': home_team_stats.get('fieldGoalsAttempted', 0),
+                'fg_percentage': home_team_stats.get('fieldGoalsPercentage', 0),
+                'three_pt_made': home_team_stats.get('threePointersMade', 0),
+                'three_pt_attempted': home_team_stats.get('threePointersAttempted', 0),
+                'three_pt_percentage': home_team_stats.get('threePointersPercentage', 0),
+                'ft_made': home_team_stats.get('freeThrowsMade', 0),
+                'ft_attempted': home_team_stats.get('freeThrowsAttempted', 0),
+                'ft_percentage': home_team_stats.get('freeThrowsPercentage', 0),
+                'rebounds_total': home_team_stats.get('reboundsTotal', 0),
+                'rebounds_offensive': home_team_stats.get('reboundsOffensive', 0),
+                'rebounds_defensive': home_team_stats.get('reboundsDefensive', 0),
+                'assists': home_team_stats.get('assists', 0),
+                'steals': home_team_stats.get('steals', 0),
+                'blocks': home_team_stats.get('blocks', 0),
+                'turnovers': home_team_stats.get('turnovers', 0),
+                'fouls': home_team_stats.get('foulsPersonal', 0)
             },
-            'away_team': {
-                'team_id': away_team.get('teamId'),
-                'team_name': away_team.get('teamName', ''),
-                'team_city': away_team.get('teamCity', ''),
-                'team_tricode': away_team.get('teamTricode', ''),
-                'score': away_team.get('score', 0),
-                'periods': away_team.get('periods', []),
-                'statistics': {
-                    'points': away_team_stats.get('points', 0),
-                    'fg_made': away_team_stats.get('fieldGoalsMade', 0),
-                    'fg_attempted': away_team_stats.get('fieldGoalsAttempted', 0),
-                    'fg_percentage': away_team_stats.get('fieldGoalsPercentage', 0),
-                    'three_pt_made': away_team_stats.get('threePointersMade', 0),
-                    'three_pt_attempted': away_team_stats.get('threePointersAttempted', 0),
-                    'three_pt_percentage': away_team_stats.get('threePointersPercentage', 0),
-                    'ft_made': away_team_stats.get('freeThrowsMade', 0),
-                    'ft_attempted': away_team_stats.get('freeThrowsAttempted', 0),
-                    'ft_percentage': away_team_stats.get('freeThrowsPercentage', 0),
-                    'rebounds_total': away_team_stats.get('reboundsTotal', 0),
-                    'rebounds_offensive': away_team_stats.get('reboundsOffensive', 0),
-                    'rebounds_defensive': away_team_stats.get('reboundsDefensive', 0),
-                    'assists': away_team_stats.get('assists', 0),
-                    'steals': away_team_stats.get('steals', 0),
-                    'blocks': away_team_stats.get('blocks', 0),
-                    'turnovers': away_team_stats.get('turnovers', 0),
-                    'fouls': away_team_stats.get('foulsPersonal', 0)
-                },
-                'players': away_players
-            }
+            'players': home_players
+        },
+        'away_team': {
+            'team_id': away_team.get('teamId'),
+            'team_name': away_team.get('teamName', ''),
+            'team_city': away_team.get('teamCity', ''),
+            'team_tricode': away_team.get('teamTricode', ''),
+            'score': away_team.get('score', 0),
+            'periods': away_team.get('periods', []),
+            'statistics': {
+                'points': away_team_stats.get('points', 0),
+                'fg_made': away_team_stats.get('fieldGoalsMade', 0),
+                'fg_attempted': away_team_stats.get('fieldGoalsAttempted', 0),
+                'fg_percentage': away_team_stats.get('fieldGoalsPercentage', 0),
+                'three_pt_made': away_team_stats.get('threePointersMade', 0),
+                'three_pt_attempted': away_team_stats.get('threePointersAttempted', 0),
+                'three_pt_percentage': away_team_stats.get('threePointersPercentage', 0),
+                'ft_made': away_team_stats.get('freeThrowsMade', 0),
+                'ft_attempted': away_team_stats.get('freeThrowsAttempted', 0),
+                'ft_percentage': away_team_stats.get('freeThrowsPercentage', 0),
+                'rebounds_total': away_team_stats.get('reboundsTotal', 0),
+                'rebounds_offensive': away_team_stats.get('reboundsOffensive', 0),
+                'rebounds_defensive': away_team_stats.get('reboundsDefensive', 0),
+                'assists': away_team_stats.get('assists', 0),
+                'steals': away_team_stats.get('steals', 0),
+                'blocks': away_team_stats.get('blocks', 0),
+                'turnovers': away_team_stats.get('turnovers', 0),
+                'fouls': away_team_stats.get('foulsPersonal', 0)
+            },
+            'players': away_players
         }
-        
-        return JsonResponse(response_data)
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)
+    }
+
+    return response_data
+
+
+def nba_com_tricode(abbreviation):
+    # Special cases: adjust team codes to match NBA.com conventions
+    return {'UTA': 'UTAH', 'NOP': 'NO'}.get(abbreviation, abbreviation)
+
+
+def format_date_game(game_id, home_id, home_abbr, home_score, away_id, away_abbr, away_score):
+    # Minimal structure needed by the frontend
+    return {
+        'gameId': game_id,
+
+        'homeTeam': {
+            'teamId': home_id,
+            'teamTricode': nba_com_tricode(home_abbr),
+            'score': home_score,
+        },
+        'awayTeam': {
+            'teamId': away_id,
+            'teamTricode': nba_com_tricode(away_abbr),
+            'score': away_score,
+        }
+    }
+
+
+def get_stored_games(game_date):
+    stored = list(Game.objects.filter(date__date=game_date).select_related('home_team', 'away_team').order_by('nba_id'))
+
+    # Stored scores are only trusted for finished dates and for dates that haven't started yet
+    if not stored:
+        return None
+    if game_date <= date.today() and any(game.status != sync.GAME_STATUS_FINAL for game in stored):
+        return None
+
+    return [
+        format_date_game(
+            f'{game.nba_id:010d}',
+            game.home_team.nba_id, game.home_team.abbreviation, game.home_score,
+            game.away_team.nba_id, game.away_team.abbreviation, game.away_score,
+        )
+        for game in stored
+    ]
+
+
+def store_final_games(game_date, games_df, scores):
+    teams_by_nba_id = sync.ensure_teams()
+
+    final_games = []
+    for _, game_row in games_df.iterrows():
+        home_id = int(game_row['HOME_TEAM_ID'])
+        away_id = int(game_row['VISITOR_TEAM_ID'])
+        final_games.append(sync.make_game(
+            game_row['GAME_ID'],
+            game_date,
+            teams_by_nba_id[home_id],
+            teams_by_nba_id[away_id],
+            scores.get((game_row['GAME_ID'], home_id), 0),
+            scores.get((game_row['GAME_ID'], away_id), 0),
+            sync.GAME_STATUS_FINAL,
+        ))
+
+    sync.upsert_games(final_games)
 
 
 def get_games_by_date(request, date):
     try:
         # Date should be in format YYYY-MM-DD (e.g., "2025-11-15")
-        from datetime import datetime
         
         # Validate date format
         try:
             date_obj = datetime.strptime(date, '%Y-%m-%d')
         except ValueError:
-            return JsonResponse({'error': 'Invalid date format. Use YYYY-MM-DD'}, status=400)
+            return FastJsonResponse({'error': 'Invalid date format. Use YYYY-MM-DD'}, status=400)
         
+        # Finished and future dates are served from the database
+        stored_games = get_stored_games(date_obj.date())
+        if stored_games is not None:
+            return FastJsonResponse(stored_games, safe=False)
+
         # Convert to MM/DD/YYYY format for the stats API
         formatted_date = date_obj.strftime('%m/%d/%Y')
         
         # Use the stats API ScoreboardV2 which accepts a game_date parameter
-        scoreboard_data = scoreboardv2.ScoreboardV2(game_date=formatted_date)
+        scoreboard_data = upstream.fetch(scoreboardv2.ScoreboardV2, game_date=formatted_date)
 
-        games_df = scoreboard_data.get_data_frames()[0]  # GameHeader dataframe
+        games_df = scoreboard_data.game_header.get_data_frame().drop_duplicates('GAME_ID')
 
         if games_df.empty:
-            return JsonResponse([], safe=False)
+            return FastJsonResponse([], safe=False)
+
+        # Per-team points come with the same response in the LineScore result set
+        line_score_df = scoreboard_data.line_score.get_data_frame()
+        scores = {
+            (game_id, int(team_id)): int(pts) if pd.notna(pts) else 0
+            for game_id, team_id, pts in zip(line_score_df['GAME_ID'], line_score_df['TEAM_ID'], line_score_df['PTS'])
+        }
 
         teams_list = teams.get_teams()
         teams_by_id = {int(t['id']): t for t in teams_list}
 
-        # Format the response to match the minimal structure needed by the frontend
         games = []
         for _, game_row in games_df.iterrows():
             game_id = str(game_row['GAME_ID'])
@@ -637,250 +747,228 @@ def get_games_by_date(request, date):
             home_meta = teams_by_id.get(home_id, {})
             away_meta = teams_by_id.get(away_id, {})
 
-            # Team tricodes from static metadata
-            home_tricode = home_meta.get('abbreviation', '')
-            away_tricode = away_meta.get('abbreviation', '')
-            
-            # Special cases: adjust team codes to match NBA.com conventions
-            if home_tricode == 'UTA':
-                home_tricode = 'UTAH'
-            elif home_tricode == 'NOP':
-                home_tricode = 'NO'
-            
-            if away_tricode == 'UTA':
-                away_tricode = 'UTAH'
-            elif away_tricode == 'NOP':
-                away_tricode = 'NO'
-
-            # Get scores from boxscore for finished games
-            home_score = 0
-            away_score = 0
-            try:
-                bs = boxscore.BoxScore(game_id=game_id)
-                bs_data = bs.get_dict()
-                game_data = bs_data.get('game', {})
-                home_score = game_data.get('homeTeam', {}).get('score', 0)
-                away_score = game_data.get('awayTeam', {}).get('score', 0)
-            except Exception:
-                pass  # Game not available in boxscore, keep scores at 0
-
-            game_obj = {
-                'gameId': game_id,
-
-                'homeTeam': {
-                    'teamId': home_id,
-                    'teamTricode': home_tricode,
-                    'score': home_score,
-                },
-                'awayTeam': {
-                    'teamId': away_id,
-                    'teamTricode': away_tricode,
-                    'score': away_score,
-                }
-            }
-            
-            games.append(game_obj)
-
-        return JsonResponse(games, safe=False)
+            games.append(format_date_game(
+                game_id,
+                home_id, home_meta.get('abbreviation', ''), scores.get((game_id, home_id), 0),
+                away_id, away_meta.get('abbreviation', ''), scores.get((game_id, away_id), 0),
+            ))
+
+        # Once every game of the day is final (status 3) the scores can't change anymore
+        if (games_df['GAME_STATUS_ID'] == sync.GAME_STATUS_FINAL).all():
+            store_final_games(date_obj.date(), games_df, scores)
+
+        return FastJsonResponse(games, safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)
+        return FastJsonResponse({'error': str(e)}, status=400)
+
+
+def build_team_stats(team_id, season, season_type=DEFAULT_SEASON_TYPE):
+    # Team record and rankings from the shared standings snapshot
+    snapshot = standings.get_standings(season, season_type)
+    team_row = snapshot.get_team(team_id)
+    
+    if team_row is None:
+        return {'error': 'Team not found in standings'}, 404
+    
+    # Format response
+    team_stats = {
+        'team_id': int(team_id),
+        'team_name': team_row['TeamName'],
+        'team_city': team_row['TeamCity'],
+        'wins': int(team_row['WINS']),
+        'losses': int(team_row['LOSSES']),
+        'win_percentage': float(team_row['WinPCT']),
+        'conference': team_row['Conference'],
+        'conference_rank': snapshot.conference_rank[int(team_id)],
+        'league_rank': snapshot.league_rank[int(team_id)],
+        'home_record': team_row.get('HOME', 'N/A'),
+        'road_record': team_row.get('ROAD', 'N/A'),
+        'last_10': team_row.get('L10', 'N/A'),
+    }
+    
+    return team_stats, 200
+
+
+# (response key, LeagueDashTeamStats / dashboard column, rank key)
+TEAM_AVERAGE_STATS = [
+    ('wins', 'W', 'wins_rank'),
+    ('losses', 'L', 'losses_rank'),
+    ('points', 'PTS', 'points_rank'),
+    ('field_goals_made', 'FGM', 'field_goals_made_rank'),
+    ('field_goals_attempted', 'FGA', 'field_goals_attempted_rank'),
+    ('field_goal_pct', 'FG_PCT', 'field_goal_pct_rank'),
+    ('three_point_pct', 'FG3_PCT', 'three_point_pct_rank'),
+    ('free_throw_pct', 'FT_PCT', 'free_throw_pct_rank'),
+    ('total_rebounds', 'REB', 'rebounds_rank'),
+    ('assists', 'AST', 'assists_rank'),
+    ('turnovers', 'TOV', 'turnovers_rank'),
+    ('steals', 'STL', 'steals_rank'),
+    ('blocks', 'BLK', 'blocks_rank'),
+]
+
+
+def build_team_averages(team_id, season, season_type=DEFAULT_SEASON_TYPE):
+    # League-wide rank table (rebuilt only when the league dashboard refreshes)
+    # and the team dashboard with general splits for the season, concurrently
+    ranks_future = upstream.submit(rankings.get_team_ranks, season, season_type=season_type)
+    endpoint_cls, params = team_dashboard_request(team_id, season, season_type)
+    dashboard = upstream.fetch(endpoint_cls, **params)
+    rank_table = ranks_future.result()
+    
+    # Get the overall team stats (first dataframe)
+    stats_df = dashboard.get_data_frames()[0]
+    
+    if stats_df.empty:
+        return {'error': 'No stats found for this team'}, 404
+    
+    # Get the first row (overall stats)
+    team_row = stats_df.iloc[0]
+    
+    # Format response with per-game averages and rankings
+    team_averages = {
+        'team_id': int(team_id),
+        'games_played': int(team_row.get('GP', 0)),
+    }
+    for key, column, rank_key in TEAM_AVERAGE_STATS:
+        value = team_row.get(column, 0)
+        team_averages[key] = int(value) if column in ('W', 'L') else float(value)
+        team_averages[rank_key] = rank_table.rank(team_id, column)
+
+    # Rank for every numeric column of the league dashboard
+    team_averages['ranks'] = rank_table.team_ranks(team_id)
+    
+    return team_averages, 200
 
 
 def get_team_stats(request, team_id):
     try:
-        # Get league standings to find team record and rankings
-        standings = leaguestandingsv3.LeagueStandingsV3(
-            league_id='00',
-            season='2025-26',
-            season_type='Regular Season'
-        )
-        
-        standings_df = standings.get_data_frames()[0]
-        
-        # Find the team in standings
-        team_data = standings_df[standings_df['TeamID'] == int(team_id)]
-        
-        if team_data.empty:
-            return JsonResponse({'error': 'Team not found in standings'}, status=404)
-        
-        team_row = team_data.iloc[0]
-        
-        # Get conference and league rankings
-        conference = team_row['Conference']
-        
-        # Calculate conference rank
-        conf_teams = standings_df[standings_df['Conference'] == conference].copy()
-        conf_teams = conf_teams.sort_values('WinPCT', ascending=False)
-        conf_rank = conf_teams.index.tolist().index(team_row.name) + 1
-        
-        # Calculate league rank
-        league_teams = standings_df.copy()
-        league_teams = league_teams.sort_values('WinPCT', ascending=False)
-        league_rank = league_teams.index.tolist().index(team_row.name) + 1
-        
-        # Format response
-        team_stats = {
-            'team_id': int(team_id),
-            'team_name': team_row['TeamName'],
-            'team_city': team_row['TeamCity'],
-            'wins': int(team_row['WINS']),
-            'losses': int(team_row['LOSSES']),
-            'win_percentage': float(team_row['WinPCT']),
-            'conference': conference,
-            'conference_rank': conf_rank,
-            'league_rank': league_rank,
-            'home_record': team_row.get('HOME', 'N/A'),
-            'road_record': team_row.get('ROAD', 'N/A'),
-            'last_10': team_row.get('L10', 'N/A'),
-        }
-        
-        return JsonResponse(team_stats)
+        data, status = build_team_stats(team_id, *seasons.season_params(request))
+        return FastJsonResponse(data, status=status)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)
+        return FastJsonResponse({'error': str(e)}, status=400)
 
 
 def get_team_averages(request, team_id):
     try:
-        # Get all teams' stats to calculate rankings
-        from nba_api.stats.endpoints import leaguedashteamstats
-        
-        # Get league-wide team stats
-        league_stats = leaguedashteamstats.LeagueDashTeamStats(
-            season='2025-26',
-            per_mode_detailed='PerGame',
-            season_type_all_star='Regular Season'
-        )
-        
-        league_df = league_stats.get_data_frames()[0]
-        
-        # Get team dashboard with general splits for current season
-        dashboard = teamdashboardbygeneralsplits.TeamDashboardByGeneralSplits(
-            team_id=team_id,
-            season='2025-26',
-            per_mode_detailed='PerGame',
-            season_type_all_star='Regular Season'
-        )
-        
-        # Get the overall team stats (first dataframe)
-        stats_df = dashboard.get_data_frames()[0]
-        
-        if stats_df.empty:
-            return JsonResponse({'error': 'No stats found for this team'}, status=404)
-        
-        # Get the first row (overall stats)
-        team_row = stats_df.iloc[0]
-        
-        # Calculate rankings for each stat
-        def get_rank(stat_column, ascending=False):
-            sorted_teams = league_df.sort_values(stat_column, ascending=ascending)
-            rank = sorted_teams[sorted_teams['TEAM_ID'] == int(team_id)].index[0] + 1
-            return int(rank)
-        
-        # Format response with per-game averages and rankings
-        team_averages = {
-            'team_id': int(team_id),
-            'games_played': int(team_row.get('GP', 0)),
-            'wins': int(team_row.get('W', 0)),
-            'losses': int(team_row.get('L', 0)),
-            'points': float(team_row.get('PTS', 0)),
-            'points_rank': get_rank('PTS'),
-            'field_goals_made': float(team_row.get('FGM', 0)),
-            'field_goals_attempted': float(team_row.get('FGA', 0)),
-            'field_goal_pct': float(team_row.get('FG_PCT', 0)),
-            'three_point_pct': float(team_row.get('FG3_PCT', 0)),
-            'free_throw_pct': float(team_row.get('FT_PCT', 0)),
-            'total_rebounds': float(team_row.get('REB', 0)),
-            'assists': float(team_row.get('AST', 0)),
-            'turnovers': float(team_row.get('TOV', 0)),
-            'steals': float(team_row.get('STL', 0)),
-            'blocks': float(team_row.get('BLK', 0)),
-        }
-        
-        return JsonResponse(team_averages)
+        data, status = build_team_averages(team_id, *seasons.season_params(request))
+        return FastJsonResponse(data, status=status)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)
+        return FastJsonResponse({'error': str(e)}, status=400)
+
+
+ROSTER_COLUMNS = [
+    Column('PLAYER_ID', 'player_id', int),
+    Column('PLAYER', 'player_name'),
+    Column('NUM', 'jersey_number', default='N/A'),
+    Column('POSITION', 'position', default='N/A'),
+    Column('HEIGHT', 'height', default='N/A'),
+    Column('WEIGHT', 'weight', default='N/A'),
+    Column('BIRTH_DATE', 'birth_date', default='N/A'),
+    Column('AGE', 'age', default='N/A'),
+]
+
+
+def build_team_roster(team_id, season, season_type=DEFAULT_SEASON_TYPE):
+    # Get team roster (the same for every season type)
+    endpoint_cls, params = team_roster_request(team_id, season)
+    roster = upstream.fetch(endpoint_cls, **params)
+    
+    roster_df = roster.get_data_frames()[0]
+    
+    if roster_df.empty:
+        return {'error': 'No roster found for this team'}, 404
+    
+    # Format roster
+    return transforms.to_records(roster_df, ROSTER_COLUMNS), 200
 
 
 def get_team_roster(request, team_id):
     try:
-        # Get team roster
-        roster = commonteamroster.CommonTeamRoster(
-            team_id=team_id,
-            season='2025-26'
-        )
-        
-        roster_df = roster.get_data_frames()[0]
-        
-        if roster_df.empty:
-            return JsonResponse({'error': 'No roster found for this team'}, status=404)
-        
-        # Format roster
-        roster_list = []
-        for _, player in roster_df.iterrows():
-            roster_list.append({
-                'player_id': int(player['PLAYER_ID']),
-                'player_name': player['PLAYER'],
-                'jersey_number': player.get('NUM', 'N/A'),
-                'position': player.get('POSITION', 'N/A'),
-                'height': player.get('HEIGHT', 'N/A'),
-                'weight': player.get('WEIGHT', 'N/A'),
-                'birth_date': player.get('BIRTH_DATE', 'N/A'),
-                'age': player.get('AGE', 'N/A'),
-            })
-        
-        return JsonResponse(roster_list, safe=False)
+        data, status = build_team_roster(team_id, *seasons.season_params(request))
+        return FastJsonResponse(data, status=status, safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)
+        return FastJsonResponse({'error': str(e)}, status=400)
+
+
+TEAM_GAME_LOG_COLUMNS = [Column('GAME_ID', 'Game_ID')] + [
+    Column(source) for source in (
+        'GAME_DATE', 'MATCHUP', 'WL', 'MIN', 'PTS', 'REB', 'AST', 'STL', 'BLK',
+        'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT', 'TOV',
+    )
+]
+
+
+def build_team_game_log(team_id, season, season_type=DEFAULT_SEASON_TYPE, columnar=False):
+    # Get team game log using TeamGameLogs
+    endpoint_cls, params = team_game_log_request(team_id, season, season_type)
+    game_log = upstream.fetch(endpoint_cls, **params)
+    
+    game_log_df = game_log.get_data_frames()[0]
+    
+    if game_log_df.empty:
+        return (transforms.to_columns(game_log_df, TEAM_GAME_LOG_COLUMNS) if columnar else []), 200
+    
+    # Sort by date descending
+    game_log_df = game_log_df.sort_values('GAME_ID', ascending=False)
+    
+    # Skip preseason games (game ids starting with '1')
+    game_log_df = game_log_df[~game_log_df['GAME_ID'].astype(str).str.startswith('1')]
+
+    # Only include fields that match player game log structure
+    if columnar:
+        return transforms.to_columns(game_log_df, TEAM_GAME_LOG_COLUMNS), 200
+    return transforms.to_records(game_log_df, TEAM_GAME_LOG_COLUMNS), 200
 
 
 def get_team_game_log(request, team_id):
     try:
-        # Get team game log using TeamGameLogs
-        game_log = teamgamelogs.TeamGameLogs(
-            team_id_nullable=team_id,
-            season_nullable='2025-26',
-            season_type_nullable='Regular Season'
-        )
-        
-        game_log_df = game_log.get_data_frames()[0]
-        
-        if game_log_df.empty:
-            return JsonResponse([], safe=False)
-        
-        # Sort by date descending
-        game_log_df = game_log_df.sort_values('GAME_ID', ascending=False)
-        
-        # Filter to only include fields that match player game log structure
-        filtered_games = []
-        for _, game in game_log_df.iterrows():
-    
-            game_id_str = str(game.get('GAME_ID', ''))
-            if game_id_str and game_id_str[0] == '1':
-                continue  # Skip preseason games (starting with '1')
-            
-            filtered_games.append({
-                'Game_ID': game.get('GAME_ID'),
-                'GAME_DATE': game.get('GAME_DATE'),
-                'MATCHUP': game.get('MATCHUP'),
-                'WL': game.get('WL'),
-                'MIN': game.get('MIN'),
-                'PTS': game.get('PTS'),
-                'REB': game.get('REB'),
-                'AST': game.get('AST'),
-                'STL': game.get('STL'),
-                'BLK': game.get('BLK'),
-                'FGM': game.get('FGM'),
-                'FGA': game.get('FGA'),
-                'FG_PCT': game.get('FG_PCT'),
-                'FG3M': game.get('FG3M'),
-                'FG3A': game.get('FG3A'),
-                'FG3_PCT': game.get('FG3_PCT'),
-                'FTM': game.get('FTM'),
-                'FTA': game.get('FTA'),
-                'FT_PCT': game.get('FT_PCT'),
-                'TOV': game.get('TOV')
-            })
-        
-        return JsonResponse(filtered_games, safe=False)
+        data, status = build_team_game_log(team_id, *seasons.season_params(request), columnar=wants_columnar(request))
+        return FastJsonResponse(data, status=status, safe=False)
+    except Exception as e:
+        return FastJsonResponse({'error': str(e)}, status=400)
+
+
+# Team overview sections are built concurrently; each has its own deadline
+TEAM_OVERVIEW_SECTIONS = {
+    'stats': build_team_stats,
+    'averages': build_team_averages,
+    'roster': build_team_roster,
+    'gamelog': build_team_game_log,
+}
+TEAM_OVERVIEW_TIMEOUT = 10  # seconds
+
+_team_overview_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='team-overview')
+
+
+def get_team_overview(request, team_id):
+    try:
+        team = teams.find_team_name_by_id(int(team_id))
+        if not team:
+            return FastJsonResponse({'error': 'Team not found'}, status=404)
+
+        season, season_type = seasons.season_params(request)
+        pending = {
+            section: _team_overview_pool.submit(contextvars.copy_context().run, build, team_id, season, season_type)
+            for section, build in TEAM_OVERVIEW_SECTIONS.items()
+        }
+
+        # A section that fails is returned as null with its error, the rest are still usable
+        deadline = time.monotonic() + TEAM_OVERVIEW_TIMEOUT
+        overview = {'team': team, 'season': season, 'season_type': season_type, 'errors': {}}
+        for section, future in pending.items():
+            try:
+                data, status = future.result(timeout=max(0, deadline - time.monotonic()))
+            except TimeoutError:
+                data, status = {'error': 'Timed out'}, 504
+            except Exception as e:
+                data, status = {'error': str(e)}, 400
+
+            if status == 200:
+                overview[section] = data
+            else:
+                overview[section] = None
+                overview['errors'][section] = data.get('error')
+
+        return FastJsonResponse(overview)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)
\ No newline at end of file
+        return FastJsonResponse({'error': str(e)}, status=400)
@@ -5,6 +5,11 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Serve with an ASGI server, e.g. ``uvicorn app.asgi:application``. The API
+routes to the async views (ASYNC_API_VIEWS, switched on here) and
+live/stream/ needs ASGI to stream; install httpx so upstream requests go
+through the async client.
 """
 
 import os
@@ -12,5 +17,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+os.environ.setdefault('DJANGO_ASYNC_API_VIEWS', '1')
 
 application = get_asgi_application()
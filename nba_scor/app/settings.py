@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,13 +44,17 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'app.urls'
@@ -84,6 +89,75 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'nba-scor',
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+    # Upstream responses for completed seasons never change; kept on disk without expiry
+    'seasons': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'seasons',
+        'OPTIONS': {
+            'MAX_ENTRIES': 20000,
+        },
+    },
+}
+
+# Cache for upstream responses of completed seasons (see api/seasons.py)
+UPSTREAM_COMPLETED_SEASON_CACHE_ALIAS = 'seasons'
+
+# Seconds an nba_api response stays fresh, by endpoint class name (see api/upstream.py).
+# Anything not listed uses api.upstream.DEFAULT_TTL.
+UPSTREAM_CACHE_TTLS = {
+    # Live data
+    'ScoreBoard': 5,
+    'BoxScore': 5,
+    'ScoreboardV2': 30,
+    # Standings, leaders and team/player season stats
+    'LeagueStandingsV3': 300,
+    'LeagueLeaders': 300,
+    'LeagueDashTeamStats': 300,
+    'TeamDashboardByGeneralSplits': 300,
+    'TeamGameLogs': 300,
+    'PlayerGameLog': 300,
+    'PlayerDashboardByYearOverYear': 300,
+    # Rosters and career data
+    'CommonAllPlayers': 3600,
+    'CommonTeamRoster': 3600,
+    'PlayerCareerStats': 6 * 3600,
+}
+
+# Coalesce cold fetches of the same endpoint across worker processes with a lock
+# in the upstream cache. Only useful with a shared cache backend (Redis, Memcached,
+# database); LocMemCache is per process, where in-process coalescing already applies.
+UPSTREAM_CROSS_PROCESS_LOCK = False
+
+# Shared nba_api HTTP session (see api/upstream_http.py); missing keys use its DEFAULTS
+UPSTREAM_HTTP = {
+    'connect_timeout': 3.05,
+    'read_timeout': 10,
+    'retries': 2,
+    'breaker_threshold': 5,
+    'breaker_reset': 30,
+}
+
+# Route /api/ to the async view variants (api/async_views.py). Only on under
+# app/asgi.py, which sets DJANGO_ASYNC_API_VIEWS=1: there slow upstream calls
+# don't hold a worker. Under WSGI every async request would run its own event
+# loop, with no connection reuse, so the sync views are served instead.
+ASYNC_API_VIEWS = os.environ.get('DJANGO_ASYNC_API_VIEWS') == '1'
+
+# Where ?profile=cprofile writes its cProfile dumps (see api/profiling.py)
+PROFILE_DUMP_DIR = BASE_DIR / 'profiles'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
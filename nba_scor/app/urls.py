@@ -17,8 +17,11 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from api.views import get_metrics
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', get_metrics),
     path('api/', include('api.urls')),
     path('', include('frontend.urls')),
     ] 
@@ -3,6 +3,39 @@ import { Link } from 'react-router-dom'
 import { useNavigate } from 'react-router-dom'
 import './GameBoxscore.css'
 
+// Live boxscores are refreshed with ?since=<version>, which only returns what changed
+const LIVE_REFRESH_MS = 15000
+
+function mergeTeam(team, delta) {
+  if (!delta) return team
+  const { removed_players: removedIds = [], ...fields } = delta
+  const changed = Object.fromEntries((delta.players || []).map(p => [p.player_id, p]))
+  const removed = new Set(removedIds)
+  const players = team.players
+    .filter(p => !removed.has(p.player_id))
+    .map(p => (changed[p.player_id] ? { ...p, ...changed[p.player_id] } : p))
+  const known = new Set(team.players.map(p => p.player_id))
+  const added = (delta.players || []).filter(p => !known.has(p.player_id))
+  return {
+    ...team,
+    ...fields,
+    statistics: { ...team.statistics, ...(delta.statistics || {}) },
+    players: [...players, ...added],
+  }
+}
+
+function applyBoxscoreDelta(boxscore, response) {
+  // Without the requested snapshot the server sends the full boxscore
+  if (!response.delta) return response
+  const { home_team, away_team, delta, since, ...fields } = response
+  return {
+    ...boxscore,
+    ...fields,
+    home_team: mergeTeam(boxscore.home_team, home_team),
+    away_team: mergeTeam(boxscore.away_team, away_team),
+  }
+}
+
 export default function GameBoxscore({ gameId }) {
   const navigate = useNavigate()
   const [boxscore, setBoxscore] = React.useState(null)
@@ -38,6 +71,23 @@ export default function GameBoxscore({ gameId }) {
       })
   }, [gameId])
 
+  const versionRef = React.useRef(null)
+  versionRef.current = boxscore?.version
+  const isLive = boxscore?.game_status === 2
+
+  React.useEffect(() => {
+    if (!isLive) return
+    const interval = setInterval(() => {
+      fetch(`/api/games/${gameId}/?since=${versionRef.current}`)
+        .then(res => (res.ok ? res.json() : null))
+        .then((data) => {
+          if (data) setBoxscore(current => applyBoxscoreDelta(current, data))
+        })
+        .catch(() => {})  // Keep showing the last boxscore; the next refresh retries
+    }, LIVE_REFRESH_MS)
+    return () => clearInterval(interval)
+  }, [gameId, isLive])
+
   if (loading) return <div className="boxscore-loading">Loading boxscore...</div>
   if (error) return <div className="boxscore-error">Error loading boxscore: {error}</div>
   if (!boxscore) return null
@@ -20,37 +20,20 @@ export default function TeamPage() {
     let mounted = true
     setLoading(true)
     
-    // Fetch all team data in parallel
-    Promise.all([
-      fetch(`/api/teams/`).then(res => {
-        if (!res.ok) throw new Error(res.statusText || 'Network error')
-        return res.json()
-      }),
-      fetch(`/api/teams/${teamId}/stats/`).then(res => {
-        if (!res.ok) throw new Error(res.statusText || 'Network error')
-        return res.json()
-      }),
-      fetch(`/api/teams/${teamId}/averages/`).then(res => {
-        if (!res.ok) throw new Error(res.statusText || 'Network error')
-        return res.json()
-      }),
-      fetch(`/api/teams/${teamId}/roster/`).then(res => {
-        if (!res.ok) throw new Error(res.statusText || 'Network error')
-        return res.json()
-      }),
-      fetch(`/api/teams/${teamId}/gamelog/`).then(res => {
+    // Team info and every section come from one aggregated request
+    fetch(`/api/teams/${teamId}/overview/`)
+      .then(res => {
+        if (res.status === 404) return null
         if (!res.ok) throw new Error(res.statusText || 'Network error')
         return res.json()
       })
-    ])
-      .then(([teamsData, statsData, averagesData, rosterData, gameLogData]) => {
+      .then((overview) => {
         if (mounted) {
-          const foundTeam = teamsData.find(t => t.id === parseInt(teamId))
-          setTeam(foundTeam)
-          setTeamStats(statsData)
-          setTeamAverages(averagesData)
-          setTeamRoster(rosterData)
-          setTeamGameLog(gameLogData)
+          setTeam(overview ? overview.team : null)
+          setTeamStats(overview ? overview.stats : null)
+          setTeamAverages(overview ? overview.averages : null)
+          setTeamRoster(overview ? overview.roster || [] : [])
+          setTeamGameLog(overview ? overview.gamelog || [] : [])
           setError(null)
         }
       })
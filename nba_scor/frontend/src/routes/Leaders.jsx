@@ -21,41 +21,20 @@ export default function Leaders() {
     let mounted = true
     setLoading(true)
     
-    // Fetch stats leaders
-    Promise.all([
-      fetch('/api/leaders/points/').then(res => {
+    // Fetch every category's leaders in a single request
+    fetch('/api/leaders/?categories=pts,reb,ast,blk,stl,fgm&limit=10')
+      .then(res => {
         if (!res.ok) throw new Error(res.statusText || 'Network error')
         return res.json()
-      }),
-      fetch('/api/leaders/rebounds/').then(res => {
-        if (!res.ok) throw new Error(res.statusText || 'Network error')
-        return res.json()
-      }),
-      fetch('/api/leaders/assists/').then(res => {
-        if (!res.ok) throw new Error(res.statusText || 'Network error')
-        return res.json()
-      }),
-      fetch('/api/leaders/blocks/').then(res => {
-        if (!res.ok) throw new Error(res.statusText || 'Network error')
-        return res.json()
-      }),
-      fetch('/api/leaders/steals/').then(res => {
-        if (!res.ok) throw new Error(res.statusText || 'Network error')
-        return res.json()
-      }),
-      fetch('/api/leaders/fgm/').then(res => {
-        if (!res.ok) throw new Error(res.statusText || 'Network error')
-        return res.json()
-      }),
-    ])
-      .then(([pointsData, reboundsData, assistsData, blocksData, stealsData, fgmData]) => {
+      })
+      .then((data) => {
         if (mounted) {
-          setPointsLeaders(pointsData)
-          setReboundLeaders(reboundsData)
-          setAssistLeaders(assistsData)
-          setBlockLeaders(blocksData)
-          setStealLeaders(stealsData)
-          setFgmLeaders(fgmData)
+          setPointsLeaders(data.pts)
+          setReboundLeaders(data.reb)
+          setAssistLeaders(data.ast)
+          setBlockLeaders(data.blk)
+          setStealLeaders(data.stl)
+          setFgmLeaders(data.fgm)
           setError(null)
         }
       })
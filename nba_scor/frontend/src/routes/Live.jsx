@@ -2,6 +2,9 @@ import React from 'react'
 import LiveGameCard from '../components/LiveGameCard'
 import './Live.css'
 
+// How long the live stream gets to open before falling back to polling
+const STREAM_OPEN_TIMEOUT_MS = 5000
+
 export default function Live() {
   const [games, setGames] = React.useState([])
   const [loading, setLoading] = React.useState(true)
@@ -28,11 +31,63 @@ export default function Live() {
 
   React.useEffect(() => {
     fetchLiveGames()
-    
-    // Auto-refresh every 30 seconds
-    const interval = setInterval(fetchLiveGames, 30000)
 
-    return () => clearInterval(interval)
+    // Auto-refresh every 30 seconds, only while the live stream is unavailable
+    let interval = null
+    const startPolling = () => {
+      if (!interval) interval = setInterval(fetchLiveGames, 30000)
+    }
+    const stopPolling = () => {
+      clearInterval(interval)
+      interval = null
+    }
+
+    if (!window.EventSource) {
+      startPolling()
+      return stopPolling
+    }
+
+    // The server pushes the full list once, then only the fields that changed per game
+    const source = new EventSource('/api/live/stream/')
+    // A server that can't stream may never answer; poll instead
+    const openTimeout = setTimeout(() => {
+      source.close()
+      startPolling()
+    }, STREAM_OPEN_TIMEOUT_MS)
+    source.onopen = () => {
+      clearTimeout(openTimeout)
+      stopPolling()
+    }
+    source.onerror = () => {
+      clearTimeout(openTimeout)
+      startPolling()
+    }
+    source.addEventListener('snapshot', (event) => {
+      setGames(JSON.parse(event.data))
+      setLastUpdate(new Date())
+      setError(null)
+      setLoading(false)
+    })
+    source.addEventListener('update', (event) => {
+      const changes = JSON.parse(event.data)
+      setGames((prev) => prev.map((game) => {
+        const change = changes.find((c) => c.gameId === game.gameId)
+        if (!change) return game
+        return {
+          ...game,
+          ...change,
+          homeTeam: { ...game.homeTeam, ...change.homeTeam },
+          awayTeam: { ...game.awayTeam, ...change.awayTeam },
+        }
+      }))
+      setLastUpdate(new Date())
+    })
+
+    return () => {
+      clearTimeout(openTimeout)
+      source.close()
+      stopPolling()
+    }
   }, [fetchLiveGames])
 
   if (loading) return <div className="live-loading">Loading live games...</div>
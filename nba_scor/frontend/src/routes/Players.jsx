@@ -3,40 +3,52 @@ import PlayerCard from '../components/PlayerCard.jsx'
 import { Link } from 'react-router-dom'
 import './Players.css'
 
+// Wait for a pause in typing before searching
+const SEARCH_DELAY_MS = 150
+const SEARCH_LIMIT = 50
+
 export default function Players() {
-  const [players, setPlayers] = React.useState(null)
-  const [loading, setLoading] = React.useState(true)
+  const [players, setPlayers] = React.useState([])
+  const [loading, setLoading] = React.useState(false)
   const [error, setError] = React.useState(null)
   const [searchQuery, setSearchQuery] = React.useState('')
 
   React.useEffect(() => {
-    let mounted = true
+    const query = searchQuery.trim()
+    if (!query) {
+      setPlayers([])
+      setLoading(false)
+      setError(null)
+      return
+    }
+
+    // Aborted when the query changes, so older responses never overwrite newer ones
+    const controller = new AbortController()
     setLoading(true)
-    fetch('/api/players/')
-      .then((res) => {
-        if (!res.ok) throw new Error(res.statusText || 'Network error')
-        return res.json()
-      })
-      .then((data) => {
-        if (mounted) {
+    const timer = setTimeout(() => {
+      const params = new URLSearchParams({ q: query, limit: SEARCH_LIMIT })
+      fetch(`/api/players/search/?${params}`, { signal: controller.signal })
+        .then((res) => {
+          if (!res.ok) throw new Error(res.statusText || 'Network error')
+          return res.json()
+        })
+        .then((data) => {
           setPlayers(data)
           setError(null)
-        }
-      })
-      .catch((err) => {
-        if (mounted) setError(err.message || String(err))
-      })
-      .finally(() => {
-        if (mounted) setLoading(false)
-      })
+          setLoading(false)
+        })
+        .catch((err) => {
+          if (err.name === 'AbortError') return
+          setError(err.message || String(err))
+          setLoading(false)
+        })
+    }, SEARCH_DELAY_MS)
 
     return () => {
-      mounted = false
+      clearTimeout(timer)
+      controller.abort()
     }
-  }, [])
-
-  if (loading) return <div>Loading players...</div>
-  if (error) return <div>Error loading players: {error}</div>
+  }, [searchQuery])
 
   return (
     <div className="players-container">
@@ -52,25 +64,23 @@ export default function Players() {
         </div>
       </div>
       <div className="players-data">
-        {players
-          ?.filter((player) =>
-            `${player.DISPLAY_FIRST_LAST || ''}`
-              .toLowerCase()
-              .includes(searchQuery.toLowerCase())
-          )
-          .map((player) => (
-            <Link
-              to={`/players/${player.PERSON_ID}`}
-              key={player.PERSON_ID}
-              style={{ textDecoration: 'none', color: 'inherit' }}
-            >
-              <PlayerCard
-                lastName={player.DISPLAY_LAST_COMMA_FIRST?.split(', ')[0] || player.LASTNAME || ''}
-                firstName={player.DISPLAY_LAST_COMMA_FIRST?.split(', ')[1] || player.FIRSTNAME || ''}
-              />
-            </Link>
-          ))}
+        {!searchQuery.trim() && <div>Type a player's name to search</div>}
+        {error && <div>Error loading players: {error}</div>}
+        {!error && loading && players.length === 0 && <div>Searching players...</div>}
+        {!error && !loading && searchQuery.trim() && players.length === 0 && <div>No players found</div>}
+        {players.map((player) => (
+          <Link
+            to={`/players/${player.PERSON_ID}`}
+            key={player.PERSON_ID}
+            style={{ textDecoration: 'none', color: 'inherit' }}
+          >
+            <PlayerCard
+              lastName={player.DISPLAY_LAST_COMMA_FIRST?.split(', ')[0] || player.LASTNAME || ''}
+              firstName={player.DISPLAY_LAST_COMMA_FIRST?.split(', ')[1] || player.FIRSTNAME || ''}
+            />
+          </Link>
+        ))}
       </div>
     </div>
   )
-}
\ No newline at end of file
+}